@@ -0,0 +1,12 @@
+"""Benchmarks for the backend hot paths, run with ``python -m benchmarks.<name>``.
+
+The application package lives in ``src/``; pytest adds it through its
+``pythonpath`` setting, a plain ``python -m`` from ``backend/`` does not.
+"""
+
+import sys
+from pathlib import Path
+
+_SRC = str(Path(__file__).resolve().parent.parent / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
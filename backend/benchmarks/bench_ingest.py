@@ -0,0 +1,180 @@
+"""End-to-end benchmark of the RSS ingest pipeline.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_ingest [--feeds 20] [--items 50] [--bangumi 300]
+                                      [--ticks 5] [--check]
+
+Serves ``--feeds`` synthetic feeds of ``--items`` releases each from a local
+HTTP server, seeds an in-memory database with ``--bangumi`` library entries
+(each with an alias), then runs the two stages of ingest against the
+``MockDownloader``:
+
+* ``RSSAnalyser.rss_to_data`` once per feed, which parses the releases that
+  match no library entry and adds them as new bangumi;
+* ``RSSEngine.refresh_rss`` for ``--ticks`` passes. The first pass matches
+  and downloads every release; the later ones find nothing new, which is the
+  steady state of the RSS loop.
+
+Reports throughput, latency percentiles and the peak traced memory of a
+second, identical run under ``tracemalloc``. ``--check`` exits non-zero when
+throughput falls below the targets in ``baselines.json``. Feeds use the
+``none`` parser so no Mikan or TMDB lookups leave the machine.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlmodel import SQLModel, create_engine
+
+from benchmarks.corpus import feed_titles, library
+from benchmarks.feed_server import FeedServer
+from module.conf import settings
+from module.database.bangumi import _invalidate_bangumi_cache
+from module.downloader import DownloadClient
+from module.downloader.torrent_cache import TorrentCache
+from module.models import Bangumi, RSSItem
+from module.network.circuit_breaker import reset_breakers
+from module.network.request_url import close_shared_clients
+from module.rss import RSSAnalyser, RSSEngine
+
+download_client = sys.modules["module.downloader.download_client"]
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def _percentiles(samples: list[float]) -> dict:
+    if len(samples) < 2:
+        value = round(samples[0] * 1000, 2) if samples else 0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50_ms": round(q[49] * 1000, 2),
+        "p95_ms": round(q[94] * 1000, 2),
+        "p99_ms": round(q[98] * 1000, 2),
+    }
+
+
+def _seed(engine: RSSEngine, rows: list[dict], urls: list[str]):
+    engine.bangumi.add_all(
+        [
+            Bangumi(
+                official_title=row["official_title"],
+                title_raw=row["title_raw"],
+                title_aliases=json.dumps(row["aliases"], ensure_ascii=False),
+                season=row["season"],
+                group_name=row["group_name"],
+                filter="",
+                rss_link=urls[i % len(urls)],
+                added=True,
+            )
+            for i, row in enumerate(rows)
+        ]
+    )
+    engine.rss.add_all(
+        [RSSItem(name=f"feed{i}", url=url, parser="none") for i, url in enumerate(urls)]
+    )
+
+
+async def _scenario(feeds: int, items: int, bangumi: int, ticks: int) -> dict:
+    rows = library(bangumi)
+    reset_breakers()
+    with FeedServer() as server, tempfile.TemporaryDirectory() as tmp:
+        urls = [
+            server.add_feed(f"feed{i}", feed_titles(rows, items, seed=i))
+            for i in range(feeds)
+        ]
+        download_client.torrent_cache = TorrentCache(Path(tmp))
+        db = create_engine("sqlite://")
+        SQLModel.metadata.create_all(db)
+        _invalidate_bangumi_cache()
+        with RSSEngine(db) as engine:
+            _seed(engine, rows, urls)
+            library_size = len(engine.bangumi.search_all())
+
+            analyser = RSSAnalyser()
+            analyse = []
+            for rss in engine.rss.search_active():
+                start = time.perf_counter()
+                await analyser.rss_to_data(rss, engine)
+                analyse.append(time.perf_counter() - start)
+            engine.commit()
+            _invalidate_bangumi_cache()
+
+            refresh = []
+            async with DownloadClient() as client:
+                for _ in range(ticks):
+                    start = time.perf_counter()
+                    await engine.refresh_rss(client)
+                    refresh.append(time.perf_counter() - start)
+                downloaded = len(client.client._torrents)
+        # The pooled clients are bound to this run's event loop
+        await close_shared_clients()
+    total = feeds * items
+    return {
+        "analyse": analyse,
+        "refresh": refresh,
+        "items": total,
+        "new_bangumi": len(engine.bangumi.search_all()) - library_size,
+        "downloaded": downloaded,
+        "requests": server.requests,
+    }
+
+
+def run(feeds: int, items: int, bangumi: int, ticks: int) -> dict:
+    settings.downloader.type = "mock"
+    settings.experimental_openai.enable = False
+    timed = asyncio.run(_scenario(feeds, items, bangumi, ticks))
+    tracemalloc.start()
+    asyncio.run(_scenario(feeds, items, bangumi, ticks))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    analyse, refresh = timed["analyse"], timed["refresh"]
+    return {
+        "feeds": feeds,
+        "items": timed["items"],
+        "bangumi": bangumi,
+        "new_bangumi": timed["new_bangumi"],
+        "downloaded": timed["downloaded"],
+        "requests": timed["requests"],
+        "analyse_items_per_sec": round(timed["items"] / sum(analyse)),
+        "analyse_feed": _percentiles(analyse),
+        "refresh_first_items_per_sec": round(timed["items"] / refresh[0]),
+        "refresh_steady_tick": _percentiles(refresh[1:]),
+        "peak_traced_mb": round(peak / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--bangumi", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    result = run(args.feeds, args.items, args.bangumi, max(args.ticks, 2))
+    print(json.dumps(result))
+    if args.check:
+        targets = json.loads(BASELINES.read_text())["ingest"]
+        failed = False
+        for key in ("analyse_items_per_sec", "refresh_first_items_per_sec"):
+            if result[key] < targets[key]:
+                print(f"ingest {key} below target: {result[key]} < {targets[key]}/s")
+                failed = True
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Micro-benchmark for the raw title parser.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_raw_parser [--count 3000] [--repeat 5] [--check]
+
+Reports single-core throughput of the uncached regex cascade (``process``)
+and of ``raw_parser`` with a warm LRU. ``--check`` exits non-zero when cold
+throughput falls below the target recorded in ``baselines.json``.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import module.parser.analyser  # noqa: F401  (package import shadows the submodule name)
+from benchmarks.corpus import mikan_titles
+
+raw = sys.modules["module.parser.analyser.raw_parser"]
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def _best_rate(fn, titles: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for title in titles:
+            fn(title)
+        best = min(best, time.perf_counter() - start)
+    return len(titles) / best
+
+
+def run(count: int, repeat: int) -> dict:
+    titles = mikan_titles(count)
+    cold = _best_rate(raw.process, titles, repeat)
+    raw.clear_raw_parser_cache()
+    for title in titles:
+        raw.raw_parser(title)
+    warm = _best_rate(raw.raw_parser, titles, repeat)
+    return {"titles": len(titles), "cold_per_sec": round(cold), "warm_per_sec": round(warm)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    result = run(args.count, args.repeat)
+    print(json.dumps(result))
+    if args.check:
+        target = json.loads(BASELINES.read_text())["raw_parser"]["cold_per_sec"]
+        if result["cold_per_sec"] < target:
+            print(f"raw_parser below target: {result['cold_per_sec']} < {target}/s")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Benchmark of a renamer pass over a large synthetic library.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_renamer [--torrents 3000] [--collections 60]
+                                       [--files 24] [--bangumi 300]
+                                       [--ticks 3] [--check]
+
+Seeds an in-memory database with ``--bangumi`` entries and a Torrent record
+for half of the torrents, then runs ``Renamer.rename`` ``--ticks`` times
+against a ``SyntheticLibrary``. The first tick renames everything; later
+ticks find the files already renamed, which is the steady state of the
+rename loop. For each tick it reports downloader calls by method, SQL
+statements issued by ``_batch_lookup_offsets``, time spent in the torrent
+file parser and wall time. ``--check`` exits non-zero when the first tick
+falls below the throughput target in ``baselines.json``.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, create_engine
+
+from benchmarks.corpus import library
+from benchmarks.mock_library import SAVE_ROOT, SyntheticLibrary
+from module.conf import settings
+from module.database import Database
+from module.database.bangumi import _invalidate_bangumi_cache
+from module.manager import renamer as renamer_module
+from module.models import Bangumi, Torrent
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def _seed(db_engine, rows: list[dict]) -> list[tuple[int, dict]]:
+    with Database(db_engine) as db:
+        db.bangumi.add_all(
+            [
+                Bangumi(
+                    official_title=row["official_title"],
+                    title_raw=row["title_raw"],
+                    title_aliases=json.dumps(row["aliases"], ensure_ascii=False),
+                    season=row["season"],
+                    group_name=row["group_name"],
+                    save_path=f"{SAVE_ROOT}/{row['official_title']}/Season {row['season']}",
+                )
+                for row in rows
+            ]
+        )
+        by_title = {b.title_raw: b.id for b in db.bangumi.search_all()}
+    return [(by_title[row["title_raw"]], row) for row in rows]
+
+
+def _record_torrents(db_engine, client: SyntheticLibrary):
+    """Link every other torrent to its bangumi by hash, as ingest does."""
+    with Database(db_engine) as db:
+        db.torrent.add_all(
+            [
+                Torrent(
+                    name=info["name"],
+                    url=f"https://example.com/{info['hash']}.torrent",
+                    bangumi_id=int(info["tags"][3:]),
+                    qb_hash=info["hash"],
+                    downloaded=True,
+                )
+                for info in list(client._torrents.values())[::2]
+            ]
+        )
+        db.commit()
+
+
+def _instrument(renamer, db_engine) -> dict:
+    """Count SQL statements in the offset lookup and time the file parser."""
+    stats = {"offsets_queries": 0, "offsets_s": 0.0, "parser_s": 0.0, "parsed": 0}
+    counting = [False]
+
+    def count(*_):
+        if counting[0]:
+            stats["offsets_queries"] += 1
+
+    event.listen(db_engine, "before_cursor_execute", count)
+
+    lookup = renamer._batch_lookup_offsets
+
+    def batch_lookup_offsets(torrents_info):
+        counting[0] = True
+        start = time.perf_counter()
+        try:
+            return lookup(torrents_info)
+        finally:
+            stats["offsets_s"] += time.perf_counter() - start
+            counting[0] = False
+
+    parse = renamer._parser.torrent_parser
+
+    @functools.wraps(parse)
+    def torrent_parser(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return parse(*args, **kwargs)
+        finally:
+            stats["parser_s"] += time.perf_counter() - start
+            stats["parsed"] += 1
+
+    renamer._batch_lookup_offsets = batch_lookup_offsets
+    renamer._parser.torrent_parser = torrent_parser
+    return stats
+
+
+async def _run(args) -> dict:
+    db_engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(db_engine)
+    _invalidate_bangumi_cache()
+    # The renamer opens its own sessions on the default engine
+    renamer_module.Database = functools.partial(Database, db_engine)
+    rows = _seed(db_engine, library(args.bangumi))
+    client = SyntheticLibrary(
+        rows,
+        torrents=args.torrents,
+        collections=args.collections,
+        collection_files=args.files,
+    )
+    _record_torrents(db_engine, client)
+    files = sum(len(f) for f in client._files.values())
+
+    renamer = renamer_module.Renamer()
+    renamer.client = client
+    stats = _instrument(renamer, db_engine)
+    ticks = []
+    for _ in range(args.ticks):
+        for key in stats:
+            stats[key] = 0
+        client.calls.clear()
+        start = time.perf_counter()
+        renamed = await renamer.rename()
+        wall = time.perf_counter() - start
+        ticks.append(
+            {
+                "wall_ms": round(wall * 1000, 1),
+                "torrents": client.calls["torrents_files"],
+                "downloader_calls": dict(client.calls),
+                "offsets_queries": stats["offsets_queries"],
+                "offsets_ms": round(stats["offsets_s"] * 1000, 1),
+                "parser_ms": round(stats["parser_s"] * 1000, 1),
+                "parsed": stats["parsed"],
+                "notifications": len(renamed),
+            }
+        )
+    first = ticks[0]
+    return {
+        "torrents": len(client._torrents),
+        "files": files,
+        "bangumi": args.bangumi,
+        "first_tick_torrents_per_sec": round(first["torrents"] / (first["wall_ms"] / 1000)),
+        "ticks": ticks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--torrents", type=int, default=3000)
+    parser.add_argument("--collections", type=int, default=60)
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--bangumi", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    settings.downloader.type = "mock"
+    settings.downloader.path = SAVE_ROOT
+    settings.bangumi_manage.rename_method = "advance"
+    settings.bangumi_manage.remove_bad_torrent = False
+
+    result = asyncio.run(_run(args))
+    print(json.dumps(result))
+    if args.check:
+        target = json.loads(BASELINES.read_text())["renamer"]["first_tick_torrents_per_sec"]
+        if result["first_tick_torrents_per_sec"] < target:
+            print(
+                "renamer below target: "
+                f"{result['first_tick_torrents_per_sec']} < {target} torrents/s"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
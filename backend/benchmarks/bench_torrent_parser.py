@@ -0,0 +1,92 @@
+"""Micro-benchmark for the torrent file name parser.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_torrent_parser [--count 100000] [--repeat 3] [--check]
+
+Compares the single-pass ``COMBINED_RULE`` parser returning ``ParsedFile``
+against the former rule-by-rule loop building pydantic models, on synthetic
+file paths with the LRU bypassed. ``--check`` exits non-zero when throughput
+falls below the target in ``baselines.json``.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import module.parser.analyser  # noqa: F401  (package import shadows the submodule name)
+from benchmarks.corpus import file_paths
+
+tp = sys.modules["module.parser.analyser.torrent_parser"]
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def _sequential(torrent_path: str, file_type: str):
+    """The previous implementation: try every rule, validate with pydantic."""
+    media_path = Path(torrent_path).name
+    for rule in tp.COMPILED_RULES:
+        match_obj = rule.match(media_path)
+        if match_obj:
+            group, title = tp.get_group(match_obj.group(1))
+            title, season = tp.get_season_and_title(title)
+            fields = dict(
+                media_path=torrent_path,
+                group=group,
+                title=title,
+                season=season,
+                episode=match_obj.group(2),
+                suffix=Path(torrent_path).suffix,
+            )
+            if file_type == "media":
+                return tp.EpisodeFile(**fields)
+            return tp.SubtitleFile(**fields, language=tp.get_subtitle_lang(media_path))
+    return None
+
+
+def _combined(torrent_path: str, file_type: str):
+    return tp._torrent_parser_impl(torrent_path, file_type=file_type)
+
+
+def _best_rate(fn, paths: list[tuple[str, str]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path, file_type in paths:
+            fn(path, file_type)
+        best = min(best, time.perf_counter() - start)
+    return len(paths) / best
+
+
+def run(count: int, repeat: int) -> dict:
+    paths = file_paths(count)
+    sequential = _best_rate(_sequential, paths, repeat)
+    combined = _best_rate(_combined, paths, repeat)
+    return {
+        "paths": len(paths),
+        "sequential_per_sec": round(sequential),
+        "combined_per_sec": round(combined),
+        "speedup": round(combined / sequential, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    result = run(args.count, args.repeat)
+    print(json.dumps(result))
+    if args.check:
+        target = json.loads(BASELINES.read_text())["torrent_parser"]["per_sec"]
+        if result["combined_per_sec"] < target:
+            print(f"torrent_parser below target: {result['combined_per_sec']} < {target}/s")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Synthetic release titles in the formats Mikan feeds actually publish.
+
+Each template reproduces a real group's naming scheme; titles are expanded
+over a fixed list of shows, episodes and tags with a seeded RNG so every run
+parses the same corpus. ``file_paths`` does the same for the files inside
+downloaded torrents.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+SHOWS = [
+    ("葬送的芙莉莲", "Sousou no Frieren", "葬送のフリーレン"),
+    ("鹿乃子乃子乃子虎视眈眈", "Shikanoko Nokonoko Koshitantan", "しかのこのこのここしたんたん"),
+    ("不时轻声地以俄语遮羞的邻座艾莉同学", "Tokidoki Bosotto Russia-go de Dereru Tonari no Alya-san", "時々ボソッとロシア語でデレる隣のアーリャさん"),
+    ("咒术回战", "Jujutsu Kaisen", "呪術廻戦"),
+    ("间谍过家家", "SPY x FAMILY", "スパイファミリー"),
+    ("我推的孩子", "Oshi no Ko", "推しの子"),
+    ("药屋少女的呢喃", "Kusuriya no Hitorigoto", "薬屋のひとりごと"),
+    ("败犬女主太多了", "Make Heroine ga Oosugiru", "負けヒロインが多すぎる"),
+    ("地。-关于地球的运动-", "Chi. Chikyuu no Undou ni Tsuite", "チ。―地球の運動について―"),
+    ("轮回七次的反派大小姐", "7th Time Loop", "ループ7回目の悪役令嬢"),
+    ("古见同学有交流障碍症", "Komi-san wa, Komyushou Desu.", "古見さんは、コミュ症です。"),
+    ("迷宫饭", "Dungeon Meshi", "ダンジョン飯"),
+]
+
+TEMPLATES = [
+    "[Lilith-Raws] {en}{season_en} - {ep:02d} [Baha][WEB-DL][1080p][AVC AAC][CHT][MP4]",
+    "[ANi] {zh}{season_zh} - {ep:02d} [1080P][Baha][WEB-DL][AAC AVC][CHT].mp4",
+    "[喵萌奶茶屋&LoliHouse] {zh} / {en}{season_en} - {ep:02d} [WebRip 1080p HEVC-10bit AAC][简繁内封字幕]",
+    "[北宇治字幕组&LoliHouse] {zh} / {en} {ep:02d} [WebRip 1080p HEVC-10bit AAC ASSx2][简繁日内封字幕]",
+    "【幻樱字幕组】【4月新番】【{zh}{season_zh} {en}{season_en}】【{ep:02d}】【GB_MP4】【1920X1080】",
+    "[桜都字幕组] {zh} / {jp} [{ep:02d}][1080p][简繁内封]",
+    "【豌豆字幕组&风之圣殿字幕组】★04月新番[{zh} / {en_}][{ep:02d}][简体][1080P][MP4]",
+    "[SweetSub] {jp} / {en} - {ep:02d} [WebRip][1080P][AVC 8bit][简日双语]",
+    "[LoliHouse] {zh} / {en}{season_en} - {ep:02d} [WebRip 1080p HEVC-10bit AAC][简繁内封字幕][END]",
+    "[SubsPlease] {en}{season_en} - {ep:02d} (1080p) [ABCD1234].mkv",
+    "[黒ネズミたち] {zh} / {jp} / {en} - {ep:02d} (B-Global 3840x2160 HEVC AAC MKV)",
+    "[御坂字幕组] {zh}-{ep:02d} [WebRip 1080p HEVC10-bit AAC] [简繁日内封] [急招翻校轴]",
+    # Non-episodic releases the parser must reject
+    "[Group] {en} The Movie [1080p][BDRip]",
+]
+
+SEASONS_EN = ["", "", " S2", " Season 3"]
+SEASONS_ZH = ["", "", " 第二季", " 第3季"]
+
+
+def mikan_titles(count: int = 3000, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    titles = []
+    while len(titles) < count:
+        zh, en, jp = rng.choice(SHOWS)
+        season = rng.randrange(len(SEASONS_EN))
+        titles.append(
+            rng.choice(TEMPLATES).format(
+                zh=zh,
+                en=en,
+                en_=en.replace(" ", "_"),
+                jp=jp,
+                ep=rng.randint(1, 26),
+                season_en=SEASONS_EN[season],
+                season_zh=SEASONS_ZH[season],
+            )
+        )
+    return titles
+
+
+FILE_TEMPLATES = [
+    "[Lilith-Raws] {en}{season_en} - {ep:02d} [Baha][WEB-DL][1080p][AVC AAC][CHT].mp4",
+    "[ANi] {zh}{season_zh} - {ep:02d} [1080P][Baha][WEB-DL][AAC AVC][CHT].mp4",
+    "[Sakurato] {en} [{ep:02d}v2][AVC-8bit 1080p AAC][CHS].mkv",
+    "[SBSUB][{en}][{ep:02d}][GB][1080P].mp4",
+    "{zh} S{season:02d}E{ep:02d}.mkv",
+    "{zh} S{season:02d}E{ep:02d}.{lang}.ass",
+    "[SweetSub] {jp} - {ep:02d} [1080P].{lang}.srt",
+    "【幻樱字幕组】{zh} 第{ep:02d}话 [GB_MP4][1080P].mp4",
+    "[Ohys-Raws] {en} EP{ep:02d} (TV-Asahi 1280x720 x264 AAC).mp4",
+    # Extras the parser must reject
+    "[Group] {en} NCOP [1080p].mkv",
+]
+
+SUBTITLE_LANGS = ["tc", "sc", "chs", "cht", "zh-tw"]
+
+
+def file_paths(count: int = 100_000, seed: int = 0) -> list[tuple[str, str]]:
+    """(path, file_type) pairs as the renamer sees them in save paths."""
+    rng = random.Random(seed)
+    paths = []
+    while len(paths) < count:
+        zh, en, jp = rng.choice(SHOWS)
+        season = rng.randint(1, 3)
+        name = rng.choice(FILE_TEMPLATES).format(
+            zh=zh,
+            en=en,
+            jp=jp,
+            ep=rng.randint(1, 26),
+            season=season,
+            season_en=SEASONS_EN[season],
+            season_zh=SEASONS_ZH[season],
+            lang=rng.choice(SUBTITLE_LANGS),
+        )
+        file_type = "subtitle" if name.endswith((".ass", ".srt")) else "media"
+        paths.append((f"/downloads/Bangumi/{zh}/Season {season}/{name}", file_type))
+    return paths
+
+
+ROMAJI = ["ka", "ki", "ku", "ke", "ko", "sa", "shi", "su", "ta", "chi", "tsu", "na", "ni",
+          "no", "ha", "hi", "fu", "ma", "mi", "mu", "ya", "yu", "ra", "ri", "ru", "re", "wa"]
+KANJI = "春夏秋冬空海山川花月星雪風雨光影夜朝森街魔剣姫竜猫犬恋夢歌神"
+
+FEED_TEMPLATES = [
+    "[Lilith-Raws] {title} - {ep:02d} [Baha][WEB-DL][1080p][AVC AAC][CHT][MP4]",
+    "[ANi] {title} - {ep:02d} [1080P][Baha][WEB-DL][AAC AVC][CHT].mp4",
+    "[LoliHouse] {title} - {ep:02d} [WebRip 1080p HEVC-10bit AAC][简繁内封字幕]",
+    "[SubsPlease] {title} - {ep:02d} (1080p) [ABCD1234].mkv",
+]
+
+
+def _romaji_name(rng: random.Random) -> str:
+    words = ["".join(rng.choices(ROMAJI, k=rng.randint(2, 4))) for _ in range(rng.randint(2, 3))]
+    return " ".join(word.capitalize() for word in words)
+
+
+def library(count: int = 300, seed: int = 0) -> list[dict]:
+    """Bangumi rows with a romaji ``title_raw`` and a CJK alias each."""
+    rng = random.Random(seed)
+    rows, seen = [], set()
+    while len(rows) < count:
+        title = _romaji_name(rng)
+        alias = "".join(rng.choices(KANJI, k=rng.randint(4, 7)))
+        if title in seen or alias in seen:
+            continue
+        seen.update((title, alias))
+        rows.append(
+            {
+                "official_title": alias,
+                "title_raw": title,
+                "aliases": [alias],
+                "season": rng.randint(1, 3),
+                "group_name": rng.choice(["Lilith-Raws", "ANi", "LoliHouse"]),
+            }
+        )
+    return rows
+
+
+def feed_titles(
+    rows: list[dict], items: int, known: float = 0.8, seed: int = 0
+) -> list[str]:
+    """Release titles for one feed; a share ``known`` names a library show,
+    half of those by its alias, the rest name shows not in the library."""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(items):
+        if rows and rng.random() < known:
+            row = rng.choice(rows)
+            title = rng.choice((row["title_raw"], row["aliases"][0]))
+        else:
+            title = _romaji_name(rng)
+        titles.append(rng.choice(FEED_TEMPLATES).format(title=title, ep=rng.randint(1, 26)))
+    return titles
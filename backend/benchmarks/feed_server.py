@@ -0,0 +1,86 @@
+"""Local HTTP server for synthetic RSS feeds and their .torrent files.
+
+Runs in a daemon thread so the benchmarks exercise the real request path
+(shared httpx pool, circuit breaker, XML parsing) without leaving the
+machine. Feeds are Mikan-shaped: each item links a homepage and carries the
+torrent URL in its enclosure.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+
+class _Server(ThreadingHTTPServer):
+    # ``add_torrent`` fetches a whole batch of .torrent files at once
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def torrent_bytes(name: str) -> bytes:
+    """A minimal single-file .torrent with a distinct infohash per name."""
+    raw = name.encode()
+    return b"d4:infod6:lengthi1e4:name%d:%see" % (len(raw), raw)
+
+
+class FeedServer:
+    def __init__(self):
+        self._content: dict[str, tuple[bytes, str]] = {}
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_feed(self, name: str, titles: list[str]) -> str:
+        """Publish a feed of *titles*; returns its URL."""
+        items = []
+        for i, title in enumerate(titles):
+            path = f"/download/{name}-{i}.torrent"
+            self._content[path] = (torrent_bytes(f"{name}-{i}"), "application/x-bittorrent")
+            items.append(
+                f"<item><title>{escape(title)}</title>"
+                f"<link>{self.base_url}/Home/Episode/{name}-{i}</link>"
+                f'<enclosure type="application/x-bittorrent" length="1" '
+                f'url="{self.base_url}{path}"/></item>'
+            )
+        xml = (
+            '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(name)}</title>{''.join(items)}</channel></rss>"
+        )
+        path = f"/RSS/{name}.xml"
+        self._content[path] = (xml.encode(), "application/xml")
+        return self.base_url + path
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; don't let them wait on ACKs
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.requests += 1
+                body, content_type = server._content.get(self.path, (b"", ""))
+                self.send_response(200 if content_type else 404)
+                self.send_header("Content-Type", content_type or "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
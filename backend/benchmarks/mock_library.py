@@ -0,0 +1,97 @@
+"""A ``MockDownloader`` preloaded with a synthetic qBittorrent library.
+
+Torrents are shaped like qBittorrent's ``torrents/info`` and
+``torrents/files`` responses: single episodes (some with a subtitle set)
+and season collections with dozens of episodes in a folder. Renames are
+applied to the file lists as qBittorrent would, so a second renamer pass
+sees an already-renamed library. Every downloader call is counted in
+``calls``.
+"""
+
+import hashlib
+import random
+from collections import Counter
+
+from benchmarks.corpus import FEED_TEMPLATES, SUBTITLE_LANGS
+from module.downloader.client.mock_downloader import MockDownloader
+
+SAVE_ROOT = "/downloads/Bangumi"
+
+
+class SyntheticLibrary(MockDownloader):
+    def __init__(
+        self,
+        rows: list[dict],
+        torrents: int = 3000,
+        collections: int = 60,
+        collection_files: int = 24,
+        subtitles: float = 0.3,
+        seed: int = 0,
+    ):
+        """*rows* are ``(bangumi_id, library row)`` pairs; each torrent names
+        one of them and is tagged ``ab:<id>`` like the ones AutoBangumi adds."""
+        super().__init__()
+        self.calls: Counter[str] = Counter()
+        self._files: dict[str, list[dict]] = {}
+        rng = random.Random(seed)
+        for i in range(torrents):
+            bangumi_id, row = rng.choice(rows)
+            ep = rng.randint(1, 26)
+            name = rng.choice(FEED_TEMPLATES).format(title=row["title_raw"], ep=ep)
+            stem = name.rsplit(".", 1)[0] if name.endswith((".mp4", ".mkv")) else name
+            files = [{"name": f"{stem}.mkv", "size": 500 * 2**20}]
+            if rng.random() < subtitles:
+                files += [
+                    {"name": f"{stem}.{lang}.ass", "size": 2**16}
+                    for lang in rng.sample(SUBTITLE_LANGS, 2)
+                ]
+            self._add(f"{name}#{i}", name, bangumi_id, row, files)
+        for i in range(collections):
+            bangumi_id, row = rng.choice(rows)
+            name = f"[LoliHouse] {row['title_raw']} [01-{collection_files}][WebRip 1080p]"
+            files = []
+            for ep in range(1, collection_files + 1):
+                stem = f"{name}/[LoliHouse] {row['title_raw']} - {ep:02d} [WebRip 1080p]"
+                files.append({"name": f"{stem}.mkv", "size": 500 * 2**20})
+                if rng.random() < subtitles:
+                    files.append({"name": f"{stem}.sc.ass", "size": 2**16})
+            self._add(f"collection#{i}", name, bangumi_id, row, files)
+
+    def _add(self, key: str, name: str, bangumi_id: int, row: dict, files: list[dict]):
+        torrent_hash = hashlib.sha1(key.encode()).hexdigest()
+        self._torrents[torrent_hash] = {
+            "hash": torrent_hash,
+            "name": name,
+            "save_path": f"{SAVE_ROOT}/{row['official_title']}/Season {row['season']}",
+            "category": "Bangumi",
+            "state": "completed",
+            "progress": 1.0,
+            "tags": f"ab:{bangumi_id}",
+        }
+        self._files[torrent_hash] = files
+
+    async def torrents_info(self, status_filter, category, tag=None) -> list[dict]:
+        self.calls["torrents_info"] += 1
+        return await super().torrents_info(status_filter, category, tag)
+
+    async def torrents_files(self, torrent_hash: str) -> list[dict]:
+        self.calls["torrents_files"] += 1
+        return self._files.get(torrent_hash, [])
+
+    async def torrents_rename_file(
+        self, torrent_hash: str, old_path: str, new_path: str, verify: bool = True
+    ) -> bool:
+        self.calls["torrents_rename_file"] += 1
+        for file in self._files.get(torrent_hash, []):
+            if file["name"] == old_path:
+                file["name"] = new_path
+                return True
+        return False
+
+    async def set_category(self, _hash: str, category: str):
+        self.calls["set_category"] += 1
+        await super().set_category(_hash, category)
+
+    async def torrents_delete(self, hash: str, delete_files: bool = True):
+        self.calls["torrents_delete"] += 1
+        await super().torrents_delete(hash, delete_files)
@@ -1,17 +1,16 @@
 import logging
 import os
 from contextlib import asynccontextmanager
-from pathlib import Path
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import RedirectResponse
 
 from module.api import v1
+from module.api.posters import router as posters_router
 from module.api.program import program
+from module.api.static import APIGZipMiddleware, StaticIndex
 from module.conf import VERSION, settings, setup_logger
 from module.mcp import create_mcp_app
 
@@ -53,9 +52,11 @@ def create_app() -> FastAPI:
         allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
         allow_headers=["*"],
     )
+    app.add_middleware(APIGZipMiddleware)
 
     # mount routers
     app.include_router(v1, prefix="/api")
+    app.include_router(posters_router)
 
     # mount MCP server (SSE transport for LLM tool integration)
     app.mount("/mcp", create_mcp_app())
@@ -66,31 +67,12 @@ def create_app() -> FastAPI:
 app = create_app()
 
 
-_POSTERS_BASE = Path("data/posters").resolve()
-
-
-@app.get("/posters/{path:path}", tags=["posters"])
-def posters(path: str):
-    resolved = (_POSTERS_BASE / path).resolve()
-    if not str(resolved).startswith(str(_POSTERS_BASE)):
-        return HTMLResponse(status_code=403)
-    return FileResponse(str(resolved))
-
-
 if VERSION != "DEV_VERSION":
-    app.mount("/assets", StaticFiles(directory="dist/assets"), name="assets")
-    app.mount("/images", StaticFiles(directory="dist/images"), name="images")
-    # app.mount("/icons", StaticFiles(directory="dist/icons"), name="icons")
-    templates = Jinja2Templates(directory="dist")
+    webui = StaticIndex("dist")
 
     @app.get("/{path:path}")
     def html(request: Request, path: str):
-        files = os.listdir("dist")
-        if path in files:
-            return FileResponse(f"dist/{path}")
-        else:
-            context = {"request": request}
-            return templates.TemplateResponse("index.html", context)
+        return webui.response(request, path)
 
 else:
 
@@ -4,7 +4,9 @@ from .auth import router as auth_router
 from .bangumi import router as bangumi_router
 from .config import router as config_router
 from .downloader import router as downloader_router
+from .events import router as events_router
 from .log import router as log_router
+from .metrics import router as metrics_router
 from .passkey import router as passkey_router
 from .program import router as program_router
 from .rss import router as rss_router
@@ -27,3 +29,5 @@ v1.include_router(rss_router)
 v1.include_router(search_router)
 v1.include_router(setup_router)
 v1.include_router(notification_router)
+v1.include_router(metrics_router)
+v1.include_router(events_router)
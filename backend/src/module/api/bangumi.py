@@ -1,12 +1,14 @@
+from dataclasses import asdict
 from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from module.conf import settings
-from module.database import Database
+from module.database import Database, generation
 from module.manager import TorrentManager
+from module.manager.poster import poster_jobs
 from module.models import APIResponse, Bangumi, BangumiUpdate
 from module.parser.analyser.offset_detector import (
     OffsetSuggestion as DetectorSuggestion,
@@ -15,6 +17,7 @@ from module.parser.analyser.offset_detector import detect_offset_mismatch
 from module.parser.analyser.tmdb_parser import tmdb_parser
 from module.security.api import UNAUTHORIZED, get_current_user
 
+from .cache import cached_json
 from .response import u_response
 
 
@@ -70,9 +73,12 @@ def str_to_list(data: Bangumi):
 @router.get(
     "/get/all", response_model=list[Bangumi], dependencies=[Depends(get_current_user)]
 )
-async def get_all_data():
-    with TorrentManager() as manager:
-        return manager.bangumi.search_all()
+async def get_all_data(request: Request):
+    def build():
+        with TorrentManager() as manager:
+            return manager.bangumi.search_all()
+
+    return cached_json(request, "bangumi/all", generation("bangumi"), build)
 
 
 @router.get(
@@ -167,6 +173,16 @@ async def refresh_poster_all():
         resp = await manager.refresh_poster()
     return u_response(resp)
 
+
+@router.get(
+    path="/refresh/poster/status",
+    dependencies=[Depends(get_current_user)],
+)
+async def refresh_poster_status():
+    """Progress of the background poster jobs (cache and refresh)."""
+    return [asdict(progress) for progress in poster_jobs.progress.values()]
+
+
 @router.get(
     path="/refresh/poster/{bangumi_id}",
     response_model=APIResponse,
@@ -185,7 +201,7 @@ async def refresh_poster_one(bangumi_id: int):
 )
 async def refresh_calendar():
     with TorrentManager() as manager:
-        resp = await manager.refresh_calendar()
+        resp = await manager.refresh_calendar(force=True)
     return u_response(resp)
 
 
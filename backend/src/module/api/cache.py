@@ -0,0 +1,67 @@
+"""Conditional GET support for the endpoints the WebUI polls.
+
+A response is identified by a key and a version, usually the generations of
+the tables it reads. Its serialized body is kept until the version changes,
+and a request whose ``If-None-Match`` carries the current ETag gets an empty
+304 without touching the database.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from module.utils.metrics import cache_hit, cache_miss
+
+# key -> (etag, serialized body)
+_responses: dict[str, tuple[str, bytes]] = {}
+# Table generations restart at 0 with the process; this keeps an ETag from
+# before a restart from matching one issued after it
+BOOT_ID = os.urandom(8).hex()
+
+
+def clear_response_cache():
+    _responses.clear()
+
+
+def make_etag(key: str, version: Hashable) -> str:
+    digest = hashlib.blake2b(f"{BOOT_ID}:{key}:{version!r}".encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def cached_json(
+    request: Request, key: str, version: Hashable, build: Callable[[], Any]
+) -> Response:
+    """Answer with ``build()`` as JSON, a cached copy of it, or a 304.
+
+    ``build`` is only called when the body for this version is not cached.
+    """
+    etag = make_etag(key, version)
+    # Authenticated data: browsers may keep it but must revalidate each time
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        cache_hit("api_response")
+        return Response(status_code=304, headers=headers)
+    cached = _responses.get(key)
+    if cached and cached[0] == etag:
+        cache_hit("api_response")
+        body = cached[1]
+    else:
+        cache_miss("api_response")
+        body = json.dumps(
+            jsonable_encoder(build()), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        _responses[key] = (etag, body)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Header
+from sse_starlette.sse import EventSourceResponse
+
+from module.security.api import get_current_user
+from module.utils.events import event_hub
+
+router = APIRouter(tags=["events"])
+
+
+@router.get("/events", dependencies=[Depends(get_current_user)])
+async def stream_events(last_event_id: str | None = Header(None)):
+    """
+    Server Send Event stream of state changes (bangumi, RSS, torrents, status)
+    """
+    last_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    async def event_generator():
+        async with event_hub.subscribe(last_id) as subscription:
+            async for event in subscription:
+                yield {"id": str(event.id), "event": event.type, "data": event.data}
+
+    return EventSourceResponse(content=event_generator(), ping=15)
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from fastapi.responses import JSONResponse
+from sse_starlette.sse import EventSourceResponse
 
 from module.conf import LOG_PATH
 from module.models import APIResponse
 from module.security.api import UNAUTHORIZED, get_current_user
+from module.utils.log_buffer import LogFilter, log_buffer
 
 router = APIRouter(prefix="/log", tags=["log"])
 
@@ -32,12 +34,59 @@ async def get_log():
         return Response("Log file not found", status_code=404)
 
 
+@router.get("/stream", dependencies=[Depends(get_current_user)])
+async def stream_log(
+    level: list[str] = Query([]),
+    module: str = "",
+    keyword: str = "",
+    tail: int = Query(1000, ge=0, le=5000),
+    last_event_id: str | None = Header(None),
+):
+    """
+    Server Send Event stream of new log lines, filtered by level, logger
+    name prefix and keyword. Starts with the last ``tail`` matching lines,
+    or with the lines after ``Last-Event-ID`` when reconnecting to the same
+    process.
+    """
+    match = LogFilter.build(level, module, keyword)
+
+    async def event_generator():
+        # An id above ours was sent by the process before a restart
+        if (
+            last_event_id
+            and last_event_id.isdigit()
+            and int(last_event_id) <= log_buffer.last_seq
+        ):
+            after = int(last_event_id)
+            backlog = log_buffer.since(after, match)
+        else:
+            after = log_buffer.last_seq
+            backlog = log_buffer.tail(tail, match)
+        if backlog:
+            yield _log_event(backlog)
+            after = max(after, backlog[-1].seq)
+        async for lines in log_buffer.follow(after, match):
+            yield _log_event(lines)
+
+    return EventSourceResponse(content=event_generator(), ping=15)
+
+
+def _log_event(lines) -> dict:
+    # One event per batch; multi-line data is split into data: fields
+    return {
+        "id": str(lines[-1].seq),
+        "event": "log",
+        "data": "\n".join(line.text for line in lines),
+    }
+
+
 @router.get(
     "/clear", response_model=APIResponse, dependencies=[Depends(get_current_user)]
 )
 async def clear_log():
     if LOG_PATH.exists():
         LOG_PATH.write_text("")
+        log_buffer.clear()
         return JSONResponse(
             status_code=200,
             content={"msg_en": "Log cleared successfully.", "msg_zh": "日志清除成功。"},
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Response
+
+from module.security.api import get_current_user
+from module.utils import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    dependencies=[Depends(get_current_user)],
+)
+async def get_metrics():
+    """Loop, parser, downloader and cache metrics in the Prometheus text format."""
+    return Response(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,71 @@
+import asyncio
+import re
+from pathlib import Path
+
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import FileResponse
+
+from module.utils import cache_image
+
+from .cache import etag_matches
+
+router = APIRouter(tags=["posters"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+# save_image names posters by their SHA-256, so their content never changes
+CONTENT_HASHED = re.compile(r"^[0-9a-f]{64}$")
+
+# Posters stored before thumbnails existed, backfilled on first request
+_backfilled: set[str] = set()
+
+
+def _width_for(requested: int) -> int | None:
+    for width in cache_image.POSTER_WIDTHS:
+        if width >= requested:
+            return width
+    return None
+
+
+async def _thumbnail(img_path: str, width: int) -> Path | None:
+    root = cache_image.IMAGE_ROOT
+    thumbnail = root / cache_image.thumbnail_path(img_path, width)
+    if not thumbnail.is_file() and img_path not in _backfilled:
+        _backfilled.add(img_path)
+        await asyncio.to_thread(
+            lambda: cache_image.make_thumbnails((root / img_path).read_bytes(), img_path)
+        )
+    return thumbnail if thumbnail.is_file() else None
+
+
+@router.get("/posters/{path:path}")
+async def posters(request: Request, path: str, w: int | None = Query(None, gt=0)):
+    """
+    Poster image; with ``w``, the smallest thumbnail at least that wide
+    """
+    base = (cache_image.IMAGE_ROOT / "posters").resolve()
+    resolved = (base / path).resolve()
+    if not resolved.is_relative_to(base):
+        return Response(status_code=403)
+    if not resolved.is_file():
+        return Response(status_code=404)
+
+    img_path = f"posters/{resolved.relative_to(base).as_posix()}"
+    file = resolved
+    width = _width_for(w) if w else None
+    if width:
+        file = await _thumbnail(img_path, width) or resolved
+
+    stem = resolved.name.rsplit(".", 1)[0]
+    if CONTENT_HASHED.match(stem):
+        variant = file.name.removeprefix(stem).lstrip(".")
+        etag = f'"{stem[:16]}.{variant}"'
+        cache_control = IMMUTABLE
+    else:
+        stat = file.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        cache_control = REVALIDATE
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(file, headers=headers)
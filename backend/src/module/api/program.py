@@ -2,14 +2,17 @@ import logging
 import os
 import signal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 
 from module.conf import VERSION
 from module.core import Program
-from module.models import APIResponse
+from module.models import APIResponse, ResponseModel
+from module.network import get_pool_stats
 from module.security.api import UNAUTHORIZED, get_current_user
+from module.utils.profiler import LOOPS, MAX_ITERATIONS, loop_profiler
 
+from .cache import cached_json
 from .response import u_response
 
 logger = logging.getLogger(__name__)
@@ -67,19 +70,13 @@ async def stop():
 
 
 @router.get("/status", response_model=dict, dependencies=[Depends(get_current_user)])
-async def program_status():
-    if not program.is_running:
-        return {
-            "status": False,
-            "version": VERSION,
-            "first_run": program.first_run,
-        }
-    else:
-        return {
-            "status": True,
-            "version": VERSION,
-            "first_run": program.first_run,
-        }
+async def program_status(request: Request):
+    status = {
+        "status": program.is_running,
+        "version": VERSION,
+        "first_run": program.first_run,
+    }
+    return cached_json(request, "status", tuple(status.values()), lambda: status)
 
 
 @router.get(
@@ -107,3 +104,100 @@ async def shutdown_program():
 )
 async def check_downloader_status():
     return await program.check_downloader()
+
+
+@router.get(
+    "/check/network",
+    tags=["check"],
+    response_model=dict,
+    dependencies=[Depends(get_current_user)],
+)
+async def check_network_pools():
+    """Connection pool usage of the shared outbound HTTP clients."""
+    return get_pool_stats()
+
+
+@router.get(
+    "/profile/start",
+    tags=["profile"],
+    response_model=APIResponse,
+    dependencies=[Depends(get_current_user)],
+)
+async def start_profile(loop: str = "rss", iterations: int = 1):
+    """Profile the next *iterations* passes of the rss or rename loop."""
+    if loop not in LOOPS or not 1 <= iterations <= MAX_ITERATIONS:
+        return u_response(
+            ResponseModel(
+                status=False,
+                status_code=406,
+                msg_en=f"Loop must be one of {', '.join(LOOPS)} and iterations 1-{MAX_ITERATIONS}.",
+                msg_zh=f"循环须为 {', '.join(LOOPS)} 之一，次数为 1-{MAX_ITERATIONS}。",
+            )
+        )
+    if not loop_profiler.start(loop, iterations):
+        return u_response(
+            ResponseModel(
+                status=False,
+                status_code=409,
+                msg_en="A profile is already being captured.",
+                msg_zh="已有性能分析正在进行。",
+            )
+        )
+    return u_response(
+        ResponseModel(
+            status=True,
+            status_code=200,
+            msg_en=f"Profiling the next {iterations} {loop} iterations.",
+            msg_zh=f"将分析接下来 {iterations} 次 {loop} 循环。",
+        )
+    )
+
+
+@router.get(
+    "/profile/cancel",
+    tags=["profile"],
+    response_model=APIResponse,
+    dependencies=[Depends(get_current_user)],
+)
+async def cancel_profile():
+    loop_profiler.cancel()
+    return u_response(
+        ResponseModel(
+            status=True,
+            status_code=200,
+            msg_en="Profiling cancelled.",
+            msg_zh="已取消性能分析。",
+        )
+    )
+
+
+@router.get(
+    "/profile/status",
+    tags=["profile"],
+    response_model=dict,
+    dependencies=[Depends(get_current_user)],
+)
+async def profile_status():
+    """The running capture and the last finished one, with per-phase timings."""
+    return loop_profiler.status()
+
+
+@router.get(
+    "/profile/download",
+    tags=["profile"],
+    dependencies=[Depends(get_current_user)],
+)
+async def download_profile(format: str = "prof"):
+    """The last finished capture as a ``.prof`` file, or as text with ``format=text``."""
+    if format == "text":
+        content, media_type, suffix = loop_profiler.report(), "text/plain", "txt"
+    else:
+        content, media_type, suffix = loop_profiler.dump(), "application/octet-stream", "prof"
+    if content is None:
+        raise HTTPException(status_code=404, detail="No profile has been captured.")
+    loop = loop_profiler.result.loop
+    return Response(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{loop}.{suffix}"'},
+    )
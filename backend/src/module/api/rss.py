@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
 
+from module.database import generation
 from module.downloader import DownloadClient
 from module.manager import SeasonCollector
 from module.models import APIResponse, Bangumi, RSSItem, RSSUpdate, Torrent
 from module.rss import RSSAnalyser, RSSEngine
 from module.security.api import UNAUTHORIZED, get_current_user
 
+from .cache import cached_json
 from .response import u_response
 
 router = APIRouter(prefix="/rss", tags=["rss"])
@@ -15,9 +17,12 @@ router = APIRouter(prefix="/rss", tags=["rss"])
 @router.get(
     path="", response_model=list[RSSItem], dependencies=[Depends(get_current_user)]
 )
-async def get_rss():
-    with RSSEngine() as engine:
-        return engine.rss.search_all()
+async def get_rss(request: Request):
+    def build():
+        with RSSEngine() as engine:
+            return engine.rss.search_all()
+
+    return cached_json(request, "rss/all", generation("rssitem"), build)
 
 
 @router.post(
@@ -0,0 +1,181 @@
+"""Serving the built WebUI (``dist/``) and compressing API responses.
+
+``dist/`` is indexed once at startup: each file's media type, a content
+ETag and its compressed variants. Variants are the ``.br``/``.gz`` files the
+build writes next to an asset; text assets without a ``.gz`` sibling are
+gzipped in memory so a plain ``vite build`` still gets compressed.
+
+Vite names bundled files after their content hash, so anything under
+``assets/`` is cached as immutable. Everything else, ``index.html`` in
+particular, is revalidated against its ETag on each load.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .cache import etag_matches
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Preferred first
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE = {
+    ".css",
+    ".html",
+    ".ico",
+    ".js",
+    ".json",
+    ".map",
+    ".mjs",
+    ".svg",
+    ".txt",
+    ".webmanifest",
+    ".xml",
+}
+GZIP_MIN_SIZE = 1024
+# Missing files here are 404s rather than client-side routes
+STATIC_DIRS = ("assets/", "images/")
+# name-[hash].ext, vite's default for bundled assets
+HASHED_NAME = re.compile(r"-[\w-]{8,}\.\w+$")
+
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+mimetypes.add_type("text/javascript", ".mjs")
+
+
+@dataclass(slots=True)
+class Asset:
+    path: Path
+    media_type: str
+    etag: str
+    cache_control: str
+    # encoding -> precompressed file, or body compressed at startup
+    variants: dict[str, Path | bytes] = field(default_factory=dict)
+
+
+def _cache_control(name: str) -> str:
+    if name.startswith("assets/") and HASHED_NAME.search(name):
+        return IMMUTABLE
+    return REVALIDATE
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+class StaticIndex:
+    """In-memory index of a built WebUI directory."""
+
+    def __init__(self, directory: str | Path, fallback: str = "index.html"):
+        self.root = Path(directory)
+        self.fallback = fallback
+        self.assets: dict[str, Asset] = {}
+        self.build()
+
+    def build(self):
+        assets = {}
+        compressed = 0
+        for path in sorted(self.root.rglob("*")):
+            if not path.is_file() or path.suffix in (".br", ".gz"):
+                continue
+            name = path.relative_to(self.root).as_posix()
+            body = path.read_bytes()
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type.endswith(
+                ("javascript", "json", "xml")
+            ):
+                media_type += "; charset=utf-8"
+            asset = Asset(
+                path=path,
+                media_type=media_type,
+                etag=f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"',
+                cache_control=_cache_control(name),
+            )
+            for encoding, suffix in ENCODINGS.items():
+                sibling = path.with_name(path.name + suffix)
+                if sibling.is_file():
+                    asset.variants[encoding] = sibling
+            if (
+                "gzip" not in asset.variants
+                and path.suffix in COMPRESSIBLE
+                and len(body) >= GZIP_MIN_SIZE
+            ):
+                asset.variants["gzip"] = gzip.compress(body, mtime=0)
+            compressed += bool(asset.variants)
+            assets[name] = asset
+        self.assets = assets
+        logger.debug(
+            "[WebUI] Indexed %s files in %s, %s compressed",
+            len(assets),
+            self.root,
+            compressed,
+        )
+
+    def lookup(self, path: str) -> Asset | None:
+        """Return the asset for *path*, or the SPA entry page for routes."""
+        path = path.strip("/")
+        if path in self.assets:
+            return self.assets[path]
+        if path.startswith(STATIC_DIRS):
+            return None
+        return self.assets.get(self.fallback)
+
+    def response(self, request: Request, path: str) -> Response:
+        asset = self.lookup(path)
+        if asset is None:
+            return Response(status_code=404)
+        headers = {
+            "ETag": asset.etag,
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), asset.etag):
+            return Response(status_code=304, headers=headers)
+        accepted = _accepted(request.headers.get("accept-encoding", ""))
+        for encoding in ENCODINGS:
+            if encoding in accepted and encoding in asset.variants:
+                variant = asset.variants[encoding]
+                headers["Content-Encoding"] = encoding
+                if isinstance(variant, bytes):
+                    return Response(variant, media_type=asset.media_type, headers=headers)
+                return FileResponse(variant, media_type=asset.media_type, headers=headers)
+        return FileResponse(asset.path, media_type=asset.media_type, headers=headers)
+
+
+class APIGZipMiddleware:
+    """``GZipMiddleware`` for ``/api`` only.
+
+    WebUI files are already compressed by ``StaticIndex`` and posters are
+    images, so compressing them again would only cost CPU.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = GZIP_MIN_SIZE, compresslevel: int = 6):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"].startswith("/api/"):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
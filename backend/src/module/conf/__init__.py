@@ -10,5 +10,10 @@ DATA_PATH = "sqlite:///data/data.db"
 LEGACY_DATA_PATH = Path("data/data.json")
 VERSION_PATH = Path("config/version.info")
 POSTERS_PATH = Path("data/posters")
+TORRENTS_PATH = Path("data/torrents")
+TMDB_CACHE_PATH = Path("data/tmdb_cache.db")
+OFFSET_SCAN_STATE_PATH = Path("data/offset_scan.json")
+MIKAN_CACHE_PATH = Path("data/mikan_cache.json")
+BGM_CALENDAR_PATH = Path("data/bgm_calendar.json")
 
 PLATFORM = "Windows" if sys.platform == "win32" else "Unix"
@@ -40,6 +40,13 @@ DEFAULT_SETTINGS = {
         "username": "",
         "password": "",
     },
+    "network": {
+        "max_connections": 100,
+        "max_keepalive_connections": 20,
+        "keepalive_expiry": 30.0,
+        "per_host_connections": 20,
+        "http2": False,
+    },
     "notification": {"enable": False, "providers": []},
     "experimental_openai": {
         "enable": False,
@@ -4,6 +4,8 @@ from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from queue import SimpleQueue
 
+from module.utils.log_buffer import log_buffer
+
 from .config import settings
 
 LOG_ROOT = Path("data")
@@ -39,7 +41,12 @@ def setup_logger(level: int = logging.INFO, reset: bool = False):
     log_queue: SimpleQueue = SimpleQueue()
     queue_handler = QueueHandler(log_queue)
 
-    _listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    # Recent lines for the WebUI log stream
+    log_buffer.setFormatter(formatter)
+
+    _listener = QueueListener(
+        log_queue, file_handler, stream_handler, log_buffer, respect_handler_level=True
+    )
     _listener.start()
     atexit.register(_listener.stop)
 
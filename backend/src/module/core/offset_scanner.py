@@ -1,22 +1,75 @@
 """Background scanner for detecting season/episode offset mismatches."""
 
+import asyncio
+import hashlib
+import json
 import logging
+from pathlib import Path
 
-from module.conf import settings
+from module.conf import OFFSET_SCAN_STATE_PATH, settings
 from module.database import Database
 from module.models import Bangumi
 from module.parser.analyser.offset_detector import detect_offset_mismatch
-from module.parser.analyser.tmdb_parser import tmdb_parser
+from module.parser.analyser.tmdb_parser import TMDBInfo, tmdb_parser
+from module.utils.events import publish
 
 logger = logging.getLogger(__name__)
 
+# Bangumi checked at once; TMDB requests are rate limited in tmdb_parser
+SCAN_CONCURRENCY = 4
+# Persist progress after this many checks so a restart can resume
+_SAVE_EVERY = 10
+
 
 class OffsetScanner:
     """Periodically scan bangumi for season/episode mismatches with TMDB."""
 
+    def __init__(self, state_path: Path = OFFSET_SCAN_STATE_PATH):
+        self.state_path = Path(state_path)
+
+    def _load_state(self) -> dict:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            state = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[OffsetScanner] Ignoring unreadable scan state: {e}")
+            state = {}
+        return {
+            "done": state.get("done", []),
+            "fingerprints": state.get("fingerprints", {}),
+        }
+
+    def _save_state(self, done: set[int], fingerprints: dict[str, str]):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps({"done": sorted(done), "fingerprints": fingerprints})
+            )
+            tmp.replace(self.state_path)
+        except OSError as e:
+            logger.debug(f"[OffsetScanner] Failed to save scan state: {e}")
+
+    @staticmethod
+    def _fingerprint(bangumi: Bangumi, tmdb_info: TMDBInfo) -> str:
+        """Hash of everything offset detection reads, to skip unchanged bangumi."""
+        data = [
+            bangumi.season,
+            tmdb_info.id,
+            tmdb_info.last_season,
+            tmdb_info.season_episode_counts,
+            tmdb_info.virtual_season_starts,
+        ]
+        return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
     async def scan_all(self) -> int:
         """Scan all active bangumi for offset mismatches.
 
+        Bangumi are checked concurrently (``SCAN_CONCURRENCY`` at a time).
+        Progress is saved to ``state_path``; an interrupted scan resumes
+        where it stopped instead of starting over.
+
         Returns:
             Number of bangumi flagged for review.
         """
@@ -29,26 +82,57 @@ class OffsetScanner:
             logger.debug("[OffsetScanner] No active bangumi to scan.")
             return 0
 
-        flagged_count = 0
-        for bangumi in bangumi_list:
-            try:
-                if await self._check_bangumi(bangumi):
-                    flagged_count += 1
-            except Exception as e:
-                logger.warning(
-                    f"[OffsetScanner] Error checking {bangumi.official_title}: {e}"
-                )
+        state = self._load_state()
+        done: set[int] = set(state["done"])
+        fingerprints: dict[str, str] = state["fingerprints"]
+        pending = [b for b in bangumi_list if b.id not in done]
+        if len(pending) < len(bangumi_list):
+            logger.info(
+                f"[OffsetScanner] Resuming scan, {len(bangumi_list) - len(pending)} "
+                f"of {len(bangumi_list)} already checked."
+            )
 
+        semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+        async def check(bangumi: Bangumi) -> bool:
+            async with semaphore:
+                try:
+                    flagged = await self._check_bangumi(bangumi, fingerprints)
+                except Exception as e:
+                    logger.warning(
+                        f"[OffsetScanner] Error checking {bangumi.official_title}: {e}"
+                    )
+                    flagged = False
+            done.add(bangumi.id)
+            if len(done) % _SAVE_EVERY == 0:
+                self._save_state(done, fingerprints)
+            return flagged
+
+        try:
+            results = await asyncio.gather(*[check(b) for b in pending])
+        except BaseException:
+            self._save_state(done, fingerprints)
+            raise
+
+        # Scan finished: reset progress, keep fingerprints of bangumi still active
+        active = {str(b.id) for b in bangumi_list}
+        self._save_state(set(), {k: v for k, v in fingerprints.items() if k in active})
+        flagged_count = sum(results)
         logger.info(
             f"[OffsetScanner] Scan complete. Flagged {flagged_count} bangumi for review."
         )
         return flagged_count
 
-    async def _check_bangumi(self, bangumi: Bangumi) -> bool:
+    async def _check_bangumi(
+        self, bangumi: Bangumi, fingerprints: dict[str, str] | None = None
+    ) -> bool:
         """Check a single bangumi for offset mismatch.
 
         Args:
             bangumi: The bangumi to check.
+            fingerprints: Fingerprints from earlier scans, keyed by bangumi id.
+                When given, bangumi whose TMDB season data is unchanged are
+                skipped and the dict is updated in place.
 
         Returns:
             True if flagged for review, False otherwise.
@@ -77,6 +161,15 @@ class OffsetScanner:
             )
             return False
 
+        fingerprint = None
+        if fingerprints is not None:
+            fingerprint = self._fingerprint(bangumi, tmdb_info)
+            if fingerprints.get(str(bangumi.id)) == fingerprint:
+                logger.debug(
+                    f"[OffsetScanner] Skipping {bangumi.official_title}: TMDB data unchanged"
+                )
+                return False
+
         # Get latest episode for this bangumi (use season as proxy since we don't track episodes)
         # For now, we'll check based on the bangumi's season
         parsed_episode = 1  # Default to episode 1 for season-based detection
@@ -88,7 +181,8 @@ class OffsetScanner:
             tmdb_info=tmdb_info,
         )
 
-        if suggestion and suggestion.confidence in ("high", "medium"):
+        flagged = bool(suggestion and suggestion.confidence in ("high", "medium"))
+        if flagged:
             with Database() as db:
                 db.bangumi.set_needs_review(
                     bangumi.id,
@@ -96,13 +190,23 @@ class OffsetScanner:
                     suggested_season_offset=suggestion.season_offset,
                     suggested_episode_offset=suggestion.episode_offset,
                 )
+            publish(
+                "review_flagged",
+                {
+                    "id": bangumi.id,
+                    "official_title": bangumi.official_title,
+                    "reason": suggestion.reason,
+                },
+            )
             logger.info(
                 f"[OffsetScanner] Flagged {bangumi.official_title} for review: {suggestion.reason} "
                 f"(suggested: season={suggestion.season_offset}, episode={suggestion.episode_offset})"
             )
-            return True
 
-        return False
+        # Only once the check went through; a failed one is retried next scan
+        if fingerprint is not None:
+            fingerprints[str(bangumi.id)] = fingerprint
+        return flagged
 
     async def check_single(self, bangumi_id: int) -> bool:
         """Check a single bangumi by ID.
@@ -12,6 +12,7 @@ from module.update import (
     run_migrations,
     start_up,
 )
+from module.utils.events import publish
 
 from .sub_thread import CalendarRefreshThread, OffsetScanThread, RenameThread, RSSThread
 
@@ -70,9 +71,9 @@ class Program(RenameThread, RSSThread, OffsetScanThread, CalendarRefreshThread):
                 # Always check schema version and run pending migrations,
                 # in case a previous migration was interrupted or failed.
                 run_migrations()
-        if not self.img_cache:
-            logger.info("[Core] No image cache exists, create image cache.")
-            await cache_image()
+        # Caches remote posters in the background. Runs on every start so a
+        # pass cut short by a restart resumes; a no-op once all are local
+        cache_image()
         await self.start()
         self._startup_done = True
 
@@ -103,6 +104,7 @@ class Program(RenameThread, RSSThread, OffsetScanThread, CalendarRefreshThread):
         # Start calendar refresh (every 24 hours)
         self.calendar_start()
         self._tasks_started = True
+        publish("status", {"status": self.is_running})
         logger.info("Program running.")
         return ResponseModel(
             status=True,
@@ -118,6 +120,7 @@ class Program(RenameThread, RSSThread, OffsetScanThread, CalendarRefreshThread):
             await self.scan_stop()
             await self.calendar_stop()
             self._tasks_started = False
+            publish("status", {"status": False})
             return ResponseModel(
                 status=True,
                 status_code=200,
@@ -6,6 +6,8 @@ from module.downloader import DownloadClient
 from module.manager import Renamer, TorrentManager, eps_complete
 from module.notification import NotificationManager
 from module.rss import RSSAnalyser, RSSEngine
+from module.utils.metrics import histogram
+from module.utils.profiler import loop_profiler
 
 from .offset_scanner import OffsetScanner
 from .status import ProgramStatus
@@ -15,6 +17,13 @@ logger = logging.getLogger(__name__)
 # Calendar refresh interval in seconds (24 hours)
 CALENDAR_REFRESH_INTERVAL = 24 * 60 * 60
 
+LOOP_TICK = histogram(
+    "autobangumi_loop_tick_seconds",
+    "Duration of one pass of a background loop.",
+    ("loop",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+
 
 class RSSThread(ProgramStatus):
     def __init__(self):
@@ -26,16 +35,17 @@ class RSSThread(ProgramStatus):
     async def rss_loop(self):
         while not self._rss_stop_event.is_set():
             try:
-                async with DownloadClient() as client:
-                    with RSSEngine() as engine:
-                        # Analyse RSS
-                        rss_list = engine.rss.search_aggregate()
-                        for rss in rss_list:
-                            await self.analyser.rss_to_data(rss, engine)
-                        # Run RSS Engine
-                        await engine.refresh_rss(client)
-                if settings.bangumi_manage.eps_complete:
-                    await eps_complete()
+                with LOOP_TICK.time("rss"), loop_profiler.iteration("rss"):
+                    async with DownloadClient() as client:
+                        with RSSEngine() as engine:
+                            # Analyse RSS
+                            rss_list = engine.rss.search_aggregate()
+                            for rss in rss_list:
+                                await self.analyser.rss_to_data(rss, engine)
+                            # Run RSS Engine
+                            await engine.refresh_rss(client)
+                    if settings.bangumi_manage.eps_complete:
+                        await eps_complete()
             except Exception as e:
                 logger.error(f"[RSSThread] Error during RSS loop: {e}")
             try:
@@ -70,12 +80,13 @@ class RenameThread(ProgramStatus):
     async def rename_loop(self):
         while not self._rename_stop_event.is_set():
             try:
-                async with Renamer() as renamer:
-                    renamed_info = await renamer.rename()
-                if settings.notification.enable and renamed_info:
-                    manager = NotificationManager()
-                    for info in renamed_info:
-                        await manager.send_all(info)
+                with LOOP_TICK.time("rename"), loop_profiler.iteration("rename"):
+                    async with Renamer() as renamer:
+                        renamed_info = await renamer.rename()
+                    if settings.notification.enable and renamed_info:
+                        manager = NotificationManager()
+                        for info in renamed_info:
+                            await manager.send_all(info)
             except Exception as e:
                 logger.error(f"[RenameThread] Error during rename loop: {e}")
             try:
@@ -120,10 +131,11 @@ class OffsetScanThread(ProgramStatus):
 
         while not self._scan_stop_event.is_set():
             try:
-                flagged = await self._scanner.scan_all()
-                logger.info(
-                    f"[OffsetScanThread] Scan complete, flagged {flagged} bangumi"
-                )
+                with LOOP_TICK.time("offset_scan"):
+                    flagged = await self._scanner.scan_all()
+                    logger.info(
+                        f"[OffsetScanThread] Scan complete, flagged {flagged} bangumi"
+                    )
             except Exception as e:
                 logger.error(f"[OffsetScanThread] Error during scan: {e}")
 
@@ -166,16 +178,17 @@ class CalendarRefreshThread(ProgramStatus):
 
         while not self._calendar_stop_event.is_set():
             try:
-                with TorrentManager() as manager:
-                    resp = await manager.refresh_calendar()
-                    if resp.status:
-                        logger.info(
-                            "[CalendarRefreshThread] Calendar refresh completed"
-                        )
-                    else:
-                        logger.warning(
-                            f"[CalendarRefreshThread] Calendar refresh failed: {resp.msg_en}"
-                        )
+                with LOOP_TICK.time("calendar"):
+                    with TorrentManager() as manager:
+                        resp = await manager.refresh_calendar()
+                        if resp.status:
+                            logger.info(
+                                "[CalendarRefreshThread] Calendar refresh completed"
+                            )
+                        else:
+                            logger.warning(
+                                f"[CalendarRefreshThread] Calendar refresh failed: {resp.msg_en}"
+                            )
             except Exception as e:
                 logger.error(f"[CalendarRefreshThread] Error during refresh: {e}")
 
@@ -1,2 +1,3 @@
 from .combine import Database
 from .engine import engine
+from .generation import generation
@@ -8,6 +8,7 @@ from sqlalchemy.sql import func
 from sqlmodel import Session, and_, delete, false, or_, select
 
 from module.models import Bangumi, BangumiUpdate
+from module.utils.metrics import cache_hit, cache_miss
 
 logger = logging.getLogger(__name__)
 
@@ -346,6 +347,15 @@ class BangumiDatabase:
                 "[Database] Update %s poster_link to %s.", title_raw, poster_link
             )
 
+    def update_posters(self, links: dict[int, str]):
+        """Set poster_link by bangumi id, e.g. from a background poster job."""
+        for bangumi in self.search_ids(list(links)):
+            bangumi.poster_link = links[bangumi.id]
+            self.session.add(bangumi)
+        self.session.commit()
+        _invalidate_bangumi_cache()
+        logger.debug("[Database] Update poster_link of %s bangumi.", len(links))
+
     def delete_one(self, _id: int):
         statement = select(Bangumi).where(Bangumi.id == _id)
         result = self.session.execute(statement)
@@ -369,7 +379,9 @@ class BangumiDatabase:
             _bangumi_cache is not None
             and (now - _bangumi_cache_time) < _BANGUMI_CACHE_TTL
         ):
+            cache_hit("bangumi")
             return _bangumi_cache
+        cache_miss("bangumi")
         statement = select(Bangumi)
         result = self.session.execute(statement)
         bangumis = list(result.scalars().all())
@@ -10,6 +10,7 @@ from module.models import Bangumi, User
 from module.models.passkey import Passkey
 from module.models.rss import RSSItem
 from module.models.torrent import Torrent
+from module.utils.metrics import histogram
 
 from .bangumi import BangumiDatabase
 from .engine import engine as e
@@ -19,6 +20,8 @@ from .user import UserDatabase
 
 logger = logging.getLogger(__name__)
 
+DB_COMMIT = histogram("autobangumi_db_commit_seconds", "Database commit duration.")
+
 # 所有需要进行空值填充的表模型
 TABLE_MODELS: list[type[SQLModel]] = [Bangumi, RSSItem, Torrent, User, Passkey]
 
@@ -122,6 +125,10 @@ class Database(Session):
         self.bangumi = BangumiDatabase(self)
         self.user = UserDatabase(self)
 
+    def commit(self):
+        with DB_COMMIT.time():
+            super().commit()
+
     def create_table(self):
         SQLModel.metadata.create_all(self.engine)
         self._ensure_schema_version_table()
@@ -0,0 +1,55 @@
+"""Per-table write generations.
+
+Each table has a counter that is bumped after a session commits changes to
+it, whether through the ORM (add, modify, delete) or a bulk UPDATE/DELETE
+statement. Readers compare generations to tell whether data they derived
+earlier is still current; the API uses them as ETags.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_generations: dict[str, int] = {}
+_PENDING = "generation_pending"
+
+
+def generation(*tables: str) -> tuple[int, ...]:
+    return tuple(_generations.get(table, 0) for table in tables)
+
+
+def bump(*tables: str):
+    for table in tables:
+        _generations[table] = _generations.get(table, 0) + 1
+
+
+def _pending(session: Session) -> set[str]:
+    return session.info.setdefault(_PENDING, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session: Session, flush_context):
+    pending = _pending(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            pending.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _pending(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session: Session):
+    # Bump only once the data is visible to other sessions, so a reader
+    # never pairs the new generation with the old rows
+    bump(*session.info.pop(_PENDING, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session):
+    session.info.pop(_PENDING, None)
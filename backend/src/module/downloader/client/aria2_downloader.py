@@ -1,32 +1,73 @@
 import asyncio
+import base64
 import logging
 
 import httpx
 
 from module.conf import settings
+from module.network import backoff_delay
 
 logger = logging.getLogger(__name__)
 
+# Only request the status keys the app reads; aria2 otherwise returns the
+# full file and peer lists for every download.
+_STATUS_KEYS = [
+    "gid",
+    "status",
+    "totalLength",
+    "completedLength",
+    "downloadSpeed",
+    "uploadSpeed",
+    "connections",
+    "numSeeders",
+    "dir",
+    "infoHash",
+    "bittorrent",
+]
+_FILE_KEYS = ["gid", "dir", "bittorrent", "files"]
+_LIST_LIMIT = 1000
+
+# aria2 status -> qBittorrent state (downloading, seeding)
+_STATE_MAP = {
+    "active": ("downloading", "uploading"),
+    "waiting": ("queuedDL", "queuedUP"),
+    "paused": ("pausedDL", "pausedUP"),
+    "error": ("error", "error"),
+    "complete": ("pausedUP", "pausedUP"),
+}
+
+_STATUS_FILTERS = {
+    "completed": lambda s: s["status"] == "complete"
+    or (s["totalLength"] != "0" and s["completedLength"] == s["totalLength"]),
+    "downloading": lambda s: s["status"] in ("active", "waiting")
+    and s["completedLength"] != s["totalLength"],
+    "paused": lambda s: s["status"] == "paused",
+    "active": lambda s: s["status"] == "active",
+}
+
 
 class Aria2Downloader:
+    # aria2 has no RPC to rename files of an existing download
+    supports_rename = False
+
     def __init__(self, host: str, username: str, password: str):
         self.host = host
         self.secret = password
         self._client: httpx.AsyncClient | None = None
         self._rpc_url = f"{host}/jsonrpc"
         self._id = 0
+        # infoHash -> gid, refreshed by every listing
+        self._gids: dict[str, str] = {}
+        self._pending_files: dict[str, asyncio.Future] | None = None
+        self._flush_task: asyncio.Task | None = None
 
-    async def _call(self, method: str, params: list = None):
+    async def _post(self, method: str, params: list):
         self._id += 1
-        if params is None:
-            params = []
-        # Prepend token
-        full_params = [f"token:{self.secret}"] + params
         payload = {
             "jsonrpc": "2.0",
             "id": self._id,
-            "method": f"aria2.{method}",
-            "params": full_params,
+            "method": method,
+            "params": params,
         }
         resp = await self._client.post(self._rpc_url, json=payload)
         result = resp.json()
@@ -34,6 +75,41 @@ class Aria2Downloader:
             raise Exception(f"Aria2 RPC error: {result['error']}")
         return result.get("result")
 
+    async def _call(self, method: str, params: list = None):
+        if params is None:
+            params = []
+        # Prepend token
+        return await self._post(f"aria2.{method}", [f"token:{self.secret}"] + params)
+
+    async def _multicall(self, calls: list[tuple[str, list]]) -> list:
+        """Run several aria2 methods in one ``system.multicall`` round trip.
+
+        Returns one entry per call: the method result, or ``None`` if that
+        call faulted (e.g. pausing an already stopped download).
+        """
+        if not calls:
+            return []
+        token = f"token:{self.secret}"
+        results = await self._post(
+            "system.multicall",
+            [
+                [
+                    {"methodName": f"aria2.{method}", "params": [token] + params}
+                    for method, params in calls
+                ]
+            ],
+        )
+        out = []
+        for (method, _), result in zip(calls, results):
+            if isinstance(result, dict):
+                logger.debug(
+                    "[Downloader] Aria2 %s failed: %s", method, result.get("faultString")
+                )
+                out.append(None)
+            else:
+                out.append(result[0])
+        return out
+
     async def auth(self, retry=3):
         self._client = httpx.AsyncClient(
             timeout=httpx.Timeout(connect=3.1, read=10.0, write=10.0, pool=10.0)
@@ -45,9 +121,9 @@ class Aria2Downloader:
                 return True
             except Exception as e:
                 logger.warning(
-                    f"Can't login Aria2 Server {self.host}, retry in 5 seconds. Error: {e}"
+                    f"Can't login Aria2 Server {self.host}, retrying. Error: {e}"
                 )
-                await asyncio.sleep(5)
+                await asyncio.sleep(backoff_delay(times, base=2.0))
                 times += 1
         return False
 
@@ -56,89 +132,243 @@ class Aria2Downloader:
             await self._client.aclose()
             self._client = None
 
-    async def torrents_files(self, torrent_hash: str):
+    @staticmethod
+    def _hash(status: dict) -> str:
+        return status.get("infoHash") or status["gid"]
+
+    @staticmethod
+    def _name(status: dict) -> str:
+        return status.get("bittorrent", {}).get("info", {}).get("name", "")
+
+    async def _list_status(self) -> list[dict]:
+        """Return the key-filtered status of every download in one multicall."""
+        active, waiting, stopped = await self._multicall(
+            [
+                ("tellActive", [_STATUS_KEYS]),
+                ("tellWaiting", [0, _LIST_LIMIT, _STATUS_KEYS]),
+                ("tellStopped", [0, _LIST_LIMIT, _STATUS_KEYS]),
+            ]
+        )
+        statuses = (active or []) + (waiting or []) + (stopped or [])
+        for status in statuses:
+            self._gids[self._hash(status)] = status["gid"]
+        return statuses
+
+    async def _resolve_gids(self, hashes) -> list[str]:
+        if isinstance(hashes, str):
+            hashes = [h for h in hashes.split("|") if h]
+        if any(h not in self._gids for h in hashes):
+            await self._list_status()
+        return [self._gids[h] for h in hashes if h in self._gids]
+
+    @staticmethod
+    def _to_info(status: dict) -> dict:
+        """Convert an aria2 status struct into the qBittorrent torrents/info shape."""
+        total = int(status["totalLength"])
+        completed = int(status["completedLength"])
+        progress = completed / total if total else 0.0
+        speed = int(status["downloadSpeed"])
+        state = _STATE_MAP.get(status["status"], ("unknown", "unknown"))[
+            progress >= 1
+        ]
+        return {
+            "hash": Aria2Downloader._hash(status),
+            "name": Aria2Downloader._name(status) or status["gid"],
+            "save_path": status["dir"],
+            "size": total,
+            "progress": progress,
+            "dlspeed": speed,
+            "upspeed": int(status.get("uploadSpeed", 0)),
+            "num_seeds": int(status.get("numSeeders", 0)),
+            "num_leechs": int(status.get("connections", 0)),
+            "state": state,
+            "eta": (total - completed) // speed if speed else 8640000,
+            # aria2 has neither categories nor tags
+            "category": "Bangumi",
+            "tags": "",
+            "added_on": 0,
+        }
+
+    @staticmethod
+    def _to_files(status: dict) -> list[dict]:
+        """Convert aria2 absolute file paths to qBittorrent's NoSubfolder layout."""
+        base = status["dir"].rstrip("/") + "/"
+        name = Aria2Downloader._name(status)
+        root = f"{name}/" if name else ""
+        result = []
+        for f in status.get("files", []):
+            path = f["path"]
+            if not path or path.startswith("[METADATA]"):
+                continue
+            if path.startswith(base):
+                path = path[len(base) :]
+            if root and path.startswith(root):
+                path = path[len(root) :]
+            length = int(f["length"])
+            result.append(
+                {
+                    "index": int(f["index"]) - 1,
+                    "name": path,
+                    "size": length,
+                    "progress": int(f["completedLength"]) / length if length else 1,
+                    "priority": 1 if f.get("selected") == "true" else 0,
+                }
+            )
+        return result
+
+    async def torrents_info(self, status_filter, category, tag=None):
+        if tag:
+            return []
+        predicate = _STATUS_FILTERS.get(status_filter)
+        return [
+            self._to_info(status)
+            for status in await self._list_status()
+            if status["status"] != "removed" and (not predicate or predicate(status))
+        ]
+
+    async def get_torrents_by_tag(self, tag: str) -> list[dict]:
         return []
 
+    async def _flush_files(self):
+        pending, self._pending_files = self._pending_files, None
+        try:
+            gids = await self._resolve_gids(list(pending))
+            results = await self._multicall(
+                [("tellStatus", [gid, _FILE_KEYS]) for gid in gids]
+            )
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        gid_hash = {gid: _hash for _hash, gid in self._gids.items()}
+        files_map = {}
+        for status in results:
+            # Skip faulted calls and gids that no pending hash maps to
+            _hash = gid_hash.get(status["gid"]) if status else None
+            if _hash:
+                files_map[_hash] = self._to_files(status)
+        for _hash, future in pending.items():
+            if not future.done():
+                future.set_result(files_map.get(_hash, []))
+
+    async def torrents_files(self, torrent_hash: str):
+        # Calls issued in the same event loop tick (e.g. the renamer's gather)
+        # share one system.multicall.
+        if self._pending_files is None:
+            self._pending_files = {}
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_files()
+            )
+        future = self._pending_files.get(torrent_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_files[torrent_hash] = future
+        return await asyncio.shield(future)
+
     async def add_torrents(
         self, torrent_urls, torrent_files, save_path, category, tags=None
     ):
-        import base64
-
         options = {"dir": save_path}
+        calls = []
         if torrent_urls:
             urls = torrent_urls if isinstance(torrent_urls, list) else [torrent_urls]
-            for url in urls:
-                await self._call("addUri", [[url], options])
+            calls.extend(("addUri", [[url], options]) for url in urls)
         if torrent_files:
             files = (
                 torrent_files if isinstance(torrent_files, list) else [torrent_files]
             )
-            for f in files:
-                b64 = base64.b64encode(f).decode()
-                await self._call("addTorrent", [b64, [], options])
-        return True
+            calls.extend(
+                ("addTorrent", [base64.b64encode(f).decode(), [], options])
+                for f in files
+            )
+        results = await self._multicall(calls)
+        return any(r is not None for r in results)
 
     async def check_host(self):
-        raise NotImplementedError("Aria2 does not support this operation")
+        try:
+            await self._call("getVersion")
+            return True
+        except Exception:
+            return False
 
     async def prefs_init(self, prefs):
-        raise NotImplementedError("Aria2 does not support this operation")
+        # The qBittorrent RSS preferences have no aria2 counterpart.
+        logger.debug("[Downloader] Aria2 ignores prefs: %s", prefs)
 
     async def get_app_prefs(self):
-        raise NotImplementedError("Aria2 does not support this operation")
+        options = await self._call("getGlobalOption")
+        return {"save_path": options.get("dir", "")}
 
     async def add_category(self, category):
-        raise NotImplementedError("Aria2 does not support this operation")
-
-    async def torrents_info(self, status_filter, category, tag=None):
-        raise NotImplementedError("Aria2 does not support this operation")
-
-    async def get_torrents_by_tag(self, tag: str) -> list[dict]:
-        raise NotImplementedError("Aria2 does not support this operation")
+        # aria2 has no categories; downloads are grouped by their dir only.
+        pass
 
     async def torrents_delete(self, hash, delete_files: bool = True):
-        raise NotImplementedError("Aria2 does not support this operation")
+        """Remove the downloads; ``delete_files`` is ignored.
+
+        aria2 has no RPC to delete downloaded data, and its paths are on the
+        aria2 host, which need not be this one, so the files are left in place.
+        """
+        if delete_files:
+            logger.debug("[Downloader] Aria2 keeps downloaded files of %s", hash)
+        gids = await self._resolve_gids(hash)
+        await self._multicall([("forceRemove", [gid]) for gid in gids])
+        await self._multicall([("removeDownloadResult", [gid]) for gid in gids])
+        self._gids = {h: gid for h, gid in self._gids.items() if gid not in gids}
 
     async def torrents_pause(self, hashes: str):
-        raise NotImplementedError("Aria2 does not support this operation")
+        gids = await self._resolve_gids(hashes)
+        await self._multicall([("forcePause", [gid]) for gid in gids])
 
     async def torrents_resume(self, hashes: str):
-        raise NotImplementedError("Aria2 does not support this operation")
+        gids = await self._resolve_gids(hashes)
+        await self._multicall([("unpause", [gid]) for gid in gids])
 
     async def torrents_rename_file(
         self, torrent_hash, old_path, new_path, verify: bool = True
     ) -> bool:
-        raise NotImplementedError("Aria2 does not support this operation")
+        logger.debug(
+            "[Downloader] Aria2 does not support renaming: %s >> %s", old_path, new_path
+        )
+        return False
 
     async def rss_add_feed(self, url, item_path):
-        raise NotImplementedError("Aria2 does not support this operation")
+        logger.debug("[Downloader] Aria2 has no RSS support, skip feed %s", url)
 
     async def rss_remove_item(self, item_path):
-        raise NotImplementedError("Aria2 does not support this operation")
+        pass
 
     async def rss_get_feeds(self):
-        raise NotImplementedError("Aria2 does not support this operation")
+        return {}
 
     async def rss_set_rule(self, rule_name, rule_def):
-        raise NotImplementedError("Aria2 does not support this operation")
+        logger.debug("[Downloader] Aria2 has no RSS rules, skip %s", rule_name)
 
     async def move_torrent(self, hashes, new_location):
-        raise NotImplementedError("Aria2 does not support this operation")
+        logger.warning("[Downloader] Aria2 cannot move downloads to %s", new_location)
+        return False
 
     async def get_download_rule(self):
-        raise NotImplementedError("Aria2 does not support this operation")
+        return {}
 
     async def get_torrent_path(self, _hash):
-        raise NotImplementedError("Aria2 does not support this operation")
+        gids = await self._resolve_gids([_hash])
+        if not gids:
+            return ""
+        status = await self._call("tellStatus", [gids[0], ["dir"]])
+        return status.get("dir", "")
 
     async def set_category(self, _hash, category):
-        raise NotImplementedError("Aria2 does not support this operation")
+        logger.debug("[Downloader] Aria2 has no categories, skip %s", category)
 
     async def check_connection(self):
-        raise NotImplementedError("Aria2 does not support this operation")
+        version = await self._call("getVersion")
+        return version.get("version", "")
 
     async def remove_rule(self, rule_name):
-        raise NotImplementedError("Aria2 does not support this operation")
+        pass
 
     async def add_tag(self, _hash, tag):
-        raise NotImplementedError("Aria2 does not support this operation")
+        logger.warning("[Downloader] Aria2 has no tags, skip %s", tag)
+        return False
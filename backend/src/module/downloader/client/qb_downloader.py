@@ -5,6 +5,7 @@ import logging
 import httpx
 
 from module.ab_decorator import qb_connect_failed_wait
+from module.network import backoff_delay
 
 logger = logging.getLogger(__name__)
 
@@ -45,9 +46,9 @@ class QbDownloader:
                     break
                 else:
                     logger.error(
-                        f"Can't login qBittorrent Server {self.host} by {self.username}, retry in 5 seconds."
+                        f"Can't login qBittorrent Server {self.host} by {self.username}, retrying."
                     )
-                    await asyncio.sleep(5)
+                    await asyncio.sleep(backoff_delay(times, base=2.0))
                     times += 1
             except httpx.ConnectError as e:
                 if use_https:
@@ -59,7 +60,7 @@ class QbDownloader:
                     logger.error("Cannot connect to qBittorrent Server")
                 logger.info("Please check the IP and port in WebUI settings")
                 logger.debug("Connection error detail: %s", e)
-                await asyncio.sleep(10)
+                await asyncio.sleep(backoff_delay(times, base=2.0))
                 times += 1
             except Exception as e:
                 if use_https and "ssl" in str(e).lower():
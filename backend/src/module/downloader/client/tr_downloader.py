@@ -0,0 +1,425 @@
+import asyncio
+import base64
+import logging
+import posixpath
+
+import httpx
+
+from module.ab_decorator import qb_connect_failed_wait
+from module.network import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+_SESSION_HEADER = "X-Transmission-Session-Id"
+# Transmission has no categories; they are stored as a prefixed label so they
+# can live next to the ``ab:<id>`` tags without being confused for them.
+_CATEGORY_PREFIX = "category:"
+
+# Only the fields the rest of the app reads are requested from torrent-get,
+# which keeps the payload small for large libraries.
+_INFO_FIELDS = [
+    "hashString",
+    "name",
+    "downloadDir",
+    "percentDone",
+    "status",
+    "error",
+    "labels",
+    "totalSize",
+    "rateDownload",
+    "rateUpload",
+    "peersSendingToUs",
+    "peersGettingFromUs",
+    "eta",
+    "addedDate",
+]
+_FILE_FIELDS = ["hashString", "name", "files", "fileStats"]
+
+# tr_torrent_activity -> qBittorrent state (downloading, seeding)
+_STATUS_MAP = {
+    0: ("pausedDL", "pausedUP"),
+    1: ("checkingDL", "checkingUP"),
+    2: ("checkingDL", "checkingUP"),
+    3: ("queuedDL", "queuedUP"),
+    4: ("downloading", "uploading"),
+    5: ("queuedUP", "queuedUP"),
+    6: ("uploading", "uploading"),
+}
+
+_STATUS_FILTERS = {
+    "completed": lambda t: t["percentDone"] >= 1,
+    "downloading": lambda t: t["percentDone"] < 1 and t["status"] != 0,
+    "seeding": lambda t: t["status"] in (5, 6),
+    "paused": lambda t: t["status"] == 0,
+    "active": lambda t: t["rateDownload"] > 0 or t["rateUpload"] > 0,
+}
+
+
+class TrDownloader:
+    """Transmission RPC client exposing the same interface as QbDownloader.
+
+    Torrent listings use a single field-limited ``torrent-get`` and concurrent
+    ``torrents_files`` calls are coalesced into one multi-id request, so a
+    rename pass costs two round trips regardless of library size.
+    """
+
+    # torrent-rename-path renames in place; files cannot change folder
+    renames_across_folders = False
+
+    def __init__(self, host: str, username: str, password: str, ssl: bool):
+        if "://" not in host:
+            scheme = "https" if ssl else "http"
+            host = f"{scheme}://{host}"
+        self.host = host.rstrip("/")
+        if self.host.endswith("/rpc"):
+            self._rpc_url = self.host
+        else:
+            self._rpc_url = f"{self.host}/transmission/rpc"
+        self.username = username
+        self.password = password
+        self.ssl = ssl
+        self._client: httpx.AsyncClient | None = None
+        self._session_id = ""
+        self._pending_files: dict[str, asyncio.Future] | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    async def _call(self, method: str, arguments: dict | None = None) -> dict:
+        payload = {"method": method, "arguments": arguments or {}}
+        resp = await self._client.post(
+            self._rpc_url, json=payload, headers={_SESSION_HEADER: self._session_id}
+        )
+        if resp.status_code == 409:
+            # CSRF handshake: Transmission hands out a new session id on 409
+            self._session_id = resp.headers.get(_SESSION_HEADER, "")
+            resp = await self._client.post(
+                self._rpc_url,
+                json=payload,
+                headers={_SESSION_HEADER: self._session_id},
+            )
+        if resp.status_code == 401:
+            raise PermissionError("Transmission RPC authentication failed")
+        result = resp.json()
+        if result.get("result") != "success":
+            raise Exception(f"Transmission RPC error: {result.get('result')}")
+        return result.get("arguments", {})
+
+    async def auth(self, retry=3):
+        timeout = httpx.Timeout(connect=5.0, read=10.0, write=10.0, pool=10.0)
+        auth = (self.username, self.password) if self.username else None
+        self._client = httpx.AsyncClient(timeout=timeout, auth=auth, verify=False)
+        times = 0
+        while times < retry:
+            try:
+                await self._call("session-get", {"fields": ["version"]})
+                return True
+            except PermissionError:
+                logger.error(
+                    f"Can't login Transmission Server {self.host} by {self.username}"
+                )
+                break
+            except httpx.ConnectError as e:
+                logger.error("Cannot connect to Transmission Server")
+                logger.info("Please check the IP and port in WebUI settings")
+                logger.debug("Connection error detail: %s", e)
+                await asyncio.sleep(backoff_delay(times, base=2.0))
+                times += 1
+            except Exception as e:
+                logger.warning(
+                    f"Can't login Transmission Server {self.host}, retrying. Error: {e}"
+                )
+                await asyncio.sleep(backoff_delay(times, base=2.0))
+                times += 1
+        return False
+
+    async def logout(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+            self._session_id = ""
+
+    async def check_host(self):
+        try:
+            await self._call("session-get", {"fields": ["version"]})
+            return True
+        except Exception:
+            return False
+
+    def check_rss(self, rss_link: str):
+        pass
+
+    async def check_connection(self):
+        session = await self._call("session-get", {"fields": ["version"]})
+        return session.get("version", "")
+
+    async def prefs_init(self, prefs):
+        # The qBittorrent RSS preferences have no Transmission counterpart.
+        logger.debug("[Downloader] Transmission ignores prefs: %s", prefs)
+
+    @qb_connect_failed_wait
+    async def get_app_prefs(self):
+        session = await self._call("session-get", {"fields": ["download-dir"]})
+        return {"save_path": session.get("download-dir", "")}
+
+    async def add_category(self, category):
+        # Categories are plain labels, created on first use.
+        pass
+
+    @staticmethod
+    def _split_hashes(hashes) -> list[str]:
+        if isinstance(hashes, list):
+            return hashes
+        return [h for h in hashes.split("|") if h]
+
+    @staticmethod
+    def _category(labels: list[str]) -> str:
+        for label in labels:
+            if label.startswith(_CATEGORY_PREFIX):
+                return label[len(_CATEGORY_PREFIX) :]
+        return ""
+
+    @staticmethod
+    def _to_info(torrent: dict) -> dict:
+        """Convert a torrent-get entry into the qBittorrent torrents/info shape."""
+        labels = torrent.get("labels") or []
+        done = torrent["percentDone"] >= 1
+        if torrent.get("error"):
+            state = "error"
+        else:
+            state = _STATUS_MAP.get(torrent["status"], ("unknown", "unknown"))[done]
+        return {
+            "hash": torrent["hashString"],
+            "name": torrent["name"],
+            "save_path": torrent["downloadDir"],
+            "size": torrent.get("totalSize", 0),
+            "progress": torrent["percentDone"],
+            "dlspeed": torrent.get("rateDownload", 0),
+            "upspeed": torrent.get("rateUpload", 0),
+            "num_seeds": torrent.get("peersSendingToUs", 0),
+            "num_leechs": torrent.get("peersGettingFromUs", 0),
+            "state": state,
+            "eta": torrent.get("eta", -1),
+            "category": TrDownloader._category(labels),
+            "tags": ",".join(
+                label for label in labels if not label.startswith(_CATEGORY_PREFIX)
+            ),
+            "added_on": torrent.get("addedDate", 0),
+        }
+
+    @qb_connect_failed_wait
+    async def torrents_info(self, status_filter, category, tag=None):
+        args = await self._call("torrent-get", {"fields": _INFO_FIELDS})
+        predicate = _STATUS_FILTERS.get(status_filter)
+        result = []
+        for torrent in args.get("torrents", []):
+            labels = torrent.get("labels") or []
+            if predicate and not predicate(torrent):
+                continue
+            if category and self._category(labels) != category:
+                continue
+            if tag and tag not in labels:
+                continue
+            result.append(self._to_info(torrent))
+        return result
+
+    @staticmethod
+    def _to_files(torrent: dict) -> list[dict]:
+        """Convert torrent files to qBittorrent's NoSubfolder-relative layout."""
+        root = f"{torrent['name']}/"
+        stats = torrent.get("fileStats") or []
+        files = []
+        for index, f in enumerate(torrent.get("files", [])):
+            name = f["name"]
+            if name.startswith(root):
+                name = name[len(root) :]
+            length = f.get("length", 0)
+            wanted = stats[index].get("wanted", True) if index < len(stats) else True
+            files.append(
+                {
+                    "index": index,
+                    "name": name,
+                    "size": length,
+                    "progress": f.get("bytesCompleted", 0) / length if length else 1,
+                    "priority": 1 if wanted else 0,
+                }
+            )
+        return files
+
+    async def _flush_files(self):
+        pending, self._pending_files = self._pending_files, None
+        try:
+            args = await self._call(
+                "torrent-get", {"ids": list(pending), "fields": _FILE_FIELDS}
+            )
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        found = {t["hashString"]: t for t in args.get("torrents", [])}
+        for _hash, future in pending.items():
+            if future.done():
+                continue
+            torrent = found.get(_hash)
+            future.set_result(self._to_files(torrent) if torrent else [])
+
+    @qb_connect_failed_wait
+    async def torrents_files(self, torrent_hash: str):
+        # Calls issued in the same event loop tick (e.g. the renamer's gather)
+        # share one multi-id torrent-get.
+        if self._pending_files is None:
+            self._pending_files = {}
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_files()
+            )
+        future = self._pending_files.get(torrent_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_files[torrent_hash] = future
+        return await asyncio.shield(future)
+
+    async def _add_one(self, arguments: dict) -> bool:
+        args = await self._call("torrent-add", arguments)
+        return "torrent-added" in args
+
+    async def add_torrents(
+        self, torrent_urls, torrent_files, save_path, category, tags=None
+    ):
+        base = {"download-dir": save_path, "paused": False}
+        labels = [f"{_CATEGORY_PREFIX}{category}"] if category else []
+        if tags:
+            labels.extend(t.strip() for t in tags.split(",") if t.strip())
+        if labels:
+            base["labels"] = labels
+        requests = []
+        if torrent_urls:
+            urls = torrent_urls if isinstance(torrent_urls, list) else [torrent_urls]
+            requests.extend({**base, "filename": url} for url in urls)
+        if torrent_files:
+            files = (
+                torrent_files if isinstance(torrent_files, list) else [torrent_files]
+            )
+            requests.extend(
+                {**base, "metainfo": base64.b64encode(f).decode()} for f in files
+            )
+        results = await asyncio.gather(*[self._add_one(r) for r in requests])
+        return any(results)
+
+    async def _get_labels(self, hashes: list[str]) -> dict[str, list[str]]:
+        args = await self._call(
+            "torrent-get", {"ids": hashes, "fields": ["hashString", "labels"]}
+        )
+        return {t["hashString"]: t.get("labels") or [] for t in args["torrents"]}
+
+    async def _set_labels(self, labels_map: dict[str, list[str]]):
+        await asyncio.gather(
+            *[
+                self._call("torrent-set", {"ids": [_hash], "labels": labels})
+                for _hash, labels in labels_map.items()
+            ]
+        )
+
+    async def get_torrents_by_tag(self, tag: str) -> list[dict]:
+        return await self.torrents_info(status_filter=None, category=None, tag=tag)
+
+    async def torrents_delete(self, hash, delete_files: bool = True):
+        await self._call(
+            "torrent-remove",
+            {"ids": self._split_hashes(hash), "delete-local-data": delete_files},
+        )
+
+    async def torrents_pause(self, hashes: str):
+        await self._call("torrent-stop", {"ids": self._split_hashes(hashes)})
+
+    async def torrents_resume(self, hashes: str):
+        await self._call("torrent-start", {"ids": self._split_hashes(hashes)})
+
+    async def torrents_rename_file(
+        self, torrent_hash, old_path, new_path, verify: bool = True
+    ) -> bool:
+        # torrent-rename-path only renames the last path component and applies
+        # synchronously, so there is nothing to verify afterwards.
+        if old_path == new_path:
+            return True
+        if posixpath.dirname(old_path) != posixpath.dirname(new_path):
+            # A file cannot be moved to another folder; renaming it in place
+            # would leave the path still differing on every renamer pass.
+            logger.warning(
+                "[Downloader] Transmission cannot move %s to %s", old_path, new_path
+            )
+            return False
+        new_name = posixpath.basename(new_path)
+        try:
+            args = await self._call(
+                "torrent-get", {"ids": [torrent_hash], "fields": ["name", "files"]}
+            )
+            torrents = args.get("torrents", [])
+            if not torrents:
+                return False
+            root = torrents[0]["name"]
+            full_path = old_path
+            if any(f["name"].startswith(f"{root}/") for f in torrents[0]["files"]):
+                full_path = f"{root}/{old_path}"
+            await self._call(
+                "torrent-rename-path",
+                {"ids": [torrent_hash], "path": full_path, "name": new_name},
+            )
+            return True
+        except (httpx.ConnectError, httpx.RequestError, httpx.TimeoutException) as e:
+            logger.warning(f"[Downloader] Failed to rename file {old_path}: {e}")
+            return False
+        except Exception as e:
+            logger.debug("[Downloader] Rename failed: %s >> %s: %s", old_path, new_path, e)
+            return False
+
+    # Transmission has no RSS reader; qBittorrent auto-download rules are kept
+    # out of the downloader and the RSS loop pushes torrents directly instead.
+    async def rss_add_feed(self, url, item_path):
+        logger.debug("[Downloader] Transmission has no RSS support, skip feed %s", url)
+
+    async def rss_remove_item(self, item_path):
+        pass
+
+    async def rss_get_feeds(self):
+        return {}
+
+    async def rss_set_rule(self, rule_name, rule_def):
+        logger.debug("[Downloader] Transmission has no RSS rules, skip %s", rule_name)
+
+    async def get_download_rule(self):
+        return {}
+
+    async def remove_rule(self, rule_name):
+        pass
+
+    async def move_torrent(self, hashes, new_location):
+        await self._call(
+            "torrent-set-location",
+            {"ids": self._split_hashes(hashes), "location": new_location, "move": True},
+        )
+
+    async def get_torrent_path(self, _hash):
+        args = await self._call(
+            "torrent-get", {"ids": [_hash], "fields": ["downloadDir"]}
+        )
+        torrents = args.get("torrents", [])
+        if torrents:
+            return torrents[0].get("downloadDir", "")
+        return ""
+
+    async def set_category(self, _hash, category):
+        labels_map = await self._get_labels(self._split_hashes(_hash))
+        for _hash, labels in labels_map.items():
+            labels_map[_hash] = [
+                label for label in labels if not label.startswith(_CATEGORY_PREFIX)
+            ] + [f"{_CATEGORY_PREFIX}{category}"]
+        await self._set_labels(labels_map)
+
+    async def add_tag(self, _hash, tag):
+        labels_map = await self._get_labels(self._split_hashes(_hash))
+        await self._set_labels(
+            {
+                _hash: labels + [tag]
+                for _hash, labels in labels_map.items()
+                if tag not in labels
+            }
+        )
@@ -1,19 +1,28 @@
 import asyncio
 import logging
+import posixpath
 
 from module.conf import settings
 from module.models import Bangumi, Torrent
 from module.network import RequestContent
+from module.utils.metrics import histogram
 
 from .path import TorrentPath
+from .torrent_cache import magnet_infohash, torrent_cache
 
 logger = logging.getLogger(__name__)
 
+DOWNLOADER_CALL = histogram(
+    "autobangumi_downloader_call_seconds",
+    "Latency of download client calls, by call.",
+    ("call",),
+)
+
 
 class DownloadClient(TorrentPath):
     """Unified async download client.
 
-    Wraps qBittorrent, Aria2, or MockDownloader behind a common interface.
+    Wraps qBittorrent, Transmission, Aria2, or MockDownloader behind a common interface.
     Intended to be used as an async context manager; authentication is
     performed on ``__aenter__`` and the session is closed on ``__aexit__``.
     """
@@ -25,7 +34,7 @@ class DownloadClient(TorrentPath):
 
     @staticmethod
     def __getClient():
-        """Instantiate the configured downloader client (qbittorrent | aria2 | mock)."""
+        """Instantiate the configured downloader client (qbittorrent | transmission | aria2 | mock)."""
         downloader_type = settings.downloader.type
         host = settings.downloader.host
         username = settings.downloader.username
@@ -35,6 +44,10 @@ class DownloadClient(TorrentPath):
             from .client.qb_downloader import QbDownloader
 
             return QbDownloader(host, username, password, ssl)
+        elif downloader_type == "transmission":
+            from .client.tr_downloader import TrDownloader
+
+            return TrDownloader(host, username, password, ssl)
         elif downloader_type == "aria2":
             from .client.aria2_downloader import Aria2Downloader
 
@@ -62,6 +75,7 @@ class DownloadClient(TorrentPath):
             await self.client.logout()
             self.authed = False
 
+    @DOWNLOADER_CALL.timed("auth")
     async def auth(self):
         self.authed = await self.client.auth()
         if self.authed:
@@ -122,6 +136,7 @@ class DownloadClient(TorrentPath):
         await asyncio.gather(*[self.set_rule(info) for info in bangumi_info])
         logger.debug("[Downloader] Finished.")
 
+    @DOWNLOADER_CALL.timed("get_torrent_info")
     async def get_torrent_info(
         self, category="Bangumi", status_filter="completed", tag=None
     ):
@@ -129,9 +144,26 @@ class DownloadClient(TorrentPath):
             status_filter=status_filter, category=category, tag=tag
         )
 
+    @DOWNLOADER_CALL.timed("get_torrent_files")
     async def get_torrent_files(self, torrent_hash: str):
         return await self.client.torrents_files(torrent_hash=torrent_hash)
 
+    @property
+    def supports_rename(self) -> bool:
+        """False for clients that cannot rename files (aria2)."""
+        return getattr(self.client, "supports_rename", True)
+
+    def can_rename(self, old_path: str, new_path: str) -> bool:
+        """False when the client cannot move *old_path* to the folder of *new_path*.
+
+        Such renames are unsupported rather than failed, so callers should
+        skip them instead of treating the torrent as bad.
+        """
+        if getattr(self.client, "renames_across_folders", True):
+            return True
+        return posixpath.dirname(old_path) == posixpath.dirname(new_path)
+
+    @DOWNLOADER_CALL.timed("rename_torrent_file")
     async def rename_torrent_file(
         self, _hash, old_path, new_path, verify: bool = True
     ) -> bool:
@@ -144,16 +176,39 @@ class DownloadClient(TorrentPath):
             logger.debug("[Downloader] Rename failed: %s >> %s", old_path, new_path)
         return result
 
+    @DOWNLOADER_CALL.timed("delete_torrent")
     async def delete_torrent(self, hashes, delete_files: bool = True):
         await self.client.torrents_delete(hashes, delete_files=delete_files)
         logger.info("[Downloader] Remove torrents.")
 
+    @DOWNLOADER_CALL.timed("pause_torrent")
     async def pause_torrent(self, hashes: str):
         await self.client.torrents_pause(hashes)
 
+    @DOWNLOADER_CALL.timed("resume_torrent")
     async def resume_torrent(self, hashes: str):
         await self.client.torrents_resume(hashes)
 
+    @staticmethod
+    async def _fetch_torrent(req: RequestContent, torrent: Torrent) -> bytes | None:
+        """Return the .torrent payload for *torrent*, from the local cache if possible.
+
+        Also fills ``torrent.qb_hash`` from the payload so the record can be
+        linked to the downloader entry without asking the downloader.
+        """
+        content = torrent_cache.get(torrent.url)
+        if content is None:
+            content = await req.get_content(torrent.url)
+            if content is None:
+                return None
+            info_hash = torrent_cache.put(torrent.url, content)
+        else:
+            info_hash = torrent_cache.infohash(torrent.url)
+        if info_hash:
+            torrent.qb_hash = info_hash
+        return content
+
+    @DOWNLOADER_CALL.timed("add_torrent")
     async def add_torrent(self, torrent: Torrent | list, bangumi: Bangumi) -> bool:
         """Download a torrent (or list of torrents) for the given bangumi entry.
 
@@ -173,9 +228,11 @@ class DownloadClient(TorrentPath):
                 if "magnet" in torrent[0].url:
                     torrent_url = [t.url for t in torrent]
                     torrent_file = None
+                    for t in torrent:
+                        t.qb_hash = magnet_infohash(t.url) or t.qb_hash
                 else:
                     torrent_file = await asyncio.gather(
-                        *[req.get_content(t.url) for t in torrent]
+                        *[self._fetch_torrent(req, t) for t in torrent]
                     )
                     # Filter out None values (failed fetches)
                     torrent_file = [f for f in torrent_file if f is not None]
@@ -189,8 +246,9 @@ class DownloadClient(TorrentPath):
                 if "magnet" in torrent.url:
                     torrent_url = torrent.url
                     torrent_file = None
+                    torrent.qb_hash = magnet_infohash(torrent.url) or torrent.qb_hash
                 else:
-                    torrent_file = await req.get_content(torrent.url)
+                    torrent_file = await self._fetch_torrent(req, torrent)
                     if torrent_file is None:
                         logger.warning(
                             f"[Downloader] Failed to fetch torrent file for: {bangumi.official_title}"
@@ -220,6 +278,7 @@ class DownloadClient(TorrentPath):
             )
             return False
 
+    @DOWNLOADER_CALL.timed("move_torrent")
     async def move_torrent(self, hashes, location):
         await self.client.move_torrent(hashes=hashes, new_location=location)
 
@@ -236,9 +295,11 @@ class DownloadClient(TorrentPath):
     async def get_download_rules(self):
         return await self.client.get_download_rule()
 
+    @DOWNLOADER_CALL.timed("get_torrent_path")
     async def get_torrent_path(self, hashes):
         return await self.client.get_torrent_path(hashes)
 
+    @DOWNLOADER_CALL.timed("set_category")
     async def set_category(self, hashes, category):
         await self.client.set_category(hashes, category)
 
@@ -246,12 +307,14 @@ class DownloadClient(TorrentPath):
         await self.client.remove_rule(rule_name)
         logger.info(f"[Downloader] Delete rule: {rule_name}")
 
+    @DOWNLOADER_CALL.timed("get_torrents_by_tag")
     async def get_torrents_by_tag(self, tag: str) -> list[dict]:
         """Get all torrents with a specific tag."""
         if hasattr(self.client, "get_torrents_by_tag"):
             return await self.client.get_torrents_by_tag(tag)
         return []
 
+    @DOWNLOADER_CALL.timed("add_tag")
     async def add_tag(self, torrent_hash: str, tag: str):
         """Add a tag to a torrent."""
         await self.client.add_tag(torrent_hash, tag)
@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+
+from module.conf import TORRENTS_PATH
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+MAX_URL_ENTRIES = 4096
+
+_BTIH_RE = re.compile(r"xt=urn:btih:([0-9a-zA-Z]+)")
+
+
+def _bencode_end(data: bytes, i: int) -> int:
+    """Return the offset just past the bencoded element starting at *i*."""
+    c = data[i : i + 1]
+    if c == b"i":
+        return data.index(b"e", i) + 1
+    if c in (b"l", b"d"):
+        i += 1
+        while data[i : i + 1] != b"e":
+            i = _bencode_end(data, i)
+        return i + 1
+    if c.isdigit():
+        colon = data.index(b":", i)
+        end = colon + 1 + int(data[i:colon])
+        if end > len(data):
+            raise ValueError("truncated string")
+        return end
+    raise ValueError(f"invalid bencode at offset {i}")
+
+
+def parse_infohash(data: bytes) -> str | None:
+    """Return the v1 infohash (SHA-1 of the bencoded ``info`` dict) of a .torrent."""
+    if not data or data[:1] != b"d":
+        return None
+    try:
+        i = 1
+        while data[i : i + 1] != b"e":
+            key_end = _bencode_end(data, i)
+            value_end = _bencode_end(data, key_end)
+            if data[data.index(b":", i) + 1 : key_end] == b"info":
+                return hashlib.sha1(data[key_end:value_end]).hexdigest()
+            i = value_end
+    except (ValueError, IndexError, RecursionError):
+        pass
+    return None
+
+
+def magnet_infohash(url: str) -> str | None:
+    """Return the hex infohash of a ``magnet:?xt=urn:btih:`` link."""
+    match = _BTIH_RE.search(url)
+    if not match:
+        return None
+    btih = match.group(1)
+    if len(btih) == 40:
+        return btih.lower()
+    if len(btih) == 32:
+        try:
+            return base64.b32decode(btih.upper()).hex()
+        except ValueError:
+            return None
+    return None
+
+
+class TorrentCache:
+    """Content-addressed cache of .torrent payloads.
+
+    Payloads are stored once per infohash as ``<infohash>.torrent``; a small
+    JSON index maps source URLs to infohashes. File mtimes track last use and
+    the least recently used payloads are evicted once the directory grows past
+    ``max_bytes``. Anything that does not parse as a torrent is never stored.
+
+    The directory size is kept as a running total, so the directory is only
+    scanned when it is over budget. Inside an event loop the index is written
+    from a worker thread, and writes requested meanwhile are coalesced.
+    """
+
+    def __init__(self, path: Path = TORRENTS_PATH, max_bytes: int = MAX_CACHE_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._urls: OrderedDict[str, str] | None = None
+        self._size: int | None = None
+        self._saving: asyncio.Task | None = None
+        self._dirty = False
+
+    @property
+    def _index_file(self) -> Path:
+        return self.path / "index.json"
+
+    def _index(self) -> OrderedDict[str, str]:
+        if self._urls is None:
+            self._urls = OrderedDict()
+            try:
+                self._urls.update(json.loads(self._index_file.read_text()))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning("[TorrentCache] Ignoring unreadable index: %s", e)
+        return self._urls
+
+    def _write_index(self, urls: dict[str, str]):
+        try:
+            self._index_file.write_text(json.dumps(urls))
+        except OSError as e:
+            logger.debug("[TorrentCache] Failed to write index: %s", e)
+
+    def _save_index(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_index(self._index())
+            return
+        self._dirty = True
+        if self._saving is None:
+            self._saving = loop.create_task(self._save_in_background())
+
+    async def _save_in_background(self):
+        try:
+            while self._dirty:
+                self._dirty = False
+                await asyncio.to_thread(self._write_index, dict(self._index()))
+        finally:
+            self._saving = None
+
+    def _scan(self) -> list[tuple[os.stat_result, Path]]:
+        files = []
+        for file in self.path.glob("*.torrent"):
+            try:
+                files.append((file.stat(), file))
+            except OSError:
+                continue
+        return files
+
+    def _used_bytes(self) -> int:
+        if self._size is None:
+            self._size = sum(stat.st_size for stat, _ in self._scan())
+        return self._size
+
+    def infohash(self, url: str) -> str | None:
+        return self._index().get(url)
+
+    def get(self, url: str) -> bytes | None:
+        index = self._index()
+        info_hash = index.get(url)
+        if info_hash is None:
+            return None
+        file = self.path / f"{info_hash}.torrent"
+        try:
+            data = file.read_bytes()
+            os.utime(file)
+        except OSError:
+            del index[url]
+            return None
+        index.move_to_end(url)
+        logger.debug("[TorrentCache] Hit for %s", url)
+        return data
+
+    def put(self, url: str, data: bytes) -> str | None:
+        """Store *data* fetched from *url* and return its infohash."""
+        info_hash = parse_infohash(data)
+        if info_hash is None:
+            return None
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            file = self.path / f"{info_hash}.torrent"
+            if not file.exists():
+                size = self._used_bytes()
+                file.write_bytes(data)
+                self._size = size + len(data)
+        except OSError as e:
+            logger.debug("[TorrentCache] Failed to store %s: %s", url, e)
+            return info_hash
+        index = self._index()
+        index[url] = info_hash
+        index.move_to_end(url)
+        while len(index) > MAX_URL_ENTRIES:
+            index.popitem(last=False)
+        if self._used_bytes() > self.max_bytes:
+            self._evict()
+        self._save_index()
+        return info_hash
+
+    def _evict(self):
+        files = self._scan()
+        total = sum(stat.st_size for stat, _ in files)
+        evicted = set()
+        for stat, file in sorted(files, key=lambda f: f[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= stat.st_size
+            evicted.add(file.stem)
+        self._size = total
+        index = self._index()
+        for url in [u for u, h in index.items() if h in evicted]:
+            del index[url]
+        logger.debug("[TorrentCache] Evicted %s torrent files", len(evicted))
+
+
+torrent_cache = TorrentCache()
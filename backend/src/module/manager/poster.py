@@ -0,0 +1,160 @@
+"""Background poster jobs.
+
+``cache`` downloads the posters still stored as remote URLs (libraries
+migrated from 3.0) into ``data/posters``. ``refresh`` looks up a TMDB
+poster for every bangumi without one. Both run as tasks, so startup and the
+API return at once while posters fill in, with at most ``CONCURRENCY``
+requests in flight.
+
+Results are written back in small batches as they arrive. An interrupted
+run loses at most one batch, and the next run selects only the bangumi
+still remote or missing, so the jobs resume without any extra state.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from module.conf import settings
+from module.database import Database
+from module.models import Bangumi
+from module.network import RequestContent
+from module.parser.analyser.tmdb_parser import tmdb_parser
+from module.utils import save_image
+from module.utils.events import publish
+from module.utils.metrics import gauge
+
+logger = logging.getLogger(__name__)
+
+CACHE = "cache"
+REFRESH = "refresh"
+CONCURRENCY = 4
+FLUSH_EVERY = 10
+
+
+@dataclass
+class PosterProgress:
+    job: str
+    total: int = 0
+    done: int = 0
+    updated: int = 0
+    failed: int = 0
+    running: bool = False
+
+
+def _is_remote(bangumi: Bangumi) -> bool:
+    return bool(bangumi.poster_link) and "://" in bangumi.poster_link
+
+
+def _is_missing(bangumi: Bangumi) -> bool:
+    return not bangumi.poster_link and not bangumi.deleted
+
+
+async def _download(bangumi: Bangumi) -> str | None:
+    async with RequestContent() as req:
+        img = await req.get_content(bangumi.poster_link)
+    if not img:
+        return None
+    suffix = bangumi.poster_link.rsplit(".", 1)[-1].split("?")[0] or "jpg"
+    return await asyncio.to_thread(save_image, img, suffix)
+
+
+async def _lookup(bangumi: Bangumi) -> str | None:
+    tmdb_info = await tmdb_parser(bangumi.official_title, settings.rss_parser.language)
+    return tmdb_info.poster_link if tmdb_info else None
+
+
+class PosterJobs:
+    def __init__(self, concurrency: int = CONCURRENCY):
+        self.concurrency = concurrency
+        self.progress: dict[str, PosterProgress] = {
+            CACHE: PosterProgress(CACHE),
+            REFRESH: PosterProgress(REFRESH),
+        }
+        self._jobs: dict[str, tuple[Callable[[Bangumi], bool], Callable]] = {
+            CACHE: (_is_remote, _download),
+            REFRESH: (_is_missing, _lookup),
+        }
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def running(self, job: str) -> bool:
+        task = self._tasks.get(job)
+        return task is not None and not task.done()
+
+    def start(self, job: str) -> asyncio.Task | None:
+        """Start *job* in the background; ``None`` if it is already running."""
+        if self.running(job):
+            return None
+        task = asyncio.get_running_loop().create_task(self._run(job))
+        self._tasks[job] = task
+        return task
+
+    def _report(self, progress: PosterProgress):
+        publish("poster_progress", asdict(progress))
+
+    @staticmethod
+    def _flush(links: dict[int, str]):
+        if links:
+            with Database() as db:
+                db.bangumi.update_posters(links)
+            links.clear()
+
+    async def _run(self, job: str):
+        select, fetch = self._jobs[job]
+        with Database() as db:
+            bangumis = [b for b in db.bangumi.search_all() if select(b)]
+        progress = PosterProgress(job, total=len(bangumis), running=True)
+        self.progress[job] = progress
+        if not bangumis:
+            progress.running = False
+            return progress
+        logger.info("[Poster] %s: %s bangumi to process.", job, progress.total)
+        self._report(progress)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        links: dict[int, str] = {}
+
+        async def worker(bangumi: Bangumi):
+            async with semaphore:
+                try:
+                    link = await fetch(bangumi)
+                except Exception as e:
+                    # One bad poster must not abort the rest of the pass
+                    logger.warning(
+                        "[Poster] %s failed for %s: %s", job, bangumi.official_title, e
+                    )
+                    link = None
+            progress.done += 1
+            if link:
+                links[bangumi.id] = link
+                progress.updated += 1
+            else:
+                progress.failed += 1
+            if len(links) >= FLUSH_EVERY:
+                self._flush(links)
+                self._report(progress)
+
+        try:
+            await asyncio.gather(*(worker(b) for b in bangumis))
+        finally:
+            self._flush(links)
+            progress.running = False
+            self._report(progress)
+        logger.info(
+            "[Poster] %s finished: %s updated, %s failed.",
+            job,
+            progress.updated,
+            progress.failed,
+        )
+        return progress
+
+
+poster_jobs = PosterJobs()
+
+gauge(
+    "autobangumi_poster_jobs_pending",
+    "Bangumi still queued in running background poster jobs.",
+    lambda: sum(
+        p.total - p.done for p in poster_jobs.progress.values() if p.running
+    ),
+)
@@ -7,6 +7,10 @@ from module.database import Database
 from module.downloader import DownloadClient
 from module.models import EpisodeFile, Notification, SubtitleFile
 from module.parser import TitleParser
+from module.parser.analyser.torrent_parser import ParsedFile
+from module.utils.events import publish
+from module.utils.metrics import gauge
+from module.utils.profiler import loop_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +22,12 @@ _PENDING_RENAME_COOLDOWN = 300  # 5 minutes cooldown before retrying same rename
 _CLEANUP_INTERVAL = 60  # Clean up pending cache at most once per minute
 _last_cleanup_time: float = 0
 
+gauge(
+    "autobangumi_pending_renames",
+    "Renames the downloader accepted but has not applied yet.",
+    lambda: len(_pending_renames),
+)
+
 
 class Renamer(DownloadClient):
     def __init__(self):
@@ -51,7 +61,7 @@ class Renamer(DownloadClient):
 
     @staticmethod
     def gen_path(
-        file_info: EpisodeFile | SubtitleFile,
+        file_info: ParsedFile | EpisodeFile | SubtitleFile,
         bangumi_name: str,
         method: str,
         episode_offset: int = 0,
@@ -121,6 +131,9 @@ class Renamer(DownloadClient):
                 season_offset=season_offset,
             )
             if media_path != new_path:
+                if not self.can_rename(media_path, new_path):
+                    logger.debug("[Renamer] Downloader cannot move %s, skip", media_path)
+                    return None
                 # Check if this rename was recently attempted but didn't take effect
                 # (qBittorrent can return 200 but delay actual rename while seeding)
                 pending_key = (_hash, media_path, new_path)
@@ -193,6 +206,11 @@ class Renamer(DownloadClient):
                         season_offset=season_offset,
                     )
                     if media_path != new_path:
+                        if not self.can_rename(media_path, new_path):
+                            logger.debug(
+                                "[Renamer] Downloader cannot move %s, skip", media_path
+                            )
+                            continue
                         renamed = await self.rename_torrent_file(
                             _hash=_hash, old_path=media_path, new_path=new_path
                         )
@@ -232,6 +250,8 @@ class Renamer(DownloadClient):
                     season_offset=season_offset,
                 )
                 if subtitle_path != new_path:
+                    if not self.can_rename(subtitle_path, new_path):
+                        continue
                     # Skip verification for subtitles to reduce latency
                     renamed = await self.rename_torrent_file(
                         _hash=_hash,
@@ -442,15 +462,38 @@ class Renamer(DownloadClient):
     async def rename(self) -> list[Notification]:
         # Get torrent info
         logger.debug("[Renamer] Start rename process.")
+        if not self.supports_rename:
+            # Failed renames would otherwise count as bad torrents
+            logger.debug("[Renamer] Downloader cannot rename files, skip.")
+            return []
         rename_method = settings.bangumi_manage.rename_method
-        torrents_info = await self.get_torrent_info()
-        renamed_info: list[Notification] = []
+        with loop_profiler.phase("rename", "list"):
+            torrents_info = await self.get_torrent_info()
         # Fetch all torrent files concurrently
-        all_files = await asyncio.gather(
-            *[self.get_torrent_files(info["hash"]) for info in torrents_info]
-        )
+        with loop_profiler.phase("rename", "files"):
+            all_files = await asyncio.gather(
+                *[self.get_torrent_files(info["hash"]) for info in torrents_info]
+            )
         # Batch lookup all offsets in a single database session
-        offset_map = self._batch_lookup_offsets(torrents_info)
+        with loop_profiler.phase("rename", "offsets"):
+            offset_map = self._batch_lookup_offsets(torrents_info)
+        with loop_profiler.phase("rename", "rename"):
+            renamed_info = await self._rename_all(
+                torrents_info, all_files, offset_map, rename_method
+            )
+        if renamed_info:
+            publish("torrent_renamed", [n.model_dump() for n in renamed_info])
+        logger.debug("[Renamer] Rename process finished.")
+        return renamed_info
+
+    async def _rename_all(
+        self,
+        torrents_info: list[dict],
+        all_files: list[list[dict]],
+        offset_map: dict[str, tuple[int, int]],
+        rename_method: str,
+    ) -> list[Notification]:
+        renamed_info: list[Notification] = []
         for info, files in zip(torrents_info, all_files):
             torrent_hash = info["hash"]
             torrent_name = info["name"]
@@ -485,5 +528,4 @@ class Renamer(DownloadClient):
                 await self.set_category(torrent_hash, "BangumiCollection")
             else:
                 logger.warning(f"[Renamer] {torrent_name} has no media file")
-        logger.debug("[Renamer] Rename process finished.")
         return renamed_info
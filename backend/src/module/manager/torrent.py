@@ -5,8 +5,11 @@ from module.database import Database
 from module.downloader import DownloadClient
 from module.models import Bangumi, BangumiUpdate, ResponseModel
 from module.parser import TitleParser
-from module.parser.analyser.bgm_calendar import fetch_bgm_calendar, match_weekday
+from module.parser.analyser.bgm_calendar import get_calendar_index, match_weekday
 from module.parser.analyser.tmdb_parser import tmdb_parser
+from module.utils.events import publish
+
+from .poster import REFRESH, poster_jobs
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +52,7 @@ class TorrentManager(Database):
                 # Clean up torrent records so re-adding the same anime can re-download
                 self.torrent.delete_by_bangumi_id(int(_id))
                 self.bangumi.delete_one(int(_id))
+                publish("bangumi_changed", {"id": int(_id), "action": "delete"})
                 torrent_message = None
                 if file:
                     torrent_message = await self.delete_torrents(data, client)
@@ -73,6 +77,7 @@ class TorrentManager(Database):
             async with DownloadClient() as client:
                 data.deleted = True
                 self.bangumi.update(data)
+                publish("bangumi_changed", {"id": data.id, "action": "disable"})
                 if file:
                     torrent_message = await self.delete_torrents(data, client)
                     return torrent_message
@@ -96,6 +101,7 @@ class TorrentManager(Database):
         if data:
             data.deleted = False
             self.bangumi.update(data)
+            publish("bangumi_changed", {"id": data.id, "action": "enable"})
             logger.info(f"[Manager] Enable rule for {data.official_title}")
             return ResponseModel(
                 status_code=200,
@@ -158,6 +164,7 @@ class TorrentManager(Database):
 
             data.save_path = new_path
             self.bangumi.update(data, bangumi_id)
+            publish("bangumi_changed", {"id": bangumi_id, "action": "update"})
             return ResponseModel(
                 status_code=200,
                 status=True,
@@ -174,16 +181,19 @@ class TorrentManager(Database):
             )
 
     async def refresh_poster(self):
-        bangumis = self.bangumi.search_all()
-        for bangumi in bangumis:
-            if not bangumi.poster_link:
-                await TitleParser().tmdb_poster_parser(bangumi)
-        self.bangumi.update_all(bangumis)
+        """Look up missing posters in the background; see ``poster_progress``."""
+        if poster_jobs.start(REFRESH) is None:
+            return ResponseModel(
+                status_code=200,
+                status=True,
+                msg_en="Poster refresh is already running.",
+                msg_zh="海报刷新正在进行中。",
+            )
         return ResponseModel(
             status_code=200,
             status=True,
-            msg_en="Refresh poster link successfully.",
-            msg_zh="刷新海报链接成功。",
+            msg_en="Poster refresh started.",
+            msg_zh="已开始刷新海报。",
         )
 
     async def refind_poster(self, bangumi_id: int):
@@ -197,10 +207,14 @@ class TorrentManager(Database):
             msg_zh="刷新海报链接成功。",
         )
 
-    async def refresh_calendar(self):
-        """Fetch Bangumi.tv calendar and update air_weekday for all bangumi."""
-        calendar_items = await fetch_bgm_calendar()
-        if not calendar_items:
+    async def refresh_calendar(self, force: bool = False):
+        """Update air_weekday for all bangumi from the Bangumi.tv calendar.
+
+        The calendar is refetched when the cached copy is stale or ``force``
+        is set.
+        """
+        calendar = await get_calendar_index(force=force)
+        if not calendar:
             return ResponseModel(
                 status_code=500,
                 status=False,
@@ -213,7 +227,7 @@ class TorrentManager(Database):
             if bangumi.deleted or bangumi.weekday_locked:
                 continue
             weekday = match_weekday(
-                bangumi.official_title, bangumi.title_raw, calendar_items
+                bangumi.official_title, bangumi.title_raw, calendar
             )
             if weekday is not None and weekday != bangumi.air_weekday:
                 bangumi.air_weekday = weekday
@@ -258,6 +272,7 @@ class TorrentManager(Database):
                 msg_zh=f"无法找到 id {_id}",
             )
         if self.bangumi.archive_one(_id):
+            publish("bangumi_changed", {"id": _id, "action": "archive"})
             logger.info(f"[Manager] Archived {data.official_title}")
             return ResponseModel(
                 status_code=200,
@@ -283,6 +298,7 @@ class TorrentManager(Database):
                 msg_zh=f"无法找到 id {_id}",
             )
         if self.bangumi.unarchive_one(_id):
+            publish("bangumi_changed", {"id": _id, "action": "unarchive"})
             logger.info(f"[Manager] Unarchived {data.official_title}")
             return ResponseModel(
                 status_code=200,
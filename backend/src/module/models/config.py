@@ -90,6 +90,25 @@ class Proxy(BaseModel):
         return _expand(self.password_)
 
 
+class Network(BaseModel):
+    """Outbound HTTP connection pool settings.
+
+    ``max_connections`` bounds the default pool. When ``per_host_connections``
+    is non-zero, every host gets its own pool of that size instead, so a burst
+    of TMDB lookups cannot starve feed fetches.
+    """
+
+    max_connections: int = Field(100, description="Max connections in the pool")
+    max_keepalive_connections: int = Field(
+        20, description="Max idle keep-alive connections"
+    )
+    keepalive_expiry: float = Field(30.0, description="Keep-alive expiry seconds")
+    per_host_connections: int = Field(
+        20, description="Max connections per host pool, 0 to share one pool"
+    )
+    http2: bool = Field(False, description="Enable HTTP/2, requires the h2 package")
+
+
 class NotificationProvider(BaseModel):
     """Configuration for a single notification provider."""
 
@@ -254,6 +273,7 @@ class Config(BaseModel):
     bangumi_manage: BangumiManage = BangumiManage()
     log: Log = Log()
     proxy: Proxy = Proxy()
+    network: Network = Network()
     notification: Notification = Notification()
     experimental_openai: ExperimentalOpenAI = ExperimentalOpenAI()
     security: Security = Security()
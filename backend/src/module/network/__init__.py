@@ -1 +1,4 @@
+from .circuit_breaker import backoff_delay, breaker_state
+from .rate_limiter import RateLimiter
 from .request_contents import RequestContent
+from .request_url import get_pool_stats
@@ -0,0 +1,115 @@
+import logging
+import random
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 10.0) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry attempt."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class CircuitBreaker:
+    """Track consecutive failures for one host and stop calling it while it is down.
+
+    The breaker opens after ``failure_threshold`` consecutive failures. Once
+    the cooldown has passed a single probe request is let through (half-open);
+    success closes the breaker, failure re-opens it with a doubled cooldown.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 600.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 when not open)."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.reset_timeout = self.base_reset_timeout
+        self._probing = False
+
+    def release_probe(self):
+        """Let another request probe when this one ended without an outcome.
+
+        A cancelled probe records neither success nor failure; without this
+        the breaker would stay half-open and refuse every later request.
+        """
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing:
+            # Probe failed: back off further before the next one
+            self._probing = False
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self.opened_at = time.monotonic()
+        elif self.failures >= self.failure_threshold and self.opened_at is None:
+            self.opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def _host_key(url: str) -> str:
+    try:
+        return httpx.URL(url).host or url
+    except httpx.InvalidURL:
+        return url
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """Return the shared breaker for the host of *url*."""
+    host = _host_key(url)
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker()
+    return breaker
+
+
+def breaker_state(url: str) -> str:
+    breaker = _breakers.get(_host_key(url))
+    return breaker.state if breaker else CLOSED
+
+
+def reset_breakers():
+    _breakers.clear()
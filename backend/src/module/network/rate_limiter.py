@@ -0,0 +1,24 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Async rate limiter allowing ``rate`` calls per second with bursts of ``burst``.
+
+    Uses the generic cell rate algorithm: each caller reserves the next slot
+    and sleeps until it is due, so waiters are served in arrival order
+    without a lock.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.interval = 1.0 / rate
+        self.tolerance = (burst - 1) * self.interval
+        self._tat = 0.0  # theoretical arrival time of the next call
+
+    async def acquire(self):
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self.interval
+        delay = tat - now - self.tolerance
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -1,16 +1,25 @@
 import asyncio
 import logging
+from collections import OrderedDict
 
 import httpx
 from httpx_socks import AsyncProxyTransport
 
 from module.conf import settings
+from module.utils.metrics import gauge
+
+from .circuit_breaker import HALF_OPEN, backoff_delay, get_breaker
 
 logger = logging.getLogger(__name__)
 
-# Module-level shared client for connection reuse
+# Module-level shared clients for connection reuse. The default client serves
+# every host unless per-host pools are enabled in ``settings.network``.
 _shared_client: httpx.AsyncClient | None = None
 _shared_client_proxy_key: str | None = None
+# Least recently used first; beyond MAX_HOST_CLIENTS the oldest is closed
+_host_clients: OrderedDict[str, httpx.AsyncClient] = OrderedDict()
+MAX_HOST_CLIENTS = 32
+_h2_warned = False
 
 
 def _proxy_config_key() -> str:
@@ -19,36 +28,150 @@ def _proxy_config_key() -> str:
     return ""
 
 
-async def get_shared_client() -> httpx.AsyncClient:
-    global _shared_client, _shared_client_proxy_key
-    current_key = _proxy_config_key()
-    if _shared_client is not None and _shared_client_proxy_key == current_key:
-        return _shared_client
-    if _shared_client is not None:
-        await _shared_client.aclose()
+def _network_config_key() -> str:
+    n = settings.network
+    return f"{n.max_connections}:{n.max_keepalive_connections}:{n.keepalive_expiry}:{n.per_host_connections}:{n.http2}"
+
+
+def _http2_enabled() -> bool:
+    global _h2_warned
+    if not settings.network.http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        if not _h2_warned:
+            logger.warning("[Network] HTTP/2 requires the h2 package, using HTTP/1.1")
+            _h2_warned = True
+        return False
+    return True
+
+
+def _build_client(limits: httpx.Limits) -> httpx.AsyncClient:
     timeout = httpx.Timeout(connect=10.0, read=30.0, write=10.0, pool=10.0)
+    http2 = _http2_enabled()
     if settings.proxy.enable:
         if "http" in settings.proxy.type:
             if settings.proxy.username:
                 proxy_url = f"http://{settings.proxy.username}:{settings.proxy.password}@{settings.proxy.host}:{settings.proxy.port}"
             else:
                 proxy_url = f"http://{settings.proxy.host}:{settings.proxy.port}"
-            _shared_client = httpx.AsyncClient(proxy=proxy_url, timeout=timeout)
+            return httpx.AsyncClient(
+                proxy=proxy_url, timeout=timeout, limits=limits, http2=http2
+            )
         elif settings.proxy.type == "socks5":
             if settings.proxy.username:
                 socks_url = f"socks5://{settings.proxy.username}:{settings.proxy.password}@{settings.proxy.host}:{settings.proxy.port}"
             else:
                 socks_url = f"socks5://{settings.proxy.host}:{settings.proxy.port}"
-            transport = AsyncProxyTransport.from_url(socks_url, rdns=True)
-            _shared_client = httpx.AsyncClient(transport=transport, timeout=timeout)
+            transport = AsyncProxyTransport.from_url(
+                socks_url, rdns=True, limits=limits, http2=http2
+            )
+            return httpx.AsyncClient(transport=transport, timeout=timeout)
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
+
+
+def _host_of(url: str | None) -> str | None:
+    if not url or settings.network.per_host_connections <= 0:
+        return None
+    try:
+        return httpx.URL(url).host or None
+    except httpx.InvalidURL:
+        return None
+
+
+async def close_shared_clients():
+    global _shared_client
+    clients = list(_host_clients.values())
+    if _shared_client is not None:
+        clients.append(_shared_client)
+    _shared_client = None
+    _host_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+async def get_shared_client(url: str | None = None) -> httpx.AsyncClient:
+    """Return the pooled client for *url* (or the default pool when omitted).
+
+    Clients are rebuilt when the proxy or network settings change.
+    """
+    global _shared_client, _shared_client_proxy_key
+    current_key = f"{_proxy_config_key()}|{_network_config_key()}"
+    if _shared_client_proxy_key != current_key:
+        await close_shared_clients()
+        _shared_client_proxy_key = current_key
+    network = settings.network
+    host = _host_of(url)
+    if host:
+        client = _host_clients.get(host)
+        if client is not None:
+            _host_clients.move_to_end(host)
         else:
-            _shared_client = httpx.AsyncClient(timeout=timeout)
-    else:
-        _shared_client = httpx.AsyncClient(timeout=timeout)
-    _shared_client_proxy_key = current_key
+            client = _build_client(
+                httpx.Limits(
+                    max_connections=network.per_host_connections,
+                    max_keepalive_connections=min(
+                        network.per_host_connections,
+                        network.max_keepalive_connections,
+                    ),
+                    keepalive_expiry=network.keepalive_expiry,
+                )
+            )
+            _host_clients[host] = client
+            while len(_host_clients) > MAX_HOST_CLIENTS:
+                _, evicted = _host_clients.popitem(last=False)
+                await evicted.aclose()
+        return client
+    if _shared_client is None:
+        _shared_client = _build_client(
+            httpx.Limits(
+                max_connections=network.max_connections,
+                max_keepalive_connections=network.max_keepalive_connections,
+                keepalive_expiry=network.keepalive_expiry,
+            )
+        )
     return _shared_client
 
 
+def _pool_stats(client: httpx.AsyncClient) -> dict:
+    # httpx exposes no pool introspection, so read its internals defensively
+    connections, requests, http2 = [], [], False
+    mounts = getattr(client, "_mounts", {})
+    transports = [getattr(client, "_transport", None), *mounts.values()]
+    for transport in transports:
+        pool = getattr(transport, "_pool", None)
+        if pool is None:
+            continue
+        connections.extend(getattr(pool, "connections", []))
+        requests.extend(getattr(pool, "_requests", []))
+        http2 = http2 or getattr(pool, "_http2", False)
+    idle = sum(1 for c in connections if c.is_idle())
+    return {
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "queued": sum(1 for r in requests if getattr(r, "is_queued", lambda: False)()),
+        "http2": http2,
+    }
+
+
+def get_pool_stats() -> dict[str, dict]:
+    """Connection counts per pool ("default" plus one entry per host pool)."""
+    pools = dict(_host_clients)
+    if _shared_client is not None:
+        pools = {"default": _shared_client, **pools}
+    return {name: _pool_stats(client) for name, client in pools.items()}
+
+
+gauge(
+    "autobangumi_http_pool_queued",
+    "Outbound requests waiting for a pooled connection, by pool.",
+    lambda: {(name,): stats["queued"] for name, stats in get_pool_stats().items()},
+    ("pool",),
+)
+
+
 class RequestURL:
     # More complete User-Agent to avoid Cloudflare blocking
     DEFAULT_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -72,52 +195,86 @@ class RequestURL:
             base_headers["Accept"] = "application/xml, text/xml, */*"
         return base_headers
 
+    async def _client_for(self, url: str) -> httpx.AsyncClient:
+        if _host_of(url):
+            return await get_shared_client(url)
+        return self._client
+
     async def get_url(self, url, retry=3):
         try_time = 0
         headers = self._get_headers(url)
+        breaker = get_breaker(url)
         while True:
+            probe = breaker.state == HALF_OPEN
+            if not breaker.allow_request():
+                logger.debug(
+                    "[Network] Circuit open for %s, retry after %.0fs",
+                    url,
+                    breaker.retry_after,
+                )
+                return None
             try:
-                req = await self._client.get(url=url, headers=headers)
+                client = await self._client_for(url)
+                req = await client.get(url=url, headers=headers)
                 logger.debug("[Network] Successfully connected to %s. Status: %s", url, req.status_code)
                 req.raise_for_status()
+                breaker.record_success()
                 return req
             except httpx.HTTPStatusError as e:
                 logger.warning(f"[Network] HTTP {e.response.status_code} from {url}")
+                # The host answered; only server errors count against it
+                if e.response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
                 break
             except httpx.RequestError as e:
                 logger.warning(
                     f"[Network] Request error for {url}: {type(e).__name__}. Retry {try_time + 1}/{retry}"
                 )
+                breaker.record_failure()
                 try_time += 1
                 if try_time >= retry:
                     break
-                await asyncio.sleep(5)
+                await asyncio.sleep(backoff_delay(try_time))
             except Exception as e:
                 logger.warning(f"[Network] Unexpected error for {url}: {e}")
+                breaker.record_failure()
                 break
+            finally:
+                if probe:
+                    breaker.release_probe()
         logger.error(f"[Network] Unable to connect to {url}, Please check your network settings")
         return None
 
     async def post_url(self, url: str, data: dict, retry=3):
         try_time = 0
+        breaker = get_breaker(url)
         while True:
+            probe = breaker.state == HALF_OPEN
+            if not breaker.allow_request():
+                logger.debug("[Network] Circuit open for %s", url)
+                return None
             try:
-                req = await self._client.post(
-                    url=url, headers=self.header, data=data
-                )
+                client = await self._client_for(url)
+                req = await client.post(url=url, headers=self.header, data=data)
                 req.raise_for_status()
+                breaker.record_success()
                 return req
             except httpx.RequestError:
-                logger.warning(
-                    f"[Network] Cannot connect to {url}. Wait for 5 seconds."
-                )
+                logger.warning(f"[Network] Cannot connect to {url}. Retrying.")
+                breaker.record_failure()
                 try_time += 1
                 if try_time >= retry:
                     break
-                await asyncio.sleep(5)
+                await asyncio.sleep(backoff_delay(try_time))
             except Exception as e:
                 logger.debug(e)
+                breaker.record_failure()
                 break
+            finally:
+                if probe:
+                    breaker.release_probe()
         logger.error(f"[Network] Failed connecting to {url}")
         logger.warning("[Network] Please check DNS/Connection settings")
         return None
@@ -126,7 +283,8 @@ class RequestURL:
         if "://" not in url:
             url = f"http://{url}"
         try:
-            req = await self._client.head(url=url, headers=self.header)
+            client = await self._client_for(url)
+            req = await client.head(url=url, headers=self.header)
             req.raise_for_status()
             return True
         except (httpx.RequestError, httpx.HTTPStatusError):
@@ -135,7 +293,8 @@ class RequestURL:
 
     async def post_form(self, url: str, data: dict, files):
         try:
-            req = await self._client.post(
+            client = await self._client_for(url)
+            req = await client.post(
                 url=url, headers=self.header, data=data, files=files
             )
             req.raise_for_status()
@@ -1,10 +1,18 @@
+import json
 import logging
+import time
+from pathlib import Path
 
+from module.conf import BGM_CALENDAR_PATH
 from module.network import RequestContent
 
 logger = logging.getLogger(__name__)
 
 BGM_CALENDAR_URL = "https://api.bgm.tv/calendar"
+# A restart within this window reuses the calendar saved on disk
+CALENDAR_TTL = 12 * 60 * 60
+# Shortest calendar title the substring pass matches on; also the n-gram size
+_MIN_FUZZY_LEN = 4
 
 
 async def fetch_bgm_calendar() -> list[dict]:
@@ -40,49 +48,153 @@ async def fetch_bgm_calendar() -> list[dict]:
     return items
 
 
-def match_weekday(official_title: str, title_raw: str, calendar_items: list[dict]) -> int | None:
-    """Match a bangumi against calendar items to find its air weekday.
+def _normalize(title: str) -> str:
+    return " ".join(title.split()).casefold()
 
-    Matching strategy:
-    1. Exact match on Chinese title (name_cn == official_title)
-    2. Exact match on Japanese title (name == title_raw or official_title)
-    3. Substring match (name_cn in official_title or vice versa)
-    4. Substring match on Japanese title
-    """
-    official_title_clean = official_title.strip()
-    title_raw_clean = title_raw.strip()
-
-    for item in calendar_items:
-        name_cn = item["name_cn"].strip()
-        name = item["name"].strip()
-
-        if not name_cn and not name:
-            continue
 
-        # Exact match on Chinese title
-        if name_cn and name_cn == official_title_clean:
-            return item["air_weekday"]
+def _grams(text: str) -> set[str]:
+    n = _MIN_FUZZY_LEN
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
 
-        # Exact match on Japanese/original title
-        if name and (name == title_raw_clean or name == official_title_clean):
-            return item["air_weekday"]
 
-    # Second pass: substring matching
-    for item in calendar_items:
-        name_cn = item["name_cn"].strip()
-        name = item["name"].strip()
+class CalendarIndex:
+    """Lookup tables over the calendar items for ``match_weekday``.
 
-        if not name_cn and not name:
-            continue
+    Exact matches are dict lookups on the normalized ``name_cn`` and
+    ``name``. For the substring pass every title of at least
+    ``_MIN_FUZZY_LEN`` characters is indexed by its n-grams, so only items
+    sharing an n-gram with the query are checked. When several items match,
+    the one listed first in the calendar wins, as with a linear scan.
+    """
 
-        # Chinese title substring (at least 4 chars to avoid false positives)
-        if name_cn and len(name_cn) >= 4:
-            if name_cn in official_title_clean or official_title_clean in name_cn:
-                return item["air_weekday"]
+    def __init__(self, items: list[dict], fetched_at: float | None = None):
+        self.items = items
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self._cn: dict[str, int] = {}
+        self._name: dict[str, int] = {}
+        self._cn_titles: list[str] = []
+        self._titles: list[str] = []
+        self._cn_grams: dict[str, set[int]] = {}
+        self._name_grams: dict[str, set[int]] = {}
+        for pos, item in enumerate(items):
+            name_cn = _normalize(item.get("name_cn", ""))
+            name = _normalize(item.get("name", ""))
+            self._cn_titles.append(name_cn)
+            self._titles.append(name)
+            if name_cn:
+                self._cn.setdefault(name_cn, pos)
+            if name:
+                self._name.setdefault(name, pos)
+            for title, grams in ((name_cn, self._cn_grams), (name, self._name_grams)):
+                for gram in _grams(title):
+                    grams.setdefault(gram, set()).add(pos)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _fuzzy(
+        self, query: str, titles: list[str], grams: dict[str, set[int]]
+    ) -> set[int]:
+        """Positions whose title contains *query* or is contained in it."""
+        if len(query) < _MIN_FUZZY_LEN:
+            # Too short to have n-grams; only "query in title" can match
+            candidates = range(len(titles))
+        else:
+            candidates = set()
+            for gram in _grams(query):
+                candidates |= grams.get(gram, set())
+        return {
+            pos
+            for pos in candidates
+            if len(titles[pos]) >= _MIN_FUZZY_LEN
+            and (titles[pos] in query or query in titles[pos])
+        }
+
+    def match(self, official_title: str, title_raw: str) -> int | None:
+        official = _normalize(official_title)
+        raw = _normalize(title_raw)
+        exact = [
+            pos
+            for pos in (
+                self._cn.get(official),
+                self._name.get(raw),
+                self._name.get(official),
+            )
+            if pos is not None
+        ]
+        if exact:
+            return self.items[min(exact)]["air_weekday"]
+        fuzzy = self._fuzzy(official, self._cn_titles, self._cn_grams)
+        fuzzy |= self._fuzzy(raw, self._titles, self._name_grams)
+        if fuzzy:
+            return self.items[min(fuzzy)]["air_weekday"]
+        return None
+
+    def save(self, path: Path):
+        # Only the items are stored; rebuilding the tables on load is cheap.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps(
+                    {"fetched_at": self.fetched_at, "items": self.items},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            logger.debug(f"[BGM Calendar] Failed to save calendar: {e}")
+
+    @classmethod
+    def load(cls, path: Path) -> "CalendarIndex | None":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls(data["items"], data["fetched_at"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[BGM Calendar] Ignoring unreadable calendar cache: {e}")
+            return None
+
+
+_calendar_index: CalendarIndex | None = None
+
+
+async def get_calendar_index(force: bool = False) -> CalendarIndex | None:
+    """Return the calendar index, fetching it only when the cached one is stale.
+
+    The index is kept in memory and on disk together with its fetch time.
+    ``force`` always refetches. If fetching fails, a stale calendar is used
+    rather than none.
+    """
+    global _calendar_index
+    index = _calendar_index or CalendarIndex.load(BGM_CALENDAR_PATH)
+    if not force and index and time.time() - index.fetched_at < CALENDAR_TTL:
+        _calendar_index = index
+        return index
+    items = await fetch_bgm_calendar()
+    if items:
+        index = CalendarIndex(items)
+        index.save(BGM_CALENDAR_PATH)
+    elif index:
+        logger.warning("[BGM Calendar] Using the calendar cached on disk.")
+    _calendar_index = index
+    return index
+
+
+def match_weekday(
+    official_title: str, title_raw: str, calendar: CalendarIndex | list[dict]
+) -> int | None:
+    """Match a bangumi against the calendar to find its air weekday.
 
-        # Japanese title substring
-        if name and len(name) >= 4:
-            if name in title_raw_clean or title_raw_clean in name:
-                return item["air_weekday"]
+    Matching strategy:
+    1. Exact match on Chinese title (name_cn == official_title)
+    2. Exact match on Japanese title (name == title_raw or official_title)
+    3. Substring match (name_cn in official_title or vice versa)
+    4. Substring match on Japanese title
 
-    return None
+    Pass a ``CalendarIndex`` when matching many bangumi; a plain item list
+    is indexed on every call.
+    """
+    if not isinstance(calendar, CalendarIndex):
+        calendar = CalendarIndex(calendar)
+    return calendar.match(official_title, title_raw)
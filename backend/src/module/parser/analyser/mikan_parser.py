@@ -1,42 +1,175 @@
+import asyncio
+import json
 import logging
 import re
+from collections import OrderedDict
+from pathlib import Path
 
 from bs4 import BeautifulSoup
 from urllib3.util import parse_url
 
+from module.conf import MIKAN_CACHE_PATH
 from module.network import RequestContent
-from module.utils import save_image
+from module.utils import image_exists, url_image_path, write_image
+from module.utils.metrics import cache_hit, cache_miss, gauge
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache for Mikan homepage lookups
-_mikan_cache: dict[str, tuple[str, str]] = {}
+_MIKAN_CACHE_MAX = 1024
+_PREFETCH_CONCURRENCY = 4
+
+_BANGUMI_ID_RE = re.compile(r"/Home/Bangumi/(\d+)")
+
+
+class MikanCache:
+    """Bounded LRU of Mikan homepage metadata persisted as JSON.
+
+    Each homepage maps to its official title, bangumi id, remote poster URL
+    and local poster path. Inside an event loop the file is written from a
+    worker thread, and writes requested meanwhile are coalesced.
+    """
+
+    def __init__(self, path: Path = MIKAN_CACHE_PATH, max_size: int = _MIKAN_CACHE_MAX):
+        self.path = Path(path)
+        self.max_size = max_size
+        self._entries: OrderedDict[str, dict] | None = None
+        self._saving: asyncio.Task | None = None
+        self._dirty = False
+
+    def _load(self) -> OrderedDict[str, dict]:
+        if self._entries is None:
+            self._entries = OrderedDict()
+            try:
+                self._entries.update(json.loads(self.path.read_text(encoding="utf-8")))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"[Mikan] Ignoring unreadable cache: {e}")
+        return self._entries
+
+    def get(self, homepage: str) -> dict | None:
+        entries = self._load()
+        entry = entries.get(homepage)
+        if entry is not None:
+            entries.move_to_end(homepage)
+            cache_hit("mikan")
+        else:
+            cache_miss("mikan")
+        return entry
+
+    def set(self, homepage: str, entry: dict):
+        entries = self._load()
+        entries[homepage] = entry
+        entries.move_to_end(homepage)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+        self._save()
+
+    def _write(self, entries: dict[str, dict]):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"[Mikan] Failed to save cache: {e}")
+
+    def _save(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._load())
+            return
+        self._dirty = True
+        if self._saving is None:
+            self._saving = loop.create_task(self._save_in_background())
+
+    async def _save_in_background(self):
+        try:
+            while self._dirty:
+                self._dirty = False
+                await asyncio.to_thread(self._write, dict(self._load()))
+        finally:
+            self._saving = None
+
+mikan_cache = MikanCache()
+
+_prefetching: set[str] = set()
+_prefetch_tasks: set[asyncio.Task] = set()
+_prefetch_semaphore: asyncio.Semaphore | None = None
+
+gauge(
+    "autobangumi_poster_prefetch_queue",
+    "Poster downloads scheduled or running in the background.",
+    lambda: len(_prefetch_tasks),
+)
+
+
+def _parse_homepage(content: str) -> tuple[str, str | None, str | None]:
+    """Extract (official title, poster path, bangumi id) from a Mikan episode page."""
+    soup = BeautifulSoup(content, "html.parser")
+    poster_div = soup.find("div", {"class": "bangumi-poster"}).get("style")
+    title_link = soup.select_one('p.bangumi-title a[href^="/Home/Bangumi/"]')
+    official_title = re.sub(r"第.*季", "", title_link.text).strip()
+    match = _BANGUMI_ID_RE.search(title_link.get("href", ""))
+    poster_path = None
+    if poster_div:
+        poster_path = poster_div.split("url('")[1].split("')")[0].split("?")[0]
+    return official_title, poster_path, match.group(1) if match else None
+
+
+async def _download_poster(url: str, poster_link: str):
+    global _prefetch_semaphore
+    if _prefetch_semaphore is None:
+        _prefetch_semaphore = asyncio.Semaphore(_PREFETCH_CONCURRENCY)
+    try:
+        async with _prefetch_semaphore:
+            async with RequestContent() as req:
+                img = await req.get_content(url)
+            if img:
+                await asyncio.to_thread(write_image, img, poster_link)
+                logger.debug(f"[Mikan] Cached poster {poster_link}")
+    except OSError as e:
+        logger.warning(f"[Mikan] Failed to save poster {poster_link}: {e}")
+    finally:
+        _prefetching.discard(poster_link)
+
+
+def prefetch_poster(url: str, poster_link: str):
+    """Download a poster into ``data/posters`` in the background if missing."""
+    if poster_link in _prefetching or image_exists(poster_link):
+        return
+    _prefetching.add(poster_link)
+    task = asyncio.get_running_loop().create_task(_download_poster(url, poster_link))
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
 
 
 async def mikan_parser(homepage: str):
-    if homepage in _mikan_cache:
-        return _mikan_cache[homepage]
+    cached = mikan_cache.get(homepage)
+    if cached is not None:
+        if cached["poster_url"]:
+            prefetch_poster(cached["poster_url"], cached["poster_link"])
+        return cached["poster_link"], cached["title"]
     root_path = parse_url(homepage).host
     async with RequestContent() as req:
         content = await req.get_html(homepage)
-        soup = BeautifulSoup(content, "html.parser")
-        poster_div = soup.find("div", {"class": "bangumi-poster"}).get("style")
-        official_title = soup.select_one(
-            'p.bangumi-title a[href^="/Home/Bangumi/"]'
-        ).text
-        official_title = re.sub(r"第.*季", "", official_title).strip()
-        if poster_div:
-            poster_path = poster_div.split("url('")[1].split("')")[0]
-            poster_path = poster_path.split("?")[0]
-            img = await req.get_content(f"https://{root_path}{poster_path}")
-            suffix = poster_path.split(".")[-1]
-            poster_link = save_image(img, suffix)
-            result = (poster_link, official_title)
-            _mikan_cache[homepage] = result
-            return result
-        result = ("", "")
-        _mikan_cache[homepage] = result
-        return result
+    # BeautifulSoup is slow on full pages; keep it off the event loop
+    official_title, poster_path, bangumi_id = await asyncio.to_thread(
+        _parse_homepage, content
+    )
+    if poster_path:
+        poster_url = f"https://{root_path}{poster_path}"
+        poster_link = url_image_path(poster_url, poster_path.split(".")[-1])
+        prefetch_poster(poster_url, poster_link)
+        entry = {
+            "title": official_title,
+            "bangumi_id": bangumi_id,
+            "poster_url": poster_url,
+            "poster_link": poster_link,
+        }
+    else:
+        entry = {"title": "", "bangumi_id": bangumi_id, "poster_url": "", "poster_link": ""}
+    mikan_cache.set(homepage, entry)
+    return entry["poster_link"], entry["title"]
 
 
 if __name__ == '__main__':
@@ -1,10 +1,12 @@
+import asyncio
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from typing import Any, Optional
 
-from openai import AzureOpenAI, OpenAI
-from pydantic import BaseModel
+import httpx
+from openai import AsyncAzureOpenAI, AsyncOpenAI, AzureOpenAI, OpenAI, OpenAIError
+from pydantic import BaseModel, ValidationError
 
 from module.models import Bangumi
 
@@ -24,6 +26,14 @@ class Episode(BaseModel):
     source: str
 
 
+class BatchEpisode(Episode):
+    index: int
+
+
+class EpisodeBatch(BaseModel):
+    episodes: list[BatchEpisode]
+
+
 DEFAULT_PROMPT = """\
 You will now play the role of a super assistant. 
 Your task is to extract structured data from unstructured text content and output it in JSON format. 
@@ -31,6 +41,17 @@ If you are unable to extract any information, please keep all fields and leave t
 But Do not fabricate data!
 """
 
+BATCH_PROMPT = (
+    DEFAULT_PROMPT
+    + """\
+The input is a JSON list of objects with an `index` and a `title`.
+Return one entry in `episodes` for every title, carrying the same `index`.
+"""
+)
+
+_CACHE_SIZE = 2048
+_BATCH_CONCURRENCY = 4
+
 
 class OpenAIParser:
     def __init__(
@@ -39,6 +60,9 @@ class OpenAIParser:
         api_base: str = "https://api.openai.com/v1",
         model: str = "gpt-4o-mini",
         api_type: str = "openai",
+        batch_size: int = 20,
+        timeout: float = 30.0,
+        http_client: httpx.AsyncClient | None = None,
         **kwargs,
     ) -> None:
         """OpenAIParser is a class to parse text with openai
@@ -52,6 +76,15 @@ class OpenAIParser:
                 the ChatGPT model parameter, you can get more details from \
                 https://platform.openai.com/docs/api-reference/chat/create. \
                 Defaults to "gpt-4o-mini".
+            batch_size (int):
+                the number of titles sent in one request by `parse_many`. \
+                Defaults to 20.
+            timeout (float):
+                seconds to wait for one batch before giving up on it. \
+                Defaults to 30.
+            http_client (httpx.AsyncClient | None):
+                the http client used by the async client, e.g. to point it \
+                at a local server in tests. Defaults to None.
             kwargs (dict):
                 the OpenAI ChatGPT parameters, you can get more details from \
                 https://platform.openai.com/docs/api-reference/chat/create.
@@ -62,17 +95,30 @@ class OpenAIParser:
         if not api_key:
             raise ValueError("API key is required.")
         if api_type == "azure":
-            self.client = AzureOpenAI(
+            azure_kwargs = dict(
                 api_key=api_key,
                 base_url=api_base,
                 azure_deployment=kwargs.get("deployment_id", ""),
                 api_version=kwargs.get("api_version", "2023-05-15"),
             )
+            self.client = AzureOpenAI(**azure_kwargs)
+            self.async_client = AsyncAzureOpenAI(
+                **azure_kwargs, timeout=timeout, http_client=http_client
+            )
         else:
             self.client = OpenAI(api_key=api_key, base_url=api_base)
+            self.async_client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=api_base,
+                timeout=timeout,
+                http_client=http_client,
+            )
 
         self.model = model
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
         self.openai_kwargs = kwargs
+        self._cache: OrderedDict[str, dict] = OrderedDict()
 
     def parse(
         self, text: str, prompt: str | None = None, asdict: bool = True
@@ -96,11 +142,8 @@ class OpenAIParser:
 
         params = self._prepare_params(text, prompt)
 
-        with ThreadPoolExecutor(max_workers=1) as worker:
-            future = worker.submit(self.client.beta.chat.completions.parse, **params)
-            resp = future.result()
-
-            result = resp.choices[0].message.parsed
+        resp = self.client.beta.chat.completions.parse(**params)
+        result = resp.choices[0].message.parsed
 
         if asdict:
             if hasattr(result, "model_dump"):
@@ -117,6 +160,82 @@ class OpenAIParser:
 
         return result
 
+    async def parse_many(self, texts: list[str]) -> dict[str, dict]:
+        """parse many texts with openai without blocking the event loop
+
+        Texts are sent `batch_size` at a time in one structured request each,
+        and results are cached by text. A batch that times out or fails is
+        left out of the result, so the caller can fall back to another parser.
+
+        Args:
+            texts (list[str]): the texts to be parsed
+
+        Returns:
+            dict[str, dict]: the parsed result for every text that succeeded.
+        """
+        results = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                results[text] = self._cache[text]
+            else:
+                missing.append(text)
+        if not missing:
+            return results
+
+        semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+        async def run(batch: list[str]) -> dict[str, dict]:
+            async with semaphore:
+                return await self._parse_batch(batch)
+
+        batches = [
+            missing[i : i + self.batch_size]
+            for i in range(0, len(missing), self.batch_size)
+        ]
+        for parsed in await asyncio.gather(*[run(batch) for batch in batches]):
+            for text, result in parsed.items():
+                self._cache[text] = result
+                if len(self._cache) > _CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            results.update(parsed)
+        return results
+
+    async def _parse_batch(self, texts: list[str]) -> dict[str, dict]:
+        payload = json.dumps(
+            [dict(index=i, title=text) for i, text in enumerate(texts)],
+            ensure_ascii=False,
+        )
+        params = dict(
+            model=self.model,
+            messages=[
+                dict(role="system", content=BATCH_PROMPT),
+                dict(role="user", content=payload),
+            ],
+            response_format=EpisodeBatch,
+            temperature=0,
+        )
+        try:
+            resp = await asyncio.wait_for(
+                self.async_client.beta.chat.completions.parse(**params), self.timeout
+            )
+            batch = resp.choices[0].message.parsed
+        except asyncio.TimeoutError:
+            logger.warning(f"[OpenAI] Timed out parsing {len(texts)} titles.")
+            return {}
+        except (OpenAIError, httpx.HTTPError, ValidationError) as e:
+            logger.warning(f"[OpenAI] Cannot parse {len(texts)} titles: {e}")
+            return {}
+        if batch is None:
+            return {}
+        results = {}
+        for item in batch.episodes:
+            if 0 <= item.index < len(texts):
+                results[texts[item.index]] = item.model_dump(exclude={"index"})
+        logger.debug("[OpenAI] Parsed %s of %s titles", len(results), len(texts))
+        return results
+
     def _prepare_params(self, text: str, prompt: str) -> dict[str, Any]:
         """_prepare_params is a helper function to prepare params for openai library.
         There are some differences between openai and azure openai api, so we need to
@@ -1,10 +1,18 @@
 import logging
 import re
+from collections import OrderedDict
 
 from module.models import Episode
+from module.utils.metrics import cache_hit, cache_miss
 
 logger = logging.getLogger(__name__)
 
+# LRU cache of process() results keyed by raw title; feeds and search pages
+# return the same titles on every poll.
+_RAW_CACHE_MAX_SIZE = 2048
+_raw_cache: OrderedDict[str, tuple | None] = OrderedDict()
+_raw_cache_stats = {"hits": 0, "misses": 0}
+
 EPISODE_RE = re.compile(r"\d+")
 TITLE_RE = re.compile(
     r"(.*?|\[.*])((?: ?-) ?\d+ |\[\d+]|\[\d+.?[vV]\d]|第\d+[话話集]|\[第?\d+[话話集]]|\[\d+.?END]|[Ee][Pp]?\d+)(.*)"
@@ -19,6 +27,20 @@ FALLBACK_EP_PATTERNS = [
 ]
 
 PREFIX_RE = re.compile(r"[^\w\s\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff-]")
+BRACKET_SPLIT_RE = re.compile(r"[\[\]]")
+SEASON_RE = re.compile(r"S\d{1,2}|Season \d{1,2}|[第].[季期]")
+SEASON_EN_RE = re.compile(r"Season|S")
+SEASON_ZH_RE = re.compile(r"[第 ].*[季期(部分)]|部分")
+SEASON_ZH_STRIP_RE = re.compile(r"[第季期 ]")
+REGION_LIMIT_RE = re.compile(r"[(（]仅限港澳台地区[）)]")
+NAME_SPLIT_RE = re.compile(r"/|\s{2}|-\s{2}")
+NUMBER_ZH_TITLE_RE = re.compile(r"\d+\s[\u4e00-\u9fa5]")
+LEADING_ZH_RE = re.compile(r"^[\u4e00-\u9fa5]{2,}")
+JP_RE = re.compile(r"[\u0800-\u4e00]{2,}")
+ZH_RE = re.compile(r"[\u4e00-\u9fa5]{2,}")
+EN_RE = re.compile(r"[a-zA-Z]{3,}")
+TAG_SPLIT_RE = re.compile(r"[\[\]()（）]")
+SUB_SUFFIX_RE = re.compile(r"_MP4|_MKV")
 
 
 def _fallback_parse(content_title: str) -> tuple | None:
@@ -48,7 +70,7 @@ CHINESE_NUMBER_MAP = {
 
 
 def get_group(name: str) -> str:
-    parts = re.split(r"[\[\]]", name)
+    parts = BRACKET_SPLIT_RE.split(name, maxsplit=2)
     if len(parts) > 1:
         return parts[1]
     return ""
@@ -58,8 +80,34 @@ def pre_process(raw_name: str) -> str:
     return raw_name.replace("【", "[").replace("】", "]")
 
 
+def _strip_wrapped(raw: str, token: str) -> str:
+    """Remove *token* plus one character on each side, like ``re.sub(f".{token}.", "", raw)``.
+
+    Scanning with ``str.find`` avoids compiling a fresh pattern for every
+    group name and keyword.
+    """
+    n = len(raw)
+    size = len(token)
+    pieces = []
+    last = pos = 0
+    while True:
+        idx = raw.find(token, pos + 1)
+        start, end = idx - 1, idx + size + 1
+        if idx == -1 or end > n:
+            break
+        if raw[start] == "\n" or raw[end - 1] == "\n":
+            pos = start + 1
+            continue
+        pieces.append(raw[last:start])
+        last = pos = end
+    if not pieces:
+        return raw
+    pieces.append(raw[last:])
+    return "".join(pieces)
+
+
 def prefix_process(raw: str, group: str) -> str:
-    raw = re.sub(f".{re.escape(group)}.", "", raw)
+    raw = _strip_wrapped(raw, group)
     raw_process = PREFIX_RE.sub("/", raw)
     arg_group = raw_process.split("/")
     while "" in arg_group:
@@ -67,10 +115,10 @@ def prefix_process(raw: str, group: str) -> str:
     if len(arg_group) == 1:
         arg_group = arg_group[0].split(" ")
     for arg in arg_group:
-        if re.search(r"新番|月?番", arg) and len(arg) <= 5:
-            raw = re.sub(f".{re.escape(arg)}.", "", raw)
-        elif re.search(r"港澳台地区", arg):
-            raw = re.sub(f".{re.escape(arg)}.", "", raw)
+        if "番" in arg and len(arg) <= 5:
+            raw = _strip_wrapped(raw, arg)
+        elif "港澳台地区" in arg:
+            raw = _strip_wrapped(raw, arg)
     return raw
 
 
@@ -80,19 +128,18 @@ def season_process(season_info: str):
     #     name_season = re.sub(".*新番.", "", season_info)
     #     # 去除「新番」信息
     # name_season = re.sub(r"^[^]】]*[]】]", "", name_season).strip()
-    season_rule = r"S\d{1,2}|Season \d{1,2}|[第].[季期]"
-    name_season = re.sub(r"[\[\]]", " ", name_season)
-    seasons = re.findall(season_rule, name_season)
+    name_season = name_season.replace("[", " ").replace("]", " ")
+    seasons = SEASON_RE.findall(name_season)
     if not seasons:
         return name_season, "", 1
-    name = re.sub(season_rule, "", name_season)
+    name = SEASON_RE.sub("", name_season)
     for season in seasons:
         season_raw = season
-        if re.search(r"Season|S", season) is not None:
-            season = int(re.sub(r"Season|S", "", season))
+        if "S" in season:
+            season = int(SEASON_EN_RE.sub("", season))
             break
-        elif re.search(r"[第 ].*[季期(部分)]|部分", season) is not None:
-            season_pro = re.sub(r"[第季期 ]", "", season)
+        elif SEASON_ZH_RE.search(season) is not None:
+            season_pro = SEASON_ZH_STRIP_RE.sub("", season)
             try:
                 season = int(season_pro)
             except ValueError:
@@ -104,39 +151,39 @@ def season_process(season_info: str):
 def name_process(name: str):
     name_en, name_zh, name_jp = None, None, None
     name = name.strip()
-    name = re.sub(r"[(（]仅限港澳台地区[）)]", "", name)
-    split = re.split(r"/|\s{2}|-\s{2}", name)
+    name = REGION_LIMIT_RE.sub("", name)
+    split = NAME_SPLIT_RE.split(name)
     while "" in split:
         split.remove("")
     if len(split) == 1:
-        if re.search("_{1}", name) is not None:
-            split = re.split("_", name)
-        elif re.search(" - {1}", name) is not None:
-            split = re.split("-", name)
+        if "_" in name:
+            split = name.split("_")
+        elif " - " in name:
+            split = name.split("-")
     if len(split) == 1:
         # Titles like "29 岁单身..." — digits + Chinese are one title
-        if re.match(r"\d+\s[\u4e00-\u9fa5]", split[0]):
+        if NUMBER_ZH_TITLE_RE.match(split[0]):
             name_zh = split[0].strip()
             return name_en, name_zh, name_jp
         split_space = split[0].split(" ")
         for idx in [0, -1]:
-            if re.search(r"^[\u4e00-\u9fa5]{2,}", split_space[idx]) is not None:
+            if LEADING_ZH_RE.search(split_space[idx]) is not None:
                 chs = split_space[idx]
                 split_space.remove(chs)
                 split = [chs, " ".join(split_space)]
                 break
     for item in split:
-        if re.search(r"[\u0800-\u4e00]{2,}", item) and not name_jp:
+        if JP_RE.search(item) and not name_jp:
             name_jp = item.strip()
-        elif re.search(r"[\u4e00-\u9fa5]{2,}", item) and not name_zh:
+        elif ZH_RE.search(item) and not name_zh:
             name_zh = item.strip()
-        elif re.search(r"[a-zA-Z]{3,}", item) and not name_en:
+        elif EN_RE.search(item) and not name_en:
             name_en = item.strip()
     return name_en, name_zh, name_jp
 
 
 def find_tags(other):
-    elements = re.sub(r"[\[\]()（）]", " ", other).split(" ")
+    elements = TAG_SPLIT_RE.sub(" ", other).split(" ")
     # find CHT
     sub, resolution, source = None, None, None
     for element in filter(lambda x: x != "", elements):
@@ -152,7 +199,7 @@ def find_tags(other):
 def clean_sub(sub: str | None) -> str | None:
     if sub is None:
         return sub
-    return re.sub(r"_MP4|_MKV", "", sub)
+    return SUB_SUFFIX_RE.sub("", sub)
 
 
 def process(raw_title: str):
@@ -199,8 +246,69 @@ def process(raw_title: str):
     )
 
 
-def raw_parser(raw: str) -> Episode | None:
-    ret = process(raw)
+def _cached_process(raw: str) -> tuple | None:
+    if raw in _raw_cache:
+        _raw_cache.move_to_end(raw)
+        _raw_cache_stats["hits"] += 1
+        cache_hit("raw_parser")
+        return _raw_cache[raw]
+    _raw_cache_stats["misses"] += 1
+    cache_miss("raw_parser")
+    result = process(raw)
+    _raw_cache[raw] = result
+    if len(_raw_cache) > _RAW_CACHE_MAX_SIZE:
+        _raw_cache.popitem(last=False)
+    return result
+
+
+def raw_parser_cache_info() -> dict:
+    return {
+        **_raw_cache_stats,
+        "size": len(_raw_cache),
+        "max_size": _RAW_CACHE_MAX_SIZE,
+    }
+
+
+def clear_raw_parser_cache():
+    _raw_cache.clear()
+    _raw_cache_stats["hits"] = 0
+    _raw_cache_stats["misses"] = 0
+
+
+def split_cached(titles: list[str]) -> tuple[dict[str, tuple | None], list[str]]:
+    """Return cached process() results for *titles* and the titles still to parse."""
+    cached, missing = {}, []
+    for title in titles:
+        if title in _raw_cache:
+            _raw_cache.move_to_end(title)
+            _raw_cache_stats["hits"] += 1
+            cache_hit("raw_parser")
+            cached[title] = _raw_cache[title]
+        else:
+            _raw_cache_stats["misses"] += 1
+            cache_miss("raw_parser")
+            missing.append(title)
+    return cached, missing
+
+
+def cache_results(results: dict[str, tuple | None]):
+    _raw_cache.update(results)
+    while len(_raw_cache) > _RAW_CACHE_MAX_SIZE:
+        _raw_cache.popitem(last=False)
+
+
+def process_many(titles: list[str]) -> list[tuple | None]:
+    """Run process() over *titles*; used to parse large batches in a thread."""
+    results = []
+    for title in titles:
+        try:
+            results.append(process(title))
+        except (ValueError, AttributeError, TypeError, KeyError):
+            results.append(None)
+    return results
+
+
+def to_episode(raw: str, ret: tuple | None) -> Episode | None:
     if ret is None:
         logger.info(f"Detected non-episodic resource: {raw}, skipping.")
         return None
@@ -210,6 +318,10 @@ def raw_parser(raw: str) -> Episode | None:
     )
 
 
+def raw_parser(raw: str) -> Episode | None:
+    return to_episode(raw, _cached_process(raw))
+
+
 if __name__ == "__main__":
     title = "[动漫国字幕组&LoliHouse] THE MARGINAL SERVICE - 08 [WebRip 1080p HEVC-10bit AAC][简繁内封字幕]"
     print(raw_parser(title))
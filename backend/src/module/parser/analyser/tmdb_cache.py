@@ -0,0 +1,92 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from module.conf import TMDB_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Search results rarely change; season air dates move while a show airs.
+TTL = {"search": 7 * DAY, "tv": DAY, "season": 12 * HOUR}
+NEGATIVE_TTL = DAY
+# Expired entries are still served (and refreshed in the background) for this long
+STALE_GRACE = 30 * DAY
+
+
+class TMDBCache:
+    """SQLite-backed cache of TMDB JSON responses keyed by request URL.
+
+    ``get`` returns ``(data, fresh)``; entries past their TTL but inside
+    ``STALE_GRACE`` come back with ``fresh=False`` so callers can serve them
+    while revalidating. ``set`` commits to disk and is meant to be called
+    from a worker thread; a lock serialises it with reads on the event loop.
+    """
+
+    def __init__(self, path: Path | str = TMDB_CACHE_PATH):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tmdb_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "DELETE FROM tmdb_cache WHERE expires_at < ?",
+                (time.time() - STALE_GRACE,),
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> tuple[dict, bool] | None:
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute(
+                        "SELECT value, expires_at FROM tmdb_cache WHERE key = ?", (key,)
+                    )
+                    .fetchone()
+                )
+        except sqlite3.Error as e:
+            logger.debug("[TMDB] Cache read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if now > expires_at + STALE_GRACE:
+            return None
+        return json.loads(value), now <= expires_at
+
+    def set(self, key: str, value: dict, ttl: float):
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO tmdb_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), time.time() + ttl),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.debug("[TMDB] Cache write failed: %s", e)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+tmdb_cache = TMDBCache()
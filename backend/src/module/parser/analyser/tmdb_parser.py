@@ -6,13 +6,23 @@ from collections import OrderedDict
 from dataclasses import dataclass
 
 from module.conf import TMDB_API
-from module.network import RequestContent
+from module.network import RateLimiter, RequestContent
 from module.utils import save_image
+from module.utils.metrics import cache_hit, cache_miss
+
+from .tmdb_cache import NEGATIVE_TTL, TTL, tmdb_cache
 
 logger = logging.getLogger(__name__)
 
 TMDB_URL = "https://api.themoviedb.org"
 
+# Concurrent candidate detail lookups per search
+_CANDIDATE_CONCURRENCY = 5
+
+# Stay well under TMDB's per-IP request limit; cache hits are not counted
+TMDB_RATE_LIMIT = 20
+_rate_limiter = RateLimiter(TMDB_RATE_LIMIT, burst=TMDB_RATE_LIMIT)
+
 # In-memory cache for TMDB lookups to avoid repeated API calls
 _TMDB_CACHE_MAX = 512
 _tmdb_cache: OrderedDict[str, "TMDBInfo | None"] = OrderedDict()
@@ -59,16 +69,115 @@ def season_url(tv_id, season_number, key):
     return f"{TMDB_URL}/3/tv/{tv_id}/season/{season_number}?api_key={TMDB_API}&language={LANGUAGE[key]}"
 
 
-async def is_animation(tv_id, language, req: RequestContent) -> bool:
-    url_info = info_url(tv_id, language)
-    type_id = await req.get_json(url_info)
-    if type_id:
-        for type in type_id.get("genres", []):
-            if type.get("id") == 16:
+_API_KEY_RE = re.compile(r"api_key=[^&]*&?")
+_revalidating: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _cache_key(url: str) -> str:
+    return _API_KEY_RE.sub("", url.removeprefix(TMDB_URL))
+
+
+def _cache_ttl(url: str, data: dict) -> float:
+    if data.get("results") == []:
+        return NEGATIVE_TTL
+    if "/search/" in url:
+        return TTL["search"]
+    if "/season/" in url:
+        return TTL["season"]
+    return TTL["tv"]
+
+
+async def _fetch_json(url: str, req: RequestContent) -> dict | None:
+    await _rate_limiter.acquire()
+    data = await req.get_json(url)
+    # None means a network or HTTP failure, which is not worth remembering
+    if data is not None:
+        # The sqlite commit would otherwise block the loop on every lookup
+        await asyncio.to_thread(
+            tmdb_cache.set, _cache_key(url), data, _cache_ttl(url, data)
+        )
+    return data
+
+
+def _revalidate(url: str):
+    key = _cache_key(url)
+    if key in _revalidating:
+        return
+    _revalidating.add(key)
+
+    async def refresh():
+        try:
+            async with RequestContent() as req:
+                await _fetch_json(url, req)
+        finally:
+            _revalidating.discard(key)
+
+    task = asyncio.get_running_loop().create_task(refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def get_json(url: str, req: RequestContent) -> dict | None:
+    """Fetch a TMDB endpoint through the persistent response cache.
+
+    Stale entries are returned immediately and refreshed in the background.
+    """
+    cached = tmdb_cache.get(_cache_key(url))
+    if cached is not None:
+        cache_hit("tmdb")
+        data, fresh = cached
+        if not fresh:
+            _revalidate(url)
+        return data
+    cache_miss("tmdb")
+    return await _fetch_json(url, req)
+
+
+def _is_animation_info(info: dict | None) -> bool:
+    if info:
+        for genre in info.get("genres", []):
+            if genre.get("id") == 16:
                 return True
     return False
 
 
+async def is_animation(tv_id, language, req: RequestContent) -> bool:
+    url_info = info_url(tv_id, language)
+    return _is_animation_info(await get_json(url_info, req))
+
+
+async def find_animation(
+    candidates: list[dict], language: str, req: RequestContent
+) -> tuple[int, dict] | tuple[None, None]:
+    """Return the id and detail payload of the first animated search result.
+
+    Candidate details are fetched concurrently (at most
+    ``_CANDIDATE_CONCURRENCY`` at a time) but checked in ranking order; the
+    remaining fetches are cancelled as soon as the answer is known.
+    """
+    semaphore = asyncio.Semaphore(_CANDIDATE_CONCURRENCY)
+
+    async def fetch(tv_id):
+        async with semaphore:
+            return await get_json(info_url(tv_id, language), req)
+
+    tasks = [asyncio.create_task(fetch(c["id"])) for c in candidates]
+    try:
+        for candidate, task in zip(candidates, tasks):
+            try:
+                info = await task
+            except Exception as e:
+                logger.debug("[TMDB] Failed to get details for %s: %s", candidate["id"], e)
+                continue
+            if _is_animation_info(info):
+                return candidate["id"], info
+        return None, None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 async def get_season_episode_air_dates(
     tv_id: int, season_number: int, language: str, req: RequestContent
 ) -> list[dict]:
@@ -80,7 +189,7 @@ async def get_season_episode_air_dates(
     import datetime
 
     url = season_url(tv_id, season_number, language)
-    season_data = await req.get_json(url)
+    season_data = await get_json(url, req)
     if not season_data:
         return []
 
@@ -154,7 +263,7 @@ async def get_aired_episode_count(
     import datetime
 
     url = season_url(tv_id, season_number, language)
-    season_data = await req.get_json(url)
+    season_data = await get_json(url, req)
     if not season_data:
         return 0
 
@@ -206,29 +315,22 @@ async def tmdb_parser(title, language, test: bool = False) -> TMDBInfo | None:
 
     async with RequestContent() as req:
         url = search_url(title)
-        contents = await req.get_json(url)
+        contents = await get_json(url, req)
         if not contents:
             return None
         contents = contents.get("results")
         if contents.__len__() == 0:
             url = search_url(title.replace(" ", ""))
-            contents_resp = await req.get_json(url)
+            contents_resp = await get_json(url, req)
             if not contents_resp:
                 return None
             contents = contents_resp.get("results")
         # 判断动画
         if contents:
-            matched_id = None
-            for content in contents:
-                cid = content["id"]
-                if await is_animation(cid, language, req):
-                    matched_id = cid
-                    break
+            matched_id, info_content = await find_animation(contents, language, req)
             if matched_id is None:
                 _tmdb_cache[cache_key] = None
                 return None
-            url_info = info_url(matched_id, language)
-            info_content = await req.get_json(url_info)
             season = [
                 {
                     "season": s.get("name"),
@@ -289,7 +391,7 @@ async def tmdb_parser(title, language, test: bool = False) -> TMDBInfo | None:
                     img = await req.get_content(
                         f"https://image.tmdb.org/t/p/w780{poster_path}"
                     )
-                    poster_link = save_image(img, "jpg")
+                    poster_link = await asyncio.to_thread(save_image, img, "jpg")
                 else:
                     poster_link = "https://image.tmdb.org/t/p/w780" + poster_path
             else:
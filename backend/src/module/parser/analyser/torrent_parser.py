@@ -1,16 +1,13 @@
 import logging
+import os
 import re
 from collections import OrderedDict
-from pathlib import Path
 
 from module.models import EpisodeFile, SubtitleFile
+from module.utils.metrics import cache_hit, cache_miss
 
 logger = logging.getLogger(__name__)
 
-# LRU cache for torrent_parser results to avoid repeated regex parsing
-_PARSER_CACHE_MAX_SIZE = 512
-_parser_cache: OrderedDict[tuple, EpisodeFile | SubtitleFile | None] = OrderedDict()
-
 PLATFORM = "Unix"
 
 RULES = [
@@ -23,12 +20,64 @@ RULES = [
 
 COMPILED_RULES = [re.compile(rule, re.I) for rule in RULES]
 
+# All rules joined into one alternation. ``match`` tries the alternatives in
+# order, so the first rule that matches wins just as with COMPILED_RULES.
+# Every rule has three groups (title, episode, rest); the matched rule's last
+# group is the match's ``lastindex``.
+_RULE_GROUPS = 3
+assert all(rule.groups == _RULE_GROUPS for rule in COMPILED_RULES)
+COMBINED_RULE = re.compile("|".join(f"(?:{rule})" for rule in RULES), re.I)
+
 SUBTITLE_LANG = {
     "zh-tw": ["tc", "cht", "繁", "zh-tw"],
     "zh": ["sc", "chs", "简", "zh"],
 }
 
 
+class ParsedFile:
+    """Lightweight torrent_parser result.
+
+    Has the attributes of ``EpisodeFile`` (and ``SubtitleFile`` when
+    ``language`` is set) without model validation; ``to_model`` converts it
+    where the pydantic model is needed.
+    """
+
+    __slots__ = ("media_path", "group", "title", "season", "episode", "suffix", "language")
+
+    def __init__(
+        self,
+        media_path: str,
+        group: str | None,
+        title: str,
+        season: int,
+        episode: int | float,
+        suffix: str,
+        language: str | None = None,
+    ):
+        self.media_path = media_path
+        self.group = group
+        self.title = title
+        self.season = season
+        self.episode = episode
+        self.suffix = suffix
+        self.language = language
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"ParsedFile({fields})"
+
+    def to_model(self) -> EpisodeFile | SubtitleFile:
+        fields = {k: getattr(self, k) for k in self.__slots__ if k != "language"}
+        if self.language is None:
+            return EpisodeFile(**fields)
+        return SubtitleFile(**fields, language=self.language)
+
+
+# LRU cache for torrent_parser results to avoid repeated regex parsing
+_PARSER_CACHE_MAX_SIZE = 512
+_parser_cache: OrderedDict[tuple, ParsedFile | None] = OrderedDict()
+
+
 def get_path_basename(torrent_path: str) -> str:
     """
     Returns the basename of a path string.
@@ -38,16 +87,28 @@ def get_path_basename(torrent_path: str) -> str:
     :return: A string representing the basename of the given path.
     :rtype: str
     """
-    return Path(torrent_path).name
+    # Same result as Path(torrent_path).name without building a Path
+    if os.altsep:
+        torrent_path = torrent_path.replace(os.sep, os.altsep)
+    return torrent_path.rstrip("/").rpartition("/")[2]
+
+
+def get_suffix(name: str) -> str:
+    """Path(name).suffix for a basename."""
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
 
 
 _GROUP_SPLIT_RE = re.compile(r"[\[\]()【】（）]")
+_DIGITS_RE = re.compile(r"\d+")
+_SEASON_STRIP_RE = re.compile(r"([Ss]|Season )\d{1,3}")
+_SEASON_RE = re.compile(r"([Ss]|Season )(\d{1,3})", re.I)
 
 
 def get_group(group_and_title) -> tuple[str | None, str]:
     n = [x for x in _GROUP_SPLIT_RE.split(group_and_title) if x]
     if len(n) > 1:
-        if re.match(r"\d+", n[1]):
+        if _DIGITS_RE.match(n[1]):
             return None, group_and_title
         return n[0], n[1]
     else:
@@ -55,9 +116,9 @@ def get_group(group_and_title) -> tuple[str | None, str]:
 
 
 def get_season_and_title(season_and_title) -> tuple[str, int]:
-    title = re.sub(r"([Ss]|Season )\d{1,3}", "", season_and_title).strip()
+    title = _SEASON_STRIP_RE.sub("", season_and_title).strip()
     try:
-        season = re.search(r"([Ss]|Season )(\d{1,3})", season_and_title, re.I).group(2)
+        season = _SEASON_RE.search(season_and_title).group(2)
     except AttributeError:
         season = 1
     return title, int(season)
@@ -70,18 +131,25 @@ def get_subtitle_lang(subtitle_name: str) -> str:
                 return key
 
 
+def _to_number(episode: str) -> int | float:
+    value = float(episode)
+    return int(value) if value.is_integer() else value
+
+
 def torrent_parser(
     torrent_path: str,
     torrent_name: str | None = None,
     season: int | None = None,
     file_type: str = "media",
-) -> EpisodeFile | SubtitleFile | None:
+) -> ParsedFile | None:
     # Check cache first to avoid repeated regex parsing
     cache_key = (torrent_path, torrent_name, season, file_type)
     if cache_key in _parser_cache:
         # Move to end to mark as recently used
         _parser_cache.move_to_end(cache_key)
+        cache_hit("torrent_parser")
         return _parser_cache[cache_key]
+    cache_miss("torrent_parser")
 
     result = _torrent_parser_impl(torrent_path, torrent_name, season, file_type)
 
@@ -98,43 +166,33 @@ def _torrent_parser_impl(
     torrent_name: str | None = None,
     season: int | None = None,
     file_type: str = "media",
-) -> EpisodeFile | SubtitleFile | None:
+) -> ParsedFile | None:
     """Internal implementation of torrent_parser without caching."""
     media_path = get_path_basename(torrent_path)
     match_names = [torrent_name, media_path]
     if torrent_name is None:
         match_names = match_names[1:]
     for match_name in match_names:
-        for compiled_rule in COMPILED_RULES:
-            match_obj = compiled_rule.match(match_name)
-            if match_obj:
-                group, title = get_group(match_obj.group(1))
-                if not season:
-                    title, season = get_season_and_title(title)
-                else:
-                    title, _ = get_season_and_title(title)
-                episode = match_obj.group(2)
-                suffix = Path(torrent_path).suffix
-                if file_type == "media":
-                    return EpisodeFile(
-                        media_path=torrent_path,
-                        group=group,
-                        title=title,
-                        season=season,
-                        episode=episode,
-                        suffix=suffix,
-                    )
-                elif file_type == "subtitle":
-                    language = get_subtitle_lang(media_path)
-                    return SubtitleFile(
-                        media_path=torrent_path,
-                        group=group,
-                        title=title,
-                        season=season,
-                        language=language,
-                        episode=episode,
-                        suffix=suffix,
-                    )
+        match_obj = COMBINED_RULE.match(match_name)
+        if not match_obj:
+            continue
+        first = match_obj.lastindex - _RULE_GROUPS + 1
+        group, title = get_group(match_obj.group(first))
+        if not season:
+            title, season = get_season_and_title(title)
+        else:
+            title, _ = get_season_and_title(title)
+        episode = _to_number(match_obj.group(first + 1))
+        suffix = get_suffix(media_path)
+        if file_type == "media":
+            return ParsedFile(torrent_path, group, title, season, episode, suffix)
+        elif file_type == "subtitle":
+            language = get_subtitle_lang(media_path)
+            if language is None:
+                raise ValueError(f"No subtitle language in {media_path}")
+            return ParsedFile(
+                torrent_path, group, title, season, episode, suffix, language
+            )
     return None
 
 
@@ -1,5 +1,9 @@
+import asyncio
 import logging
 
+import httpx
+from openai import OpenAIError
+
 from module.conf import settings
 from module.models import Bangumi
 from module.models.bangumi import Episode
@@ -10,9 +14,55 @@ from module.parser.analyser import (
     tmdb_parser,
     torrent_parser,
 )
+from module.parser.analyser.raw_parser import (
+    cache_results,
+    process_many,
+    split_cached,
+    to_episode,
+)
+from module.utils.metrics import histogram
 
 logger = logging.getLogger(__name__)
 
+PARSE_THREAD_THRESHOLD = 500
+
+PARSE_BATCH = histogram(
+    "autobangumi_parse_seconds", "Time to parse one batch of release titles."
+)
+
+_openai_parser: OpenAIParser | None = None
+_openai_config_key: str | None = None
+
+
+def get_openai_parser() -> OpenAIParser:
+    """Return the shared OpenAI parser, rebuilt when its settings change."""
+    global _openai_parser, _openai_config_key
+    kwargs = settings.experimental_openai.dict(exclude={"enable"})
+    key = repr(sorted(kwargs.items()))
+    if _openai_parser is None or _openai_config_key != key:
+        _openai_parser = OpenAIParser(**kwargs)
+        _openai_config_key = key
+    return _openai_parser
+
+
+def _llm_episode(raw: str, episode_dict: dict) -> Episode | None:
+    """Build an Episode from an OpenAI result, or None if it is unusable.
+
+    The OpenAI schema returns ``season`` and ``episode`` as strings; an
+    empty season means the first one, as in the regex parser.
+    """
+    try:
+        return Episode(
+            **{
+                **episode_dict,
+                "season": int(episode_dict["season"] or 1),
+                "episode": int(episode_dict["episode"]),
+            }
+        )
+    except (KeyError, ValueError, TypeError) as e:
+        logger.debug("[Parser] Invalid OpenAI result for %s: %s", raw, e)
+        return None
+
 
 class TitleParser:
     def __init__(self):
@@ -58,57 +108,117 @@ class TitleParser:
 
     @staticmethod
     def raw_parser(raw: str) -> Bangumi | None:
-        language = settings.rss_parser.language
         try:
+            episode = None
             # use OpenAI ChatGPT to parse raw title and get structured data
             if settings.experimental_openai.enable:
-                kwargs = settings.experimental_openai.dict(exclude={"enable"})
-                gpt = OpenAIParser(**kwargs)
-                episode_dict = gpt.parse(raw, asdict=True)
-                episode = Episode(**episode_dict)
-            else:
+                episode_dict = get_openai_parser().parse(raw, asdict=True)
+                episode = _llm_episode(raw, episode_dict)
+            if episode is None:
                 episode = raw_parser(raw)
                 if episode is None:
                     return None
-
-            titles = {
-                "zh": episode.title_zh,
-                "en": episode.title_en,
-                "jp": episode.title_jp,
-            }
-            title_raw = episode.title_en or episode.title_zh or episode.title_jp
-            if titles[language]:
-                official_title = titles[language]
-            elif titles["zh"]:
-                official_title = titles["zh"]
-            elif titles["en"]:
-                official_title = titles["en"]
-            elif titles["jp"]:
-                official_title = titles["jp"]
-            else:
-                official_title = title_raw
-            if not title_raw:
-                logger.warning("Cannot extract title_raw from '%s', skipping", raw)
-                return None
-            _season = episode.season
-            logger.debug("RAW:%s >> %s", raw, title_raw)
-            return Bangumi(
-                official_title=official_title,
-                title_raw=title_raw,
-                season=_season,
-                season_raw=episode.season_raw,
-                group_name=episode.group,
-                dpi=episode.resolution,
-                source=episode.source,
-                subtitle=episode.sub,
-                eps_collect=False if episode.episode > 1 else True,
-                offset=0,
-                filter=",".join(settings.rss_parser.filter),
-            )
+            return TitleParser._episode_to_bangumi(raw, episode)
         except (ValueError, AttributeError, TypeError) as e:
             logger.warning(f"Cannot parse '{raw}': {type(e).__name__}: {e}")
             return None
 
+    @staticmethod
+    def _episode_to_bangumi(raw: str, episode: Episode) -> Bangumi | None:
+        language = settings.rss_parser.language
+        titles = {
+            "zh": episode.title_zh,
+            "en": episode.title_en,
+            "jp": episode.title_jp,
+        }
+        title_raw = episode.title_en or episode.title_zh or episode.title_jp
+        if titles[language]:
+            official_title = titles[language]
+        elif titles["zh"]:
+            official_title = titles["zh"]
+        elif titles["en"]:
+            official_title = titles["en"]
+        elif titles["jp"]:
+            official_title = titles["jp"]
+        else:
+            official_title = title_raw
+        if not title_raw:
+            logger.warning("Cannot extract title_raw from '%s', skipping", raw)
+            return None
+        _season = episode.season
+        logger.debug("RAW:%s >> %s", raw, title_raw)
+        return Bangumi(
+            official_title=official_title,
+            title_raw=title_raw,
+            season=_season,
+            season_raw=episode.season_raw,
+            group_name=episode.group,
+            dpi=episode.resolution,
+            source=episode.source,
+            subtitle=episode.sub,
+            eps_collect=False if episode.episode > 1 else True,
+            offset=0,
+            filter=",".join(settings.rss_parser.filter),
+        )
+
+    @staticmethod
+    async def parse_many(titles: list[str]) -> list[Bangumi | None]:
+        """Parse raw titles in bulk, returning one result per title in order.
+
+        Titles already in the raw_parser cache are served from it. When at
+        least ``PARSE_THREAD_THRESHOLD`` titles are left they are parsed in a
+        worker thread, so the event loop stays responsive during large imports
+        and season searches; smaller batches are parsed inline.
+
+        With ``experimental_openai`` enabled the titles are parsed by the LLM
+        in batched requests first; titles it fails on or times out for fall
+        back to the regex parser.
+        """
+        with PARSE_BATCH.time():
+            return await TitleParser._parse_many(titles)
+
+    @staticmethod
+    async def _parse_many(titles: list[str]) -> list[Bangumi | None]:
+        unique = list(dict.fromkeys(titles))
+        llm_episodes: dict[str, Episode] = {}
+        if settings.experimental_openai.enable:
+            llm_episodes = await TitleParser._openai_parse(unique)
+            unique = [title for title in unique if title not in llm_episodes]
+        results, missing = split_cached(unique)
+        if len(missing) < PARSE_THREAD_THRESHOLD:
+            parsed = dict(zip(missing, process_many(missing)))
+        else:
+            logger.debug("[Parser] Parsing %s titles in a thread", len(missing))
+            parsed = dict(zip(missing, await asyncio.to_thread(process_many, missing)))
+        cache_results(parsed)
+        results.update(parsed)
+        bangumis = []
+        for title in titles:
+            try:
+                episode = llm_episodes.get(title) or to_episode(title, results[title])
+                bangumis.append(
+                    TitleParser._episode_to_bangumi(title, episode) if episode else None
+                )
+            except (ValueError, AttributeError, TypeError) as e:
+                logger.warning(f"Cannot parse '{title}': {type(e).__name__}: {e}")
+                bangumis.append(None)
+        return bangumis
+
+    @staticmethod
+    async def _openai_parse(titles: list[str]) -> dict[str, Episode]:
+        try:
+            parsed = await get_openai_parser().parse_many(titles)
+        except (ValueError, OpenAIError, httpx.HTTPError) as e:
+            # Every title falls back to the regex parser
+            logger.warning(f"[Parser] OpenAI parser unavailable: {e}")
+            return {}
+        episodes = {}
+        for title, episode_dict in parsed.items():
+            # Titles left out fall back to the regex parser
+            if episode := _llm_episode(title, episode_dict):
+                episodes[title] = episode
+        return episodes
+
     @staticmethod
     async def mikan_parser(homepage: str) -> tuple[str, str]:
         return await mikan_parser(homepage)
@@ -5,6 +5,7 @@ from module.conf import settings
 from module.models import Bangumi, ResponseModel, RSSItem, Torrent
 from module.network import RequestContent
 from module.parser import TitleParser
+from module.utils.events import publish
 
 from .engine import RSSEngine
 
@@ -48,8 +49,8 @@ class RSSAnalyser(TitleParser):
     ) -> list:
         new_data = []
         seen_titles: set[str] = set()
-        for torrent in torrents:
-            bangumi = self.raw_parser(raw=torrent.name)
+        bangumis = await self.parse_many([torrent.name for torrent in torrents])
+        for torrent, bangumi in zip(torrents, bangumis):
             if bangumi and bangumi.title_raw not in seen_titles:
                 await self.official_title_parser(bangumi=bangumi, rss=rss, torrent=torrent)
                 if not full_parse:
@@ -60,7 +61,7 @@ class RSSAnalyser(TitleParser):
         return new_data
 
     async def torrent_to_data(self, torrent: Torrent, rss: RSSItem) -> Bangumi:
-        bangumi = self.raw_parser(raw=torrent.name)
+        bangumi = (await self.parse_many([torrent.name]))[0]
         if bangumi:
             await self.official_title_parser(bangumi=bangumi, rss=rss, torrent=torrent)
             bangumi.rss_link = rss.url
@@ -79,6 +80,10 @@ class RSSAnalyser(TitleParser):
         if new_data:
             # Add to database
             engine.bangumi.add_all(new_data)
+            publish(
+                "bangumi_added",
+                [{"id": b.id, "official_title": b.official_title} for b in new_data],
+            )
             return new_data
         else:
             return []
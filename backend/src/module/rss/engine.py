@@ -7,10 +7,20 @@ from typing import Optional
 from module.database import Database, engine
 from module.downloader import DownloadClient
 from module.models import Bangumi, ResponseModel, RSSItem, Torrent
-from module.network import RequestContent
+from module.network import RequestContent, breaker_state
+from module.utils.events import publish
+from module.utils.metrics import histogram
+from module.utils.profiler import loop_profiler
 
 logger = logging.getLogger(__name__)
 
+RSS_FETCH = histogram(
+    "autobangumi_rss_fetch_seconds", "RSS feed fetch latency.", ("feed",)
+)
+TORRENT_MATCH = histogram(
+    "autobangumi_torrent_match_seconds", "Time to match a torrent to a bangumi rule."
+)
+
 
 class RSSEngine(Database):
     def __init__(self, _engine=engine):
@@ -21,7 +31,8 @@ class RSSEngine(Database):
     @staticmethod
     async def _get_torrents(rss: RSSItem) -> list[Torrent]:
         async with RequestContent() as req:
-            torrents = await req.get_torrents(rss.url)
+            with RSS_FETCH.time(rss.name):
+                torrents = await req.get_torrents(rss.url)
             # Add RSS ID
             for torrent in torrents:
                 torrent.rss_id = rss.id
@@ -132,7 +143,8 @@ class RSSEngine(Database):
         return self._filter_cache[filter_str]
 
     def match_torrent(self, torrent: Torrent) -> Optional[Bangumi]:
-        matched: Bangumi = self.bangumi.match_torrent(torrent.name)
+        with TORRENT_MATCH.time():
+            matched: Bangumi = self.bangumi.match_torrent(torrent.name)
         if matched:
             if matched.filter == "":
                 return matched
@@ -151,26 +163,60 @@ class RSSEngine(Database):
             rss_items = [rss_item] if rss_item else []
         # From RSS Items, fetch all torrents concurrently
         logger.debug("[Engine] Get %s RSS items", len(rss_items))
-        results = await asyncio.gather(
-            *[self._pull_rss_with_status(rss_item) for rss_item in rss_items]
-        )
+        with loop_profiler.phase("rss", "fetch"):
+            results = await asyncio.gather(
+                *[self._pull_rss_with_status(rss_item) for rss_item in rss_items]
+            )
         now = datetime.now(timezone.utc).isoformat()
         # Process results sequentially (DB operations)
+        with loop_profiler.phase("rss", "process"):
+            await self._process_results(client, rss_items, results, now)
+        with loop_profiler.phase("rss", "commit"):
+            self.commit()
+
+    async def _process_results(
+        self,
+        client: DownloadClient,
+        rss_items: list[RSSItem],
+        results: list[tuple[list[Torrent], Optional[str]]],
+        now: str,
+    ):
+        added = []
         for rss_item, (new_torrents, error) in zip(rss_items, results):
+            previous_status = rss_item.connection_status
             # Update connection status
-            rss_item.connection_status = "error" if error else "healthy"
+            if error:
+                rss_item.connection_status = "error"
+            elif breaker_state(rss_item.url) != "closed":
+                # Fetch was skipped or failed while the host's circuit is open
+                rss_item.connection_status = "circuit_open"
+                error = "Host unreachable, requests paused until it recovers"
+            else:
+                rss_item.connection_status = "healthy"
             rss_item.last_checked_at = now
             rss_item.last_error = error
             self.add(rss_item)
+            if rss_item.connection_status != previous_status:
+                publish(
+                    "rss_status",
+                    {
+                        "id": rss_item.id,
+                        "name": rss_item.name,
+                        "status": rss_item.connection_status,
+                        "error": error,
+                    },
+                )
             for torrent in new_torrents:
                 matched_data = self.match_torrent(torrent)
                 if matched_data:
                     if await client.add_torrent(torrent, matched_data):
                         logger.debug("[Engine] Add torrent %s to client", torrent.name)
+                        added.append({"name": torrent.name, "bangumi_id": matched_data.id})
                     torrent.downloaded = True
             # Add all torrents to database
             self.torrent.add_all(new_torrents)
-        self.commit()
+        if added:
+            publish("torrent_added", added)
 
     async def download_bangumi(self, bangumi: Bangumi):
         async with RequestContent() as req:
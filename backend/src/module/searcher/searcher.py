@@ -53,11 +53,14 @@ class SearchTorrent(RequestContent, RSSAnalyser):
         torrents = await self.search_torrents(rss_item)
         # yield for EventSourceResponse (Server Send)
         exist_list = []
-        for torrent in torrents:
+        bangumis = await self.parse_many([torrent.name for torrent in torrents])
+        for torrent, bangumi in zip(torrents, bangumis):
             if len(exist_list) >= limit:
                 break
-            bangumi = await self.torrent_to_data(torrent=torrent, rss=rss_item)
             if bangumi:
+                await self.official_title_parser(
+                    bangumi=bangumi, rss=rss_item, torrent=torrent
+                )
                 special_link = self.special_url(bangumi, site).url
                 if special_link not in exist_list:
                     bangumi.rss_link = special_link
@@ -3,9 +3,8 @@ import re
 
 from urllib3.util import parse_url
 
-from module.network import RequestContent
+from module.manager.poster import CACHE, poster_jobs
 from module.rss import RSSEngine
-from module.utils import save_image
 
 logger = logging.getLogger(__name__)
 
@@ -49,15 +48,6 @@ def run_migrations():
         db.run_migrations()
 
 
-async def cache_image():
-    with RSSEngine() as db:
-        bangumis = db.bangumi.search_all()
-        async with RequestContent() as req:
-            for bangumi in bangumis:
-                if bangumi.poster_link:
-                    # Hash local path
-                    img = await req.get_content(bangumi.poster_link)
-                    suffix = bangumi.poster_link.split(".")[-1]
-                    img_path = save_image(img, suffix)
-                    bangumi.poster_link = img_path
-        db.bangumi.update_all(bangumis)
+def cache_image():
+    """Download remote posters into data/posters in the background."""
+    return poster_jobs.start(CACHE)
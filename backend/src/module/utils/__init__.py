@@ -1 +1,7 @@
-from .cache_image import save_image, load_image
\ No newline at end of file
+from .cache_image import (
+    image_exists,
+    load_image,
+    save_image,
+    url_image_path,
+    write_image,
+)
@@ -1,12 +1,74 @@
 import hashlib
+import logging
+from io import BytesIO
+from pathlib import Path
 
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Poster paths are stored relative to the data directory ("posters/<name>")
+IMAGE_ROOT = Path("data")
+# Thumbnail widths; the library grid shows posters 80-150px wide
+POSTER_WIDTHS = (160, 320, 640)
+THUMBNAIL_FORMAT = "webp"
+THUMBNAIL_QUALITY = 80
 
 def save_image(img, suffix):
-    img_hash = hashlib.md5(img).hexdigest()[0:8]
-    image_path = f"data/posters/{img_hash}.{suffix}"
-    with open(image_path, "wb") as f:
-        f.write(img)
-    return f"posters/{img_hash}.{suffix}"
+    """Store *img* under its content hash; identical posters share a file."""
+    img_hash = hashlib.sha256(img).hexdigest()
+    img_path = f"posters/{img_hash}.{suffix}"
+    if not image_exists(img_path):
+        write_image(img, img_path)
+    return img_path
+
+
+def url_image_path(url: str, suffix: str) -> str:
+    """Stable poster path for *url*, known before the image is downloaded."""
+    url_hash = hashlib.md5(url.encode()).hexdigest()[0:8]
+    return f"posters/{url_hash}.{suffix}"
+
+
+def image_exists(img_path: str) -> bool:
+    return (IMAGE_ROOT / img_path).is_file()
+
+
+def write_image(img: bytes, img_path: str):
+    path = IMAGE_ROOT / img_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(img)
+    make_thumbnails(img, img_path)
+
+
+def thumbnail_path(img_path: str, width: int) -> str:
+    """``posters/<name>.jpg`` -> ``posters/<name>.w320.webp``"""
+    stem = img_path.rsplit(".", 1)[0]
+    return f"{stem}.w{width}.{THUMBNAIL_FORMAT}"
+
+
+def make_thumbnails(img: bytes, img_path: str) -> list[str]:
+    """Write the downscaled variants of a poster, return their paths.
+
+    Widths at or above the original's are skipped; those sizes are served
+    from the original.
+    """
+    written = []
+    try:
+        with Image.open(BytesIO(img)) as source:
+            source.load()
+            if source.mode not in ("RGB", "RGBA"):
+                source = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+            for width in POSTER_WIDTHS:
+                if width >= source.width:
+                    break
+                height = round(source.height * width / source.width)
+                thumbnail = source.resize((width, height), Image.Resampling.LANCZOS)
+                path = IMAGE_ROOT / thumbnail_path(img_path, width)
+                thumbnail.save(path, THUMBNAIL_FORMAT.upper(), quality=THUMBNAIL_QUALITY)
+                written.append(thumbnail_path(img_path, width))
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.warning("[Poster] Failed to make thumbnails for %s: %s", img_path, e)
+    return written
 
 
 def load_image(img_path):
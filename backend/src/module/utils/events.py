@@ -0,0 +1,138 @@
+"""In-process change events for the WebUI.
+
+The loops and managers ``publish`` what changed (a new bangumi, an RSS feed
+going down, a torrent renamed) and every open ``/events`` stream receives
+it. An event is serialized once when published and shared by all
+subscribers, so open tabs add no work beyond a queue put each.
+
+Recent events are kept so a reconnecting client can pass ``Last-Event-ID``
+and resume. When it has missed more than that, or falls too far behind,
+it receives a ``resync`` event telling it to reload everything.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from .metrics import gauge
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = 256
+QUEUE_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    id: int
+    type: str
+    data: str  # JSON
+
+
+_CLOSE = object()
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.lagged = False
+
+    def push(self, event: Event | object):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog; the client reloads instead of replaying it.
+            # The event that overflowed is delivered as the resync.
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(event)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        event = await self.queue.get()
+        if event is _CLOSE:
+            raise StopAsyncIteration
+        if self.lagged:
+            self.lagged = False
+            return Event(event.id, "resync", "{}")
+        return event
+
+
+class EventHub:
+    def __init__(self, history_size: int = HISTORY_SIZE, queue_size: int = QUEUE_SIZE):
+        self._history: deque[Event] = deque(maxlen=history_size)
+        self._subscribers: set[Subscription] = set()
+        self._queue_size = queue_size
+        self._last_id = 0
+        self.closed = False
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, type: str, data: dict | list) -> Event:
+        self._last_id += 1
+        event = Event(self._last_id, type, json.dumps(data, ensure_ascii=False))
+        self._history.append(event)
+        for subscription in self._subscribers:
+            subscription.push(event)
+        logger.debug("[Events] %s #%s to %s subscribers", type, event.id, self.subscribers)
+        return event
+
+    def _replay(self, subscription: Subscription, last_id: int):
+        if last_id == self._last_id:
+            return
+        # An id ahead of ours was issued before a restart
+        if (
+            last_id > self._last_id
+            or not self._history
+            or self._history[0].id > last_id + 1
+        ):
+            subscription.push(Event(self._last_id, "resync", "{}"))
+            return
+        for event in self._history:
+            if event.id > last_id:
+                subscription.push(event)
+
+    @asynccontextmanager
+    async def subscribe(self, last_id: int | None = None):
+        """Yield a subscription; events after *last_id* are replayed first."""
+        subscription = Subscription(self._queue_size)
+        if last_id is not None:
+            self._replay(subscription, last_id)
+        if self.closed:
+            subscription.push(_CLOSE)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    def close(self):
+        """End every open stream, e.g. on shutdown."""
+        self.closed = True
+        for subscription in self._subscribers:
+            subscription.push(_CLOSE)
+
+    def reopen(self):
+        self.closed = False
+
+
+event_hub = EventHub()
+
+
+def publish(type: str, data: dict | list) -> Event:
+    return event_hub.publish(type, data)
+
+
+gauge(
+    "autobangumi_event_subscribers",
+    "Open server-sent event streams.",
+    lambda: event_hub.subscribers,
+)
@@ -0,0 +1,124 @@
+"""In-memory tail of the log for the WebUI log stream.
+
+``LogBuffer`` sits next to the file handler on the logging
+``QueueListener`` and keeps the most recent formatted lines, each with a
+sequence number. Streams follow it instead of re-reading ``log.txt``: they
+wait for new lines, take only those after the last one they sent and apply
+their filters here, so a client receives only what it asked for.
+
+Records arrive on the listener thread, so waiting streams are woken through
+their event loop.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+BUFFER_SIZE = 5000
+
+
+@dataclass(frozen=True, slots=True)
+class LogLine:
+    seq: int
+    levelno: int
+    name: str
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class LogFilter:
+    levels: frozenset[int] = frozenset()
+    module: str = ""
+    keyword: str = ""
+
+    @classmethod
+    def build(
+        cls, levels: Iterable[str] = (), module: str = "", keyword: str = ""
+    ) -> "LogFilter":
+        """From level names (``INFO``, ``ERROR``...), a logger prefix and a keyword."""
+        numbers = frozenset(
+            number
+            for name in levels
+            if isinstance(number := logging.getLevelName(name.upper()), int)
+        )
+        return cls(numbers, module.strip(), keyword.strip().lower())
+
+    def __call__(self, line: LogLine) -> bool:
+        if self.levels and line.levelno not in self.levels:
+            return False
+        if self.module and not (
+            line.name == self.module or line.name.startswith(self.module + ".")
+        ):
+            return False
+        return not self.keyword or self.keyword in line.text.lower()
+
+
+class LogBuffer(logging.Handler):
+    def __init__(self, size: int = BUFFER_SIZE):
+        super().__init__()
+        self._lines: deque[LogLine] = deque(maxlen=size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._lock:
+            self._seq += 1
+            self._lines.append(LogLine(self._seq, record.levelno, record.name, text))
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop already closed
+                with self._lock:
+                    self._waiters.discard((loop, event))
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+
+    def since(self, seq: int, match: LogFilter = LogFilter()) -> list[LogLine]:
+        """Buffered lines after *seq* that pass *match*."""
+        with self._lock:
+            lines = list(self._lines)
+        return [line for line in lines if line.seq > seq and match(line)]
+
+    def tail(self, count: int, match: LogFilter = LogFilter()) -> list[LogLine]:
+        lines = self.since(0, match)
+        return lines[-count:] if count > 0 else []
+
+    async def follow(self, after: int, match: LogFilter = LogFilter()):
+        """Yield batches of matching lines logged after *after*, forever."""
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            while True:
+                if self._seq <= after:
+                    await event.wait()
+                event.clear()
+                seq = self._seq
+                lines = self.since(after, match)
+                after = max(seq, lines[-1].seq if lines else 0)
+                if lines:
+                    yield lines
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+log_buffer = LogBuffer()
@@ -0,0 +1,240 @@
+"""In-process metrics rendered in the Prometheus text format.
+
+Only what the app needs: labelled counters and histograms updated inline,
+and gauges read from a callback when the metrics are scraped. Updates are a
+dict lookup and a few additions, cheap enough to stay on in production.
+"""
+
+import functools
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+
+# Seconds; from fast in-memory work (parsing, matching) to slow network calls
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_registry: dict[str, "Counter | Histogram | Gauge"] = {}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labelvalues", "start")
+
+    def __init__(self, histogram: "Histogram", labelvalues: tuple):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labelvalues)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def time(self, *labelvalues) -> _Timer:
+        """Context manager observing the duration of its block."""
+        return _Timer(self, labelvalues)
+
+    def timed(self, *labelvalues):
+        """Decorator observing the duration of each call of a coroutine function."""
+
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with _Timer(self, labelvalues):
+                    return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def count(self, *labelvalues) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> list[str]:
+        lines = []
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            plain = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{plain} {total}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Value read at scrape time: a number, or a dict keyed by label tuples."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float | dict[tuple, float]],
+        labelnames: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def samples(self) -> list[str]:
+        value = self.callback()
+        if not isinstance(value, dict):
+            value = {(): value}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {v}"
+            for labels, v in value.items()
+        ]
+
+
+def _register(metric):
+    # Re-registering (e.g. on module reload) keeps the existing series
+    return _registry.setdefault(metric.name, metric)
+
+
+def counter(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def gauge(
+    name: str,
+    documentation: str,
+    callback: Callable[[], float | dict[tuple, float]],
+    labelnames: tuple[str, ...] = (),
+) -> Gauge:
+    return _register(Gauge(name, documentation, callback, labelnames))
+
+
+# Hits and misses of the in-memory and on-disk caches, by cache name
+CACHE_REQUESTS = counter(
+    "autobangumi_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+
+def cache_hit(cache: str):
+    CACHE_REQUESTS.inc(cache, "hit")
+
+
+def cache_miss(cache: str):
+    CACHE_REQUESTS.inc(cache, "miss")
+
+
+def _cache_hit_ratios() -> dict[tuple, float]:
+    totals: dict[str, list[float]] = {}
+    for (cache, result), value in CACHE_REQUESTS._values.items():
+        totals.setdefault(cache, [0, 0])[result == "hit"] += value
+    return {
+        (cache,): hits / (hits + misses)
+        for cache, (misses, hits) in totals.items()
+        if hits + misses
+    }
+
+
+gauge(
+    "autobangumi_cache_hit_ratio",
+    "Share of cache lookups served from the cache since start.",
+    _cache_hit_ratios,
+    ("cache",),
+)
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry.values():
+        samples = metric.samples()
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,136 @@
+"""On-demand profiling of the background loops.
+
+``loop_profiler.start("rss", 3)`` arms a cProfile capture of the next three
+passes of the RSS loop; the loop wraps each pass in ``iteration`` and its
+phases in ``phase``. Phase timings always feed the metrics histogram, so
+the breakdown is also visible without a capture.
+"""
+
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import time
+from contextlib import contextmanager
+
+from .metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+LOOPS = ("rss", "rename")
+MAX_ITERATIONS = 20
+
+LOOP_PHASE = histogram(
+    "autobangumi_loop_phase_seconds",
+    "Wall-clock time of each phase of a background loop pass.",
+    ("loop", "phase"),
+)
+
+
+class Capture:
+    def __init__(self, loop: str, iterations: int):
+        self.loop = loop
+        self.iterations = iterations
+        self.done = 0
+        self.profile = cProfile.Profile()
+        self.durations: list[float] = []
+        self.phases: dict[str, float] = {}
+        self.started_at = time.time()
+        self.finished_at: float | None = None
+
+    def summary(self) -> dict:
+        return {
+            "loop": self.loop,
+            "iterations": self.iterations,
+            "done": self.done,
+            "durations": [round(d, 3) for d in self.durations],
+            "phases": {name: round(t, 3) for name, t in self.phases.items()},
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class LoopProfiler:
+    """Holds at most one running capture and the last finished one."""
+
+    def __init__(self):
+        self.capture: Capture | None = None
+        self.result: Capture | None = None
+
+    def start(self, loop: str, iterations: int = 1) -> bool:
+        """Arm a capture; False if one is already running."""
+        if self.capture is not None:
+            return False
+        self.capture = Capture(loop, iterations)
+        logger.info(f"[Profiler] Profiling the next {iterations} {loop} iterations.")
+        return True
+
+    def cancel(self):
+        self.capture = None
+
+    def status(self) -> dict:
+        return {
+            "running": self.capture.summary() if self.capture else None,
+            "result": self.result.summary() if self.result else None,
+        }
+
+    @contextmanager
+    def iteration(self, loop: str):
+        """Profile this pass of *loop* if a capture for it is armed."""
+        capture = self.capture
+        if capture is None or capture.loop != loop:
+            yield
+            return
+        try:
+            capture.profile.enable()
+        except ValueError as e:
+            # Another profiler (e.g. a debugger) is already active
+            logger.warning(f"[Profiler] Cannot profile {loop}: {e}")
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            capture.profile.disable()
+            capture.durations.append(time.perf_counter() - start)
+            capture.done += 1
+            if capture.done >= capture.iterations and self.capture is capture:
+                capture.finished_at = time.time()
+                self.capture = None
+                self.result = capture
+                logger.info(f"[Profiler] Finished profiling {loop}.")
+
+    @contextmanager
+    def phase(self, loop: str, name: str):
+        """Time one phase of a loop pass."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            LOOP_PHASE.observe(elapsed, loop, name)
+            capture = self.capture
+            if capture is not None and capture.loop == loop:
+                capture.phases[name] = capture.phases.get(name, 0) + elapsed
+
+    def dump(self) -> bytes | None:
+        """The last result in the ``.prof`` format read by pstats and snakeviz."""
+        if self.result is None:
+            return None
+        self.result.profile.create_stats()
+        return marshal.dumps(self.result.profile.stats)
+
+    def report(self, limit: int = 50) -> str | None:
+        """The last result as text, sorted by cumulative time."""
+        if self.result is None:
+            return None
+        stream = io.StringIO()
+        stream.write(f"{self.result.summary()}\n\n")
+        stats = pstats.Stats(self.result.profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+loop_profiler = LoopProfiler()
@@ -1,5 +1,7 @@
 """Shared test fixtures for AutoBangumi test suite."""
 
+import sys
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,9 +10,14 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, create_engine
 
 from module.api import v1
+from module.api.cache import clear_response_cache
 from module.database.bangumi import _invalidate_bangumi_cache
 from module.models.config import Config
 from module.models import ResponseModel
+from module.downloader.torrent_cache import TorrentCache
+from module.network.circuit_breaker import reset_breakers
+from module.parser.analyser import bgm_calendar
+from module.parser.analyser.tmdb_cache import TMDBCache
 from module.security.api import get_current_user
 
 
@@ -32,6 +39,53 @@ def _clear_bangumi_cache():
     _invalidate_bangumi_cache()
 
 
+@pytest.fixture(autouse=True)
+def _clear_response_cache():
+    """Serialized API responses are keyed by table generation, which mocked
+    engines never bump; start every test without them."""
+    clear_response_cache()
+    yield
+    clear_response_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_torrent_cache(tmp_path):
+    """Keep the .torrent cache out of the real data directory."""
+    with patch(
+        "module.downloader.download_client.torrent_cache",
+        TorrentCache(tmp_path / "torrents"),
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _isolated_tmdb_cache(tmp_path):
+    """Keep the persistent TMDB response cache out of the real data directory."""
+    cache = TMDBCache(tmp_path / "tmdb_cache.db")
+    with patch.object(
+        sys.modules["module.parser.analyser.tmdb_parser"], "tmdb_cache", cache
+    ):
+        yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_bgm_calendar(tmp_path):
+    """Keep the Bangumi.tv calendar cache in memory and on disk per test."""
+    path = tmp_path / "bgm_calendar.json"
+    with patch.object(bgm_calendar, "BGM_CALENDAR_PATH", path):
+        with patch.object(bgm_calendar, "_calendar_index", None):
+            yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_circuit_breakers():
+    """Per-host circuit breakers are module-level; keep them from leaking."""
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
 @pytest.fixture
 def db_engine():
     """Create an in-memory SQLite engine for testing."""
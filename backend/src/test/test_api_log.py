@@ -1,5 +1,7 @@
 """Tests for Log API endpoints."""
 
+import logging
+
 import pytest
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -10,6 +12,7 @@ from fastapi.testclient import TestClient
 
 from module.api import v1
 from module.security.api import get_current_user
+from module.utils.log_buffer import LogBuffer
 
 
 # ---------------------------------------------------------------------------
@@ -110,6 +113,73 @@ class TestGetLog:
         assert "Third entry" in response.text
 
 
+# ---------------------------------------------------------------------------
+# GET /log/stream
+# ---------------------------------------------------------------------------
+
+
+class _FiniteBuffer(LogBuffer):
+    """Ends the stream after the backlog instead of waiting for new lines."""
+
+    async def follow(self, after, match=None):
+        return
+        yield
+
+
+@pytest.fixture
+def log_buffer():
+    buffer = _FiniteBuffer()
+    for name, level, msg in (
+        ("module.rss.engine", logging.INFO, "INFO: Refresh feed"),
+        ("module.rss.engine", logging.ERROR, "ERROR: Feed down"),
+        ("module.manager.renamer", logging.INFO, "INFO: Renamed episode"),
+    ):
+        buffer.handle(logging.LogRecord(name, level, __file__, 0, msg, None, None))
+    with patch("module.api.log.log_buffer", buffer):
+        yield buffer
+
+
+class TestStreamLog:
+    def test_backlog_is_filtered(self, authed_client, log_buffer):
+        response = authed_client.get(
+            "/api/v1/log/stream", params={"level": ["INFO"], "module": "module.rss"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: log" in response.text
+        assert "Refresh feed" in response.text
+        assert "Feed down" not in response.text
+        assert "Renamed episode" not in response.text
+
+    def test_resumes_after_last_event_id(self, authed_client, log_buffer):
+        response = authed_client.get(
+            "/api/v1/log/stream", headers={"Last-Event-ID": "1"}
+        )
+
+        assert "Refresh feed" not in response.text
+        assert "data: ERROR: Feed down" in response.text
+        assert "data: INFO: Renamed episode" in response.text
+        assert "id: 3" in response.text
+
+    def test_last_event_id_from_previous_process_gets_tail(
+        self, authed_client, log_buffer
+    ):
+        response = authed_client.get(
+            "/api/v1/log/stream",
+            params={"tail": 2},
+            headers={"Last-Event-ID": "900"},
+        )
+
+        assert "Refresh feed" not in response.text
+        assert "data: ERROR: Feed down" in response.text
+        assert "id: 3" in response.text
+
+    @patch("module.security.api.DEV_AUTH_BYPASS", False)
+    def test_stream_unauthorized(self, unauthed_client):
+        assert unauthed_client.get("/api/v1/log/stream").status_code == 401
+
+
 # ---------------------------------------------------------------------------
 # GET /log/clear
 # ---------------------------------------------------------------------------
@@ -214,3 +214,19 @@ class TestCheckDownloader:
 
         assert response.status_code == 200
         assert response.json() is False
+
+
+# ---------------------------------------------------------------------------
+# GET /check/network
+# ---------------------------------------------------------------------------
+
+
+class TestCheckNetwork:
+    def test_check_network_returns_pool_stats(self, authed_client):
+        """GET /check/network returns the per-pool connection counts."""
+        stats = {"mikanani.me": {"connections": 2, "active": 1, "idle": 1, "queued": 0}}
+        with patch("module.api.program.get_pool_stats", return_value=stats):
+            response = authed_client.get("/api/v1/check/network")
+
+        assert response.status_code == 200
+        assert response.json() == stats
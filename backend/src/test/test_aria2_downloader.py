@@ -0,0 +1,218 @@
+"""Tests for Aria2Downloader against an in-process fake aria2 JSON-RPC server."""
+
+import asyncio
+import json
+from functools import partial
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from module.downloader.client.aria2_downloader import Aria2Downloader
+
+
+class FakeAria2:
+    """Minimal aria2 JSON-RPC implementation served through httpx.MockTransport."""
+
+    SECRET = "token:secret"
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.downloads: dict[str, dict] = {}
+
+    def add(self, gid, name, files, status="complete", dir="/downloads/Show"):
+        self.downloads[gid] = {
+            "gid": gid,
+            "status": status,
+            "totalLength": "2048",
+            "completedLength": "2048" if status == "complete" else "1024",
+            "downloadSpeed": "0",
+            "uploadSpeed": "0",
+            "connections": "0",
+            "numSeeders": "0",
+            "dir": dir,
+            "infoHash": gid * 5,
+            "bittorrent": {"info": {"name": name}},
+            "files": [
+                {
+                    "index": str(i + 1),
+                    "path": f"{dir}/{path}",
+                    "length": "1024",
+                    "completedLength": "1024",
+                    "selected": "true",
+                }
+                for i, path in enumerate(files)
+            ],
+        }
+
+    def _dispatch(self, method: str, params: list):
+        assert params[0] == self.SECRET
+        params = params[1:]
+        if method == "aria2.getVersion":
+            return {"version": "1.37.0"}
+        if method == "aria2.getGlobalOption":
+            return {"dir": "/downloads"}
+        if method in ("aria2.tellActive", "aria2.tellWaiting", "aria2.tellStopped"):
+            wanted = {
+                "aria2.tellActive": ("active",),
+                "aria2.tellWaiting": ("waiting", "paused"),
+                "aria2.tellStopped": ("complete", "error", "removed"),
+            }[method]
+            keys = params[-1]
+            return [
+                {k: d[k] for k in keys if k in d}
+                for d in self.downloads.values()
+                if d["status"] in wanted
+            ]
+        if method == "aria2.tellStatus":
+            gid, keys = params
+            d = self.downloads[gid]
+            return {k: d[k] for k in keys if k in d}
+        if method == "aria2.forcePause":
+            self.downloads[params[0]]["status"] = "paused"
+            return params[0]
+        if method == "aria2.unpause":
+            self.downloads[params[0]]["status"] = "active"
+            return params[0]
+        if method == "aria2.forceRemove":
+            raise KeyError("already stopped")
+        if method == "aria2.removeDownloadResult":
+            self.downloads.pop(params[0])
+            return "OK"
+        if method in ("aria2.addUri", "aria2.addTorrent"):
+            gid = f"{len(self.downloads):04x}"
+            self.add(gid, "new", [], status="active", dir=params[-1]["dir"])
+            return gid
+        raise KeyError(method)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        if body["method"] == "system.multicall":
+            results = []
+            for call in body["params"][0]:
+                try:
+                    results.append([self._dispatch(call["methodName"], call["params"])])
+                except KeyError as e:
+                    results.append({"faultCode": 1, "faultString": str(e)})
+            result = results
+        else:
+            result = self._dispatch(body["method"], body["params"])
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+
+@pytest.fixture
+def server() -> FakeAria2:
+    return FakeAria2()
+
+
+@pytest.fixture
+async def aria2(server):
+    client = Aria2Downloader(host="http://localhost:6800", username="", password="secret")
+    transport = httpx.MockTransport(server.handler)
+    with patch(
+        "module.downloader.client.aria2_downloader.httpx.AsyncClient",
+        partial(httpx.AsyncClient, transport=transport),
+    ):
+        assert await client.auth() is True
+    yield client
+    await client.logout()
+
+
+class TestAria2Info:
+    async def test_listing_is_one_multicall_with_key_filter(self, aria2, server):
+        server.add("a001", "Show - 01.mkv", ["Show - 01.mkv"])
+        server.add("a002", "Show - 02.mkv", ["Show - 02.mkv"], status="active")
+        server.requests.clear()
+
+        result = await aria2.torrents_info(status_filter=None, category="Bangumi")
+
+        assert {t["name"] for t in result} == {"Show - 01.mkv", "Show - 02.mkv"}
+        assert len(server.requests) == 1
+        calls = server.requests[0]["params"][0]
+        assert [c["methodName"] for c in calls] == [
+            "aria2.tellActive",
+            "aria2.tellWaiting",
+            "aria2.tellStopped",
+        ]
+        assert "files" not in calls[0]["params"][-1]
+
+    async def test_completed_filter_and_hash(self, aria2, server):
+        server.add("a001", "Show - 01.mkv", ["Show - 01.mkv"])
+        server.add("a002", "Show - 02.mkv", ["Show - 02.mkv"], status="active")
+
+        result = await aria2.torrents_info(status_filter="completed", category="Bangumi")
+
+        assert [t["hash"] for t in result] == ["a001" * 5]
+        assert result[0]["save_path"] == "/downloads/Show"
+        assert result[0]["progress"] == 1
+
+    async def test_concurrent_file_listing_is_batched(self, aria2, server):
+        server.add("a001", "Show S1", ["Show S1/ep01.mkv", "Show S1/ep01.ass"])
+        server.add("a002", "Show - 05.mkv", ["Show - 05.mkv"])
+        await aria2.torrents_info(status_filter=None, category=None)
+        server.requests.clear()
+
+        files_a, files_b = await asyncio.gather(
+            aria2.torrents_files("a001" * 5), aria2.torrents_files("a002" * 5)
+        )
+
+        assert [f["name"] for f in files_a] == ["ep01.mkv", "ep01.ass"]
+        assert [f["name"] for f in files_b] == ["Show - 05.mkv"]
+        assert len(server.requests) == 1
+        assert server.requests[0]["method"] == "system.multicall"
+
+
+    async def test_unknown_gid_in_file_listing_is_skipped(self, aria2, server):
+        server.add("a001", "Show - 01.mkv", ["Show - 01.mkv"])
+        await aria2.torrents_info(status_filter=None, category=None)
+        # aria2 answers with a gid that was never requested
+        server.downloads["a001"]["gid"] = "ffff"
+
+        assert await aria2.torrents_files("a001" * 5) == []
+
+
+class TestAria2Write:
+    async def test_add_torrents_batches_into_one_request(self, aria2, server):
+        server.requests.clear()
+
+        added = await aria2.add_torrents(
+            torrent_urls=["magnet:?xt=1", "magnet:?xt=2"],
+            torrent_files=[b"torrent"],
+            save_path="/downloads/Show/Season 1",
+            category="Bangumi",
+        )
+
+        assert added is True
+        assert len(server.requests) == 1
+        assert len(server.downloads) == 3
+
+    async def test_pause_resume_use_gids(self, aria2, server):
+        server.add("a001", "Show", ["Show.mkv"], status="active")
+
+        await aria2.torrents_pause("a001" * 5)
+        assert server.downloads["a001"]["status"] == "paused"
+        await aria2.torrents_resume("a001" * 5)
+        assert server.downloads["a001"]["status"] == "active"
+
+    async def test_delete_tolerates_faulted_calls(self, aria2, server):
+        server.add("a001", "Show", ["Show.mkv"])
+
+        await aria2.torrents_delete("a001" * 5)
+
+        assert server.downloads == {}
+
+    async def test_rename_is_reported_as_unsupported(self, aria2):
+        assert await aria2.torrents_rename_file("x", "a.mkv", "b.mkv") is False
+        assert Aria2Downloader.supports_rename is False
+
+    async def test_qbittorrent_only_operations_are_no_ops(self, aria2):
+        await aria2.prefs_init({"rss_auto_downloading_enabled": True})
+        await aria2.add_category("BangumiCollection")
+        await aria2.set_category("x", "BangumiCollection")
+        await aria2.rss_set_rule("rule", {})
+        await aria2.remove_rule("rule")
+        assert await aria2.rss_get_feeds() == {}
+        assert await aria2.get_download_rule() == {}
+        assert await aria2.move_torrent("x", "/downloads/Other") is False
+        assert await aria2.add_tag("x", "ab:1") is False
@@ -0,0 +1,86 @@
+"""Tests for the indexed Bangumi.tv calendar and its on-disk cache."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+from module.parser.analyser import bgm_calendar
+from module.parser.analyser.bgm_calendar import (
+    CALENDAR_TTL,
+    CalendarIndex,
+    get_calendar_index,
+    match_weekday,
+)
+
+ITEMS = [
+    {"name": "葬送のフリーレン", "name_cn": "葬送的芙莉莲", "air_weekday": 4},
+    {"name": "Kusuriya no Hitorigoto", "name_cn": "药屋少女的呢喃", "air_weekday": 5},
+    {"name": "Dungeon Meshi", "name_cn": "迷宫饭", "air_weekday": 3},
+    {"name": "", "name_cn": "", "air_weekday": 0},
+    {"name": "Kusuriya no Hitorigoto 2", "name_cn": "药屋少女的呢喃 第二季", "air_weekday": 1},
+]
+
+
+class TestCalendarIndex:
+    def test_exact_matches(self):
+        index = CalendarIndex(ITEMS)
+        assert index.match("葬送的芙莉莲", "") == 4
+        assert index.match("Unknown", "Dungeon Meshi") == 3
+        # Normalized: case and surrounding/inner whitespace are ignored
+        assert index.match("  dungeon   meshi ", "x") == 3
+
+    def test_substring_matches_first_listed_item(self):
+        index = CalendarIndex(ITEMS)
+        # Both season entries contain the query; the earlier one wins
+        assert index.match("药屋少女的呢喃", "nothing") == 5
+        assert index.match("药屋少女的呢喃 第二季 特别篇", "nothing") == 5
+        assert index.match("少女的呢喃 第二季", "nothing") == 1
+        assert index.match("Unknown", "[Sub] Kusuriya no Hitorigoto 2 - 01") == 5
+
+    def test_short_titles_are_not_fuzzy_matched(self):
+        index = CalendarIndex(ITEMS)
+        # "迷宫饭" is shorter than the minimum substring length
+        assert index.match("迷宫饭 第二季", "nothing") is None
+        assert index.match("Unknown", "None") is None
+
+    def test_match_weekday_accepts_item_list(self):
+        assert match_weekday("葬送的芙莉莲", "", ITEMS) == 4
+        assert match_weekday("葬送的芙莉莲", "", CalendarIndex(ITEMS)) == 4
+
+
+class TestCalendarCache:
+    async def test_fresh_calendar_on_disk_is_reused(self):
+        CalendarIndex(ITEMS).save(bgm_calendar.BGM_CALENDAR_PATH)
+        fetch = AsyncMock(return_value=[])
+        with patch.object(bgm_calendar, "fetch_bgm_calendar", fetch):
+            index = await get_calendar_index()
+
+        fetch.assert_not_called()
+        assert index.match("迷宫饭", "") == 3
+
+    async def test_stale_or_forced_calendar_is_refetched(self):
+        CalendarIndex(ITEMS, fetched_at=time.time() - CALENDAR_TTL - 1).save(
+            bgm_calendar.BGM_CALENDAR_PATH
+        )
+        new_items = [{"name": "New Show", "name_cn": "新番", "air_weekday": 6}]
+        fetch = AsyncMock(return_value=new_items)
+        with patch.object(bgm_calendar, "fetch_bgm_calendar", fetch):
+            index = await get_calendar_index()
+            assert index.items == new_items
+            await get_calendar_index()
+            assert fetch.await_count == 1
+            await get_calendar_index(force=True)
+            assert fetch.await_count == 2
+
+        reloaded = CalendarIndex.load(bgm_calendar.BGM_CALENDAR_PATH)
+        assert reloaded.items == new_items
+
+    async def test_failed_fetch_keeps_stale_calendar(self):
+        CalendarIndex(ITEMS, fetched_at=0).save(bgm_calendar.BGM_CALENDAR_PATH)
+        with patch.object(bgm_calendar, "fetch_bgm_calendar", AsyncMock(return_value=[])):
+            index = await get_calendar_index()
+
+        assert index.items == ITEMS
+
+    async def test_no_calendar_at_all(self):
+        with patch.object(bgm_calendar, "fetch_bgm_calendar", AsyncMock(return_value=[])):
+            assert await get_calendar_index() is None
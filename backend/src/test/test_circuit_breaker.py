@@ -0,0 +1,119 @@
+"""Tests for the per-host circuit breaker and its use in RequestURL."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from module.network.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    backoff_delay,
+    breaker_state,
+    get_breaker,
+)
+from module.network.request_url import RequestURL
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+    def test_probe_success_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.failures == 0
+
+    def test_probe_failure_doubles_cooldown(self):
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=10, max_reset_timeout=15
+        )
+        breaker.record_failure()
+        breaker.opened_at -= 10
+        assert breaker.allow_request() is True
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.reset_timeout == 15
+
+    def test_breakers_are_shared_per_host(self):
+        a = get_breaker("https://mikanani.me/RSS/Bangumi?id=1")
+        b = get_breaker("https://mikanani.me/Download/x.torrent")
+        assert a is b
+        assert breaker_state("https://api.themoviedb.org/3") == CLOSED
+
+    @pytest.mark.parametrize("attempt", [0, 1, 2, 5, 10])
+    def test_backoff_is_bounded(self, attempt):
+        delay = backoff_delay(attempt, base=1.0, cap=10.0)
+        assert 0 <= delay <= min(10.0, 2**attempt)
+
+
+class TestRequestUrlBreaker:
+    async def test_dead_host_fails_fast(self):
+        url = "https://down.example.com/rss"
+        client = AsyncMock()
+        client.get = AsyncMock(side_effect=httpx.ConnectError("down"))
+        req = RequestURL()
+        with (
+            patch.object(RequestURL, "_client_for", AsyncMock(return_value=client)),
+            patch("module.network.request_url.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            assert await req.get_url(url, retry=3) is None
+            assert breaker_state(url) == OPEN
+            assert await req.get_url(url, retry=3) is None
+
+        # The second call never reached the network
+        assert client.get.call_count == 3
+
+    async def test_client_error_does_not_trip_breaker(self):
+        url = "https://mikanani.me/missing"
+        response = httpx.Response(404, request=httpx.Request("GET", url))
+        client = AsyncMock()
+        client.get = AsyncMock(return_value=response)
+        req = RequestURL()
+        with patch.object(RequestURL, "_client_for", AsyncMock(return_value=client)):
+            for _ in range(5):
+                assert await req.get_url(url) is None
+
+        assert breaker_state(url) == CLOSED
+
+    async def test_cancelled_probe_releases_breaker(self):
+        url = "https://hang.example.com/rss"
+        breaker = get_breaker(url)
+        breaker.failure_threshold = 1
+        breaker.reset_timeout = 0
+        breaker.record_failure()
+        client = AsyncMock()
+        client.get = AsyncMock(side_effect=asyncio.CancelledError)
+        with patch.object(RequestURL, "_client_for", AsyncMock(return_value=client)):
+            with pytest.raises(asyncio.CancelledError):
+                await RequestURL().get_url(url)
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is True
+
+    async def test_unexpected_post_error_counts_as_failure(self):
+        url = "https://broken.example.com/api"
+        client = AsyncMock()
+        client.post = AsyncMock(side_effect=ValueError("bad payload"))
+        with patch.object(RequestURL, "_client_for", AsyncMock(return_value=client)):
+            assert await RequestURL().post_url(url, {}) is None
+
+        assert get_breaker(url).failures == 1
@@ -200,6 +200,37 @@ class TestAddTorrent:
         assert call_kwargs["torrent_files"] == b"torrent-file-data"
         assert call_kwargs["torrent_urls"] is None
 
+    async def test_file_url_cached_and_hash_filled(self, download_client, mock_qb_client):
+        """A fetched .torrent is reused on re-add and its infohash fills qb_hash."""
+        payload = b"d4:infod4:name4:Showee"
+        bangumi = make_bangumi()
+
+        with patch("module.downloader.download_client.RequestContent") as MockReq:
+            mock_req = AsyncMock()
+            mock_req.get_content = AsyncMock(return_value=payload)
+            MockReq.return_value.__aenter__ = AsyncMock(return_value=mock_req)
+            MockReq.return_value.__aexit__ = AsyncMock(return_value=False)
+
+            first = make_torrent(url="https://example.com/file.torrent")
+            await download_client.add_torrent(first, bangumi)
+            retry = make_torrent(url="https://example.com/file.torrent")
+            await download_client.add_torrent(retry, bangumi)
+
+        assert mock_req.get_content.await_count == 1
+        assert mock_qb_client.add_torrents.call_args[1]["torrent_files"] == payload
+        assert first.qb_hash == retry.qb_hash
+        assert len(retry.qb_hash) == 40
+
+    async def test_magnet_hash_filled(self, download_client, mock_qb_client):
+        """Magnet links fill qb_hash from their btih."""
+        torrent = make_torrent(url="magnet:?xt=urn:btih:" + "ab" * 20)
+        with patch("module.downloader.download_client.RequestContent") as MockReq:
+            MockReq.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            MockReq.return_value.__aexit__ = AsyncMock(return_value=False)
+            await download_client.add_torrent(torrent, make_bangumi())
+
+        assert torrent.qb_hash == "ab" * 20
+
     async def test_list_magnet_urls(self, download_client, mock_qb_client):
         """List of magnet torrents are joined as list of URLs."""
         torrents = [
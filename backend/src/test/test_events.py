@@ -0,0 +1,124 @@
+"""Tests for the change event hub and the /events stream."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from module.manager.renamer import Renamer
+from module.models import Notification
+from module.utils.events import EventHub
+
+
+async def _drain(subscription, count: int) -> list:
+    return [await asyncio.wait_for(anext(subscription), 1) for _ in range(count)]
+
+
+class TestEventHub:
+    async def test_fan_out_shares_serialized_event(self):
+        hub = EventHub()
+        async with hub.subscribe() as a, hub.subscribe() as b:
+            assert hub.subscribers == 2
+            hub.publish("bangumi_added", [{"id": 1, "official_title": "葬送的芙莉莲"}])
+            (event_a,) = await _drain(a, 1)
+            (event_b,) = await _drain(b, 1)
+        assert event_a is event_b
+        assert event_a.type == "bangumi_added"
+        assert json.loads(event_a.data)[0]["official_title"] == "葬送的芙莉莲"
+        assert hub.subscribers == 0
+
+    async def test_replays_events_after_last_id(self):
+        hub = EventHub()
+        first = hub.publish("status", {"status": True})
+        hub.publish("rss_status", {"id": 1, "status": "error"})
+        hub.publish("torrent_added", [{"name": "x", "bangumi_id": 1}])
+        async with hub.subscribe(last_id=first.id) as subscription:
+            events = await _drain(subscription, 2)
+        assert [e.type for e in events] == ["rss_status", "torrent_added"]
+
+    async def test_resync_when_history_was_dropped(self):
+        hub = EventHub(history_size=2)
+        for i in range(5):
+            hub.publish("status", {"n": i})
+        async with hub.subscribe(last_id=1) as subscription:
+            (event,) = await _drain(subscription, 1)
+        assert event.type == "resync"
+        assert event.id == 5
+
+    async def test_resync_when_last_id_is_from_before_restart(self):
+        hub = EventHub()
+        hub.publish("status", {"n": 0})
+        async with hub.subscribe(last_id=40) as subscription:
+            (event,) = await _drain(subscription, 1)
+        assert event.type == "resync"
+        assert event.id == 1
+
+    async def test_slow_subscriber_gets_resync(self):
+        hub = EventHub(queue_size=2)
+        async with hub.subscribe() as subscription:
+            for i in range(3):
+                hub.publish("torrent_renamed", [{"n": i}])
+            hub.publish("status", {"status": True})
+            (event,) = await _drain(subscription, 1)
+        assert event.type == "resync"
+
+    async def test_resync_is_delivered_without_further_events(self):
+        hub = EventHub(queue_size=2)
+        async with hub.subscribe() as subscription:
+            for i in range(3):
+                hub.publish("torrent_renamed", [{"n": i}])
+            (event,) = await _drain(subscription, 1)
+            assert subscription.queue.empty()
+        assert event.type == "resync"
+        assert event.id == 3
+
+    async def test_close_ends_streams(self):
+        hub = EventHub()
+        async with hub.subscribe() as subscription:
+            hub.publish("status", {"status": False})
+            hub.close()
+            events = [event async for event in subscription]
+        assert [e.type for e in events] == ["status"]
+
+
+class TestEventStream:
+    @pytest.fixture
+    def hub(self):
+        hub = EventHub()
+        with patch("module.api.events.event_hub", hub):
+            yield hub
+
+    def test_stream_replays_from_last_event_id(self, authed_client, hub):
+        hub.publish("status", {"status": True})
+        hub.publish("review_flagged", {"id": 3, "official_title": "T", "reason": "r"})
+        # Closing the hub ends the stream after the replay
+        hub.close()
+
+        response = authed_client.get("/api/v1/events", headers={"Last-Event-ID": "1"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: review_flagged" in response.text
+        assert "id: 2" in response.text
+        assert "event: status" not in response.text
+
+
+class TestEmitters:
+    async def test_renamer_publishes_notifications(self, mock_qb_client):
+        hub = EventHub()
+        with patch(
+            "module.downloader.download_client.DownloadClient._DownloadClient__getClient",
+            return_value=mock_qb_client,
+        ):
+            renamer = Renamer()
+        with patch("module.manager.renamer.publish", hub.publish), patch.object(
+            renamer,
+            "_rename_all",
+            return_value=[Notification(official_title="T", season=1, episode=2)],
+        ), patch.object(renamer, "_batch_lookup_offsets", return_value={}):
+            async with hub.subscribe() as subscription:
+                await renamer.rename()
+                (event,) = await _drain(subscription, 1)
+        assert event.type == "torrent_renamed"
+        assert json.loads(event.data)[0]["episode"] == 2
@@ -0,0 +1,70 @@
+"""Tests for the in-memory log tail behind the log stream."""
+
+import asyncio
+import logging
+import threading
+
+from module.utils.log_buffer import LogBuffer, LogFilter
+
+
+def _log(buffer: LogBuffer, name: str, level: int, msg: str):
+    buffer.handle(logging.LogRecord(name, level, __file__, 0, msg, None, None))
+
+
+def _texts(lines) -> list[str]:
+    return [line.text for line in lines]
+
+
+class TestLogFilter:
+    def test_levels_module_keyword(self):
+        buffer = LogBuffer()
+        _log(buffer, "module.rss.engine", logging.INFO, "Refresh feed Mikan")
+        _log(buffer, "module.rss.engine", logging.ERROR, "Feed Mikan down")
+        _log(buffer, "module.rss_extra", logging.ERROR, "Other module")
+        _log(buffer, "module.manager.renamer", logging.INFO, "Renamed mikan ep")
+
+        assert _texts(buffer.since(0, LogFilter.build(["error"]))) == [
+            "Feed Mikan down",
+            "Other module",
+        ]
+        assert _texts(buffer.since(0, LogFilter.build(module="module.rss"))) == [
+            "Refresh feed Mikan",
+            "Feed Mikan down",
+        ]
+        assert _texts(buffer.since(0, LogFilter.build(["INFO"], keyword="MIKAN"))) == [
+            "Refresh feed Mikan",
+            "Renamed mikan ep",
+        ]
+
+    def test_unknown_level_is_ignored(self):
+        assert LogFilter.build(["verbose"]).levels == frozenset()
+
+
+class TestLogBuffer:
+    def test_ring_keeps_latest(self):
+        buffer = LogBuffer(size=3)
+        for i in range(5):
+            _log(buffer, "module", logging.INFO, f"line {i}")
+        assert _texts(buffer.since(0)) == ["line 2", "line 3", "line 4"]
+        assert _texts(buffer.tail(2)) == ["line 3", "line 4"]
+        assert buffer.tail(0) == []
+        assert buffer.last_seq == 5
+
+    async def test_follow_wakes_from_other_thread(self):
+        buffer = LogBuffer()
+        _log(buffer, "module", logging.INFO, "before")
+        stream = buffer.follow(buffer.last_seq, LogFilter.build(["WARNING"]))
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        def emit():
+            _log(buffer, "module", logging.INFO, "skipped")
+            _log(buffer, "module", logging.WARNING, "wanted")
+
+        thread = threading.Thread(target=emit)
+        thread.start()
+        thread.join()
+        lines = await asyncio.wait_for(pending, 1)
+        await stream.aclose()
+
+        assert _texts(lines) == ["wanted"]
@@ -0,0 +1,95 @@
+"""Tests for the in-process metrics registry and the /metrics endpoint."""
+
+import pytest
+
+from module.utils import metrics
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Start from an empty registry so series from other tests don't leak in."""
+    monkeypatch.setattr(metrics, "_registry", {})
+    return metrics._registry
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative_and_inclusive(self, registry):
+        h = metrics.histogram("t_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+        h.observe(0.1, "a")
+        h.observe(0.5, "a")
+        h.observe(5, "a")
+
+        lines = h.samples()
+
+        assert lines == [
+            't_seconds_bucket{op="a",le="0.1"} 1',
+            't_seconds_bucket{op="a",le="1.0"} 2',
+            't_seconds_bucket{op="a",le="+Inf"} 3',
+            't_seconds_sum{op="a"} 5.6',
+            't_seconds_count{op="a"} 3',
+        ]
+
+    async def test_timer_and_decorator(self, registry):
+        h = metrics.histogram("t_seconds", "Test.", ("op",))
+
+        @h.timed("call")
+        async def call():
+            return 42
+
+        with h.time("block"):
+            pass
+        assert await call() == 42
+        assert h.count("block") == 1
+        assert h.count("call") == 1
+
+    def test_timer_records_when_block_raises(self, registry):
+        h = metrics.histogram("t_seconds", "Test.")
+        with pytest.raises(ValueError):
+            with h.time():
+                raise ValueError
+        assert h.count() == 1
+
+
+class TestRender:
+    def test_exposition_format(self, registry):
+        c = metrics.counter("t_total", "Things.", ("name",))
+        c.inc('quo"te')
+        metrics.gauge("t_depth", "Depth.", lambda: 3)
+        metrics.histogram("t_unused_seconds", "Never observed.")
+
+        text = metrics.render()
+
+        assert text == (
+            "# HELP t_total Things.\n"
+            "# TYPE t_total counter\n"
+            't_total{name="quo\\"te"} 1\n'
+            "# HELP t_depth Depth.\n"
+            "# TYPE t_depth gauge\n"
+            "t_depth 3\n"
+        )
+
+    def test_cache_hit_ratio(self, monkeypatch):
+        counter = metrics.Counter("c", "c", ("cache", "result"))
+        monkeypatch.setattr(metrics, "CACHE_REQUESTS", counter)
+        for _ in range(3):
+            metrics.cache_hit("tmdb")
+        metrics.cache_miss("tmdb")
+        metrics.cache_miss("mikan")
+
+        assert metrics._cache_hit_ratios() == {("tmdb",): 0.75, ("mikan",): 0.0}
+
+
+class TestMetricsEndpoint:
+    def test_serves_instrumented_metrics(self, authed_client):
+        from module.parser.analyser.torrent_parser import torrent_parser
+
+        torrent_parser("[Sub] Show - 01 [1080P].mkv")
+        torrent_parser("[Sub] Show - 01 [1080P].mkv")
+
+        response = authed_client.get("/api/v1/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE autobangumi_cache_requests_total counter" in response.text
+        assert 'autobangumi_cache_requests_total{cache="torrent_parser",result="hit"}' in response.text
+        assert "autobangumi_cache_hit_ratio" in response.text
@@ -0,0 +1,85 @@
+"""Tests for mikan_parser: persistent page cache and background poster prefetch."""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from module.parser.analyser.mikan_parser import MikanCache
+
+mikan_module = sys.modules["module.parser.analyser.mikan_parser"]
+
+HOMEPAGE = "https://mikanani.me/Home/Episode/abc123"
+HTML = """
+<div class="bangumi-poster" style="background-image: url('/images/Bangumi/202410/poster.jpg?width=400');"></div>
+<p class="bangumi-title"><a href="/Home/Bangumi/3367" class="w-other-c">葬送的芙莉莲 第二季</a></p>
+"""
+
+
+@pytest.fixture
+def fake_mikan(tmp_path):
+    req = AsyncMock()
+    req.get_html = AsyncMock(return_value=HTML)
+    req.get_content = AsyncMock(return_value=b"jpeg-bytes")
+    ctx = AsyncMock()
+    ctx.__aenter__.return_value = req
+    with (
+        patch.object(mikan_module, "RequestContent", return_value=ctx),
+        patch.object(mikan_module, "mikan_cache", MikanCache(tmp_path / "mikan.json")),
+        patch("module.utils.cache_image.IMAGE_ROOT", tmp_path),
+    ):
+        yield req
+
+
+async def test_parses_and_prefetches_poster(fake_mikan, tmp_path):
+    poster_link, title = await mikan_module.mikan_parser(HOMEPAGE)
+    await asyncio.gather(*mikan_module._prefetch_tasks)
+
+    assert title == "葬送的芙莉莲"
+    assert poster_link.startswith("posters/") and poster_link.endswith(".jpg")
+    assert (tmp_path / poster_link).read_bytes() == b"jpeg-bytes"
+    fake_mikan.get_content.assert_awaited_once_with(
+        "https://mikanani.me/images/Bangumi/202410/poster.jpg"
+    )
+    assert mikan_module.mikan_cache.get(HOMEPAGE)["bangumi_id"] == "3367"
+
+
+async def test_cache_survives_restart(fake_mikan, tmp_path):
+    first = await mikan_module.mikan_parser(HOMEPAGE)
+    await asyncio.gather(*mikan_module._prefetch_tasks)
+    if saving := mikan_module.mikan_cache._saving:
+        await saving
+
+    with patch.object(mikan_module, "mikan_cache", MikanCache(tmp_path / "mikan.json")):
+        assert await mikan_module.mikan_parser(HOMEPAGE) == first
+
+    fake_mikan.get_html.assert_awaited_once()
+    # Poster already on disk, nothing downloaded again
+    fake_mikan.get_content.assert_awaited_once()
+
+
+def test_cache_is_bounded(tmp_path):
+    cache = MikanCache(tmp_path / "mikan.json", max_size=2)
+    for i in range(3):
+        cache.set(f"page{i}", {"title": str(i)})
+    cache.get("page1")
+    cache.set("page3", {"title": "3"})
+
+    reloaded = MikanCache(tmp_path / "mikan.json", max_size=2)
+    assert reloaded.get("page0") is None
+    assert reloaded.get("page2") is None
+    assert reloaded.get("page1") == {"title": "1"}
+
+
+async def test_writes_are_coalesced_off_the_loop(tmp_path):
+    cache = MikanCache(tmp_path / "mikan.json")
+    with patch.object(cache, "_write", wraps=cache._write) as write:
+        for i in range(50):
+            cache.set(f"page{i}", {"title": str(i)})
+        assert not (tmp_path / "mikan.json").exists()
+        await cache._saving
+
+    # The first write picks up every entry set before the worker ran
+    assert write.call_count == 1
+    assert MikanCache(tmp_path / "mikan.json").get("page49") == {"title": "49"}
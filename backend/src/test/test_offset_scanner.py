@@ -0,0 +1,129 @@
+"""Tests for OffsetScanner: concurrent scan, fingerprint skip and resume."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from module.core.offset_scanner import OffsetScanner
+from module.parser.analyser.tmdb_parser import TMDBInfo
+from test.factories import make_bangumi
+
+
+def make_tmdb_info(**overrides) -> TMDBInfo:
+    defaults = dict(
+        id=1,
+        title="Test Anime",
+        original_title="Test Anime",
+        season=[],
+        last_season=2,
+        year="2024",
+        season_episode_counts={1: 12, 2: 12},
+    )
+    defaults.update(overrides)
+    return TMDBInfo(**defaults)
+
+
+@pytest.fixture
+def bangumi_list():
+    return [make_bangumi(id=i, official_title=f"Anime {i}") for i in range(1, 7)]
+
+
+@pytest.fixture
+def mock_db(bangumi_list):
+    with patch("module.core.offset_scanner.Database") as MockDB:
+        db = MagicMock()
+        db.bangumi.get_active_for_scan.return_value = bangumi_list
+        MockDB.return_value.__enter__ = MagicMock(return_value=db)
+        MockDB.return_value.__exit__ = MagicMock(return_value=False)
+        yield db
+
+
+@pytest.fixture
+def scanner(tmp_path):
+    return OffsetScanner(state_path=tmp_path / "offset_scan.json")
+
+
+class TestScanAll:
+    async def test_checks_run_concurrently(self, scanner, mock_db):
+        running = 0
+        peak = 0
+
+        async def slow_tmdb(title, language):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return None
+
+        with patch("module.core.offset_scanner.tmdb_parser", side_effect=slow_tmdb):
+            assert await scanner.scan_all() == 0
+
+        assert peak > 1
+
+    async def test_unchanged_tmdb_data_is_skipped(self, scanner, mock_db):
+        tmdb = AsyncMock(return_value=make_tmdb_info())
+        detect = MagicMock(return_value=None)
+        with (
+            patch("module.core.offset_scanner.tmdb_parser", tmdb),
+            patch("module.core.offset_scanner.detect_offset_mismatch", detect),
+        ):
+            await scanner.scan_all()
+            assert detect.call_count == 6
+            await scanner.scan_all()
+            assert detect.call_count == 6
+
+            tmdb.return_value = make_tmdb_info(season_episode_counts={1: 12, 2: 13})
+            await scanner.scan_all()
+            assert detect.call_count == 12
+
+    async def test_failed_flag_is_rechecked_next_scan(self, scanner, mock_db):
+        tmdb = AsyncMock(return_value=make_tmdb_info())
+        suggestion = MagicMock(
+            confidence="high", reason="S2 is S1 cont.", season_offset=1, episode_offset=0
+        )
+        detect = MagicMock(return_value=suggestion)
+        mock_db.bangumi.set_needs_review.side_effect = RuntimeError("database locked")
+        with (
+            patch("module.core.offset_scanner.tmdb_parser", tmdb),
+            patch("module.core.offset_scanner.detect_offset_mismatch", detect),
+        ):
+            assert await scanner.scan_all() == 0
+            assert json.loads(scanner.state_path.read_text())["fingerprints"] == {}
+
+            mock_db.bangumi.set_needs_review.side_effect = None
+            assert await scanner.scan_all() == 6
+
+        assert detect.call_count == 12
+
+    async def test_interrupted_scan_resumes(self, scanner, mock_db, bangumi_list):
+        scanner.state_path.write_text(json.dumps({"done": [1, 2, 3], "fingerprints": {}}))
+        tmdb = AsyncMock(return_value=None)
+
+        with patch("module.core.offset_scanner.tmdb_parser", tmdb):
+            await scanner.scan_all()
+
+        checked = sorted(call.args[0] for call in tmdb.await_args_list)
+        assert checked == ["Anime 4", "Anime 5", "Anime 6"]
+        # A finished scan clears progress
+        assert json.loads(scanner.state_path.read_text())["done"] == []
+
+    async def test_progress_saved_on_cancel(self, scanner, mock_db):
+        started = asyncio.Event()
+
+        async def hang(title, language):
+            if title == "Anime 1":
+                return None
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch("module.core.offset_scanner.tmdb_parser", side_effect=hang):
+            task = asyncio.create_task(scanner.scan_all())
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert json.loads(scanner.state_path.read_text())["done"] == [1]
@@ -1,10 +1,76 @@
+import asyncio
 import json
 import pytest
 from unittest import mock
 
+import httpx
+
 from module.parser.analyser.openai import DEFAULT_PROMPT, OpenAIParser
 
 
+def episode_payload(index: int, title_en: str) -> dict:
+    return {
+        "index": index,
+        "title_en": title_en,
+        "title_zh": None,
+        "title_jp": None,
+        "season": "1",
+        "season_raw": "",
+        "episode": "1",
+        "sub": "CHT",
+        "group": "ANi",
+        "resolution": "1080P",
+        "source": "WEB-DL",
+    }
+
+
+class StubOpenAI:
+    """Chat completions endpoint answering every title with its own name."""
+
+    def __init__(self, delay: float = 0, reject: str | None = None):
+        self.requests: list[dict] = []
+        self.delay = delay
+        self.reject = reject
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        items = json.loads(body["messages"][-1]["content"])
+        if any(i["title"] == self.reject for i in items):
+            return httpx.Response(400, json={"error": {"message": "bad batch"}})
+        content = {
+            "episodes": [episode_payload(i["index"], i["title"]) for i in items]
+        }
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": json.dumps(content),
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+            },
+        )
+
+
+def stub_parser(server: StubOpenAI, **kwargs) -> OpenAIParser:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+    return OpenAIParser(
+        api_key="testing!", api_base="http://stub/v1", http_client=client, **kwargs
+    )
+
+
 class TestOpenAIParser:
     @classmethod
     def setup_class(cls):
@@ -71,3 +137,48 @@ class TestOpenAIParser:
 
             result = self.parser.parse(text=text, asdict=False)
             assert json.loads(result) == expected
+
+
+class TestOpenAIParseMany:
+    async def test_batches_titles_into_few_requests(self):
+        server = StubOpenAI()
+        parser = stub_parser(server, batch_size=2)
+        titles = ["A", "B", "C", "A"]
+
+        result = await parser.parse_many(titles)
+
+        assert {t: r["title_en"] for t, r in result.items()} == {
+            "A": "A",
+            "B": "B",
+            "C": "C",
+        }
+        assert "index" not in result["A"]
+        assert len(server.requests) == 2
+        assert server.requests[0]["response_format"]["type"] == "json_schema"
+
+    async def test_results_are_cached_by_title(self):
+        server = StubOpenAI()
+        parser = stub_parser(server)
+
+        await parser.parse_many(["A", "B"])
+        result = await parser.parse_many(["B", "C"])
+
+        assert set(result) == {"B", "C"}
+        assert len(server.requests) == 2
+        assert "B" not in server.requests[1]["messages"][-1]["content"]
+
+    async def test_timeout_leaves_titles_unparsed(self):
+        server = StubOpenAI(delay=1)
+        parser = stub_parser(server, timeout=0.05)
+
+        assert await parser.parse_many(["A"]) == {}
+        assert parser._cache == {}
+
+    async def test_failed_batch_leaves_only_its_titles_unparsed(self):
+        server = StubOpenAI(reject="B")
+        parser = stub_parser(server, batch_size=1)
+
+        result = await parser.parse_many(["A", "B", "C"])
+
+        assert set(result) == {"A", "C"}
+        assert set(parser._cache) == {"A", "C"}
@@ -0,0 +1,138 @@
+"""Tests for the background poster cache and refresh jobs."""
+
+import asyncio
+import functools
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from module.database import Database
+from module.manager import poster
+from module.manager.poster import CACHE, REFRESH, PosterJobs
+from module.utils import cache_image
+from module.utils.events import EventHub
+from test.factories import make_bangumi
+
+
+@pytest.fixture
+def db(db_engine):
+    with patch.object(poster, "Database", functools.partial(Database, db_engine)):
+        yield db_engine
+
+
+@pytest.fixture
+def hub():
+    hub = EventHub()
+    with patch.object(poster, "publish", hub.publish):
+        yield hub
+
+
+def _seed(db_engine, *links):
+    with Database(db_engine) as db:
+        for i, link in enumerate(links):
+            db.bangumi.add(
+                make_bangumi(
+                    id=None,
+                    official_title=f"Anime {i}",
+                    title_raw=f"Anime Raw {i}",
+                    poster_link=link,
+                )
+            )
+
+
+def _links(db_engine) -> dict[str, str | None]:
+    with Database(db_engine) as db:
+        return {b.official_title: b.poster_link for b in db.bangumi.search_all()}
+
+
+class TestRefreshJob:
+    async def test_bounded_concurrency_and_progress(self, db, hub):
+        _seed(db, None, None, None, None, None, "posters/kept.jpg")
+        in_flight = peak = 0
+
+        async def lookup(title, language):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(poster_link=f"posters/{title}.jpg")
+
+        with patch.object(poster, "tmdb_parser", lookup):
+            jobs = PosterJobs(concurrency=2)
+            async with hub.subscribe() as subscription:
+                progress = await jobs.start(REFRESH)
+                events = [subscription.queue.get_nowait() for _ in range(2)]
+
+        assert peak == 2
+        assert (progress.total, progress.done, progress.updated) == (5, 5, 5)
+        assert not jobs.running(REFRESH)
+        links = _links(db)
+        assert links["Anime 0"] == "posters/Anime 0.jpg"
+        assert links["Anime 5"] == "posters/kept.jpg"
+        assert [e.type for e in events] == ["poster_progress"] * 2
+
+    async def test_resumes_with_failed_only(self, db, hub):
+        _seed(db, None, None)
+
+        async def lookup(title, language):
+            return MagicMock(poster_link="posters/x.jpg") if title == "Anime 0" else None
+
+        with patch.object(poster, "tmdb_parser", lookup):
+            jobs = PosterJobs()
+            first = await jobs.start(REFRESH)
+            second = await jobs.start(REFRESH)
+
+        assert (first.updated, first.failed) == (1, 1)
+        assert (second.total, second.failed) == (1, 1)
+
+    async def test_start_while_running(self, db, hub):
+        _seed(db, None)
+        release = asyncio.Event()
+
+        async def lookup(title, language):
+            await release.wait()
+
+        with patch.object(poster, "tmdb_parser", lookup):
+            jobs = PosterJobs()
+            task = jobs.start(REFRESH)
+            assert jobs.start(REFRESH) is None
+            release.set()
+            await task
+        assert not jobs.running(REFRESH)
+
+    async def test_unexpected_error_counts_as_failed(self, db, hub):
+        _seed(db, None, None)
+
+        async def lookup(title, language):
+            if title == "Anime 0":
+                raise KeyError("poster_path")
+            return MagicMock(poster_link="posters/x.jpg")
+
+        with patch.object(poster, "tmdb_parser", lookup):
+            progress = await PosterJobs().start(REFRESH)
+
+        assert (progress.done, progress.updated, progress.failed) == (2, 1, 1)
+        assert _links(db)["Anime 1"] == "posters/x.jpg"
+
+
+class TestCacheJob:
+    async def test_downloads_remote_posters(self, db, hub, tmp_path):
+        _seed(db, "https://mikanani.me/images/Bangumi/a.jpg?w=400", "posters/local.jpg")
+        req = MagicMock()
+        req.get_content = AsyncMock(return_value=b"poster bytes")
+        request_content = MagicMock()
+        request_content.return_value.__aenter__ = AsyncMock(return_value=req)
+        request_content.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.object(poster, "RequestContent", request_content), patch.object(
+            cache_image, "IMAGE_ROOT", tmp_path
+        ):
+            progress = await PosterJobs().start(CACHE)
+
+        assert progress.updated == 1
+        link = _links(db)["Anime 0"]
+        assert link.startswith("posters/") and link.endswith(".jpg")
+        assert (tmp_path / link).read_bytes() == b"poster bytes"
+        assert _links(db)["Anime 1"] == "posters/local.jpg"
+
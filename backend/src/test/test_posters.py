@@ -0,0 +1,95 @@
+"""Tests for poster storage and the /posters endpoint."""
+
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from module.api import posters as posters_api
+from module.api.posters import IMMUTABLE, REVALIDATE
+from module.utils import cache_image
+
+POSTER = b"\xff\xd8\xff\xe0 fake jpeg"
+
+
+@pytest.fixture
+def image_root(tmp_path):
+    with patch.object(cache_image, "IMAGE_ROOT", tmp_path):
+        posters_api._backfilled.clear()
+        yield tmp_path
+
+
+@pytest.fixture
+def client(image_root):
+    app = FastAPI()
+    app.include_router(posters_api.router)
+    return TestClient(app)
+
+
+class TestSaveImage:
+    def test_content_hash_deduplicates(self, image_root):
+        first = cache_image.save_image(POSTER, "jpg")
+        second = cache_image.save_image(POSTER, "jpg")
+        assert first == second
+        assert len(first.split("/")[1].split(".")[0]) == 64
+        assert (image_root / first).read_bytes() == POSTER
+        assert cache_image.save_image(POSTER + b"!", "jpg") != first
+
+    def test_thumbnail_path(self):
+        assert cache_image.thumbnail_path("posters/abc.jpg", 320) == "posters/abc.w320.webp"
+
+    def test_thumbnails(self, image_root):
+        buffer = BytesIO()
+        Image.new("RGB", (500, 700), "red").save(buffer, "JPEG")
+        img_path = cache_image.save_image(buffer.getvalue(), "jpg")
+        # 640 is wider than the original and served from it
+        for width, exists in ((160, True), (320, True), (640, False)):
+            path = image_root / cache_image.thumbnail_path(img_path, width)
+            assert path.is_file() is exists
+        with Image.open(image_root / cache_image.thumbnail_path(img_path, 320)) as thumb:
+            assert thumb.size == (320, 448)
+
+
+class TestPosterEndpoint:
+    def test_content_hashed_poster_is_immutable(self, client):
+        img_path = cache_image.save_image(POSTER, "jpg")
+        response = client.get(f"/{img_path}")
+        assert response.status_code == 200
+        assert response.content == POSTER
+        assert response.headers["cache-control"] == IMMUTABLE
+        etag = response.headers["etag"]
+        cached = client.get(f"/{img_path}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+    def test_url_named_poster_revalidates(self, client):
+        cache_image.write_image(POSTER, "posters/0badc0de.jpg")
+        response = client.get("/posters/0badc0de.jpg")
+        assert response.headers["cache-control"] == REVALIDATE
+        assert client.get(
+            "/posters/0badc0de.jpg", headers={"If-None-Match": response.headers["etag"]}
+        ).status_code == 304
+
+    def test_width_serves_thumbnail(self, client, image_root):
+        img_path = cache_image.save_image(POSTER, "jpg")
+        thumbnail = image_root / cache_image.thumbnail_path(img_path, 320)
+        thumbnail.write_bytes(b"webp")
+        response = client.get(f"/{img_path}?w=300")
+        assert response.content == b"webp"
+        assert response.headers["content-type"] == "image/webp"
+        assert response.headers["etag"] != client.get(f"/{img_path}").headers["etag"]
+
+    def test_width_without_thumbnail_serves_original(self, client):
+        img_path = cache_image.save_image(POSTER, "jpg")
+        with patch.object(cache_image, "make_thumbnails", return_value=[]) as make:
+            assert client.get(f"/{img_path}?w=150").content == POSTER
+            assert client.get(f"/{img_path}?w=150").content == POSTER
+        # Backfill is attempted once per poster
+        make.assert_called_once()
+
+    def test_missing_and_outside(self, client, image_root):
+        (image_root / "secret.txt").write_text("x")
+        assert client.get("/posters/missing.jpg").status_code == 404
+        assert client.get("/posters/..%2Fsecret.txt").status_code == 403
@@ -0,0 +1,90 @@
+"""Tests for the loop profiler and its program API routes."""
+
+import marshal
+import pstats
+import time
+
+import pytest
+
+from module.utils.profiler import LOOP_PHASE, LoopProfiler, loop_profiler
+
+
+def busy(seconds: float = 0.01):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiler():
+    loop_profiler.cancel()
+    loop_profiler.result = None
+    yield
+    loop_profiler.cancel()
+    loop_profiler.result = None
+
+
+class TestLoopProfiler:
+    def test_captures_requested_iterations_of_one_loop(self):
+        profiler = LoopProfiler()
+        assert profiler.start("rss", 2) is True
+        assert profiler.start("rename", 1) is False
+
+        for _ in range(3):
+            with profiler.iteration("rss"):
+                with profiler.phase("rss", "fetch"):
+                    busy()
+            with profiler.iteration("rename"):
+                pass
+
+        summary = profiler.status()["result"]
+        assert profiler.capture is None
+        assert summary["loop"] == "rss"
+        assert summary["done"] == 2
+        assert len(summary["durations"]) == 2
+        # Only the two captured passes count towards the phase total
+        assert 0.02 <= summary["phases"]["fetch"] <= sum(summary["durations"]) + 0.01
+
+    def test_dump_is_a_pstats_file(self, tmp_path):
+        profiler = LoopProfiler()
+        assert profiler.dump() is None
+        profiler.start("rename", 1)
+        with profiler.iteration("rename"):
+            busy()
+
+        path = tmp_path / "rename.prof"
+        path.write_bytes(profiler.dump())
+        stats = pstats.Stats(str(path))
+
+        assert any(func[2] == "busy" for func in stats.stats)
+        assert "busy" in profiler.report()
+
+    def test_phases_feed_metrics_without_capture(self):
+        before = LOOP_PHASE.count("rename", "files")
+        with LoopProfiler().phase("rename", "files"):
+            pass
+        assert LOOP_PHASE.count("rename", "files") == before + 1
+
+
+class TestProfileAPI:
+    def test_rejects_unknown_loop(self, authed_client):
+        response = authed_client.get("/api/v1/profile/start?loop=search")
+        assert response.status_code == 406
+
+    def test_start_capture_and_download(self, authed_client):
+        assert authed_client.get("/api/v1/profile/download").status_code == 404
+
+        response = authed_client.get("/api/v1/profile/start?loop=rss&iterations=1")
+        assert response.status_code == 200
+        assert authed_client.get("/api/v1/profile/start").status_code == 409
+        assert authed_client.get("/api/v1/profile/status").json()["running"]["loop"] == "rss"
+
+        with loop_profiler.iteration("rss"):
+            busy()
+
+        response = authed_client.get("/api/v1/profile/download")
+        assert response.status_code == 200
+        assert 'filename="rss.prof"' in response.headers["content-disposition"]
+        assert marshal.loads(response.content)
+        text = authed_client.get("/api/v1/profile/download?format=text")
+        assert "cumulative" in text.text
@@ -0,0 +1,23 @@
+"""Tests for the async rate limiter."""
+
+import asyncio
+
+from module.network import RateLimiter
+
+
+async def test_spaces_calls_at_rate():
+    limiter = RateLimiter(rate=50)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(6):
+        await limiter.acquire()
+    # First call is immediate, the next five wait 20ms each
+    assert loop.time() - start >= 0.09
+
+
+async def test_burst_is_immediate():
+    limiter = RateLimiter(rate=10, burst=5)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*[limiter.acquire() for _ in range(5)])
+    assert loop.time() - start < 0.05
@@ -1,6 +1,15 @@
+import re
+import sys
+
 import pytest
 
 from module.parser.analyser import raw_parser
+from module.parser.analyser.raw_parser import (
+    clear_raw_parser_cache,
+    raw_parser_cache_info,
+)
+
+raw_parser_module = sys.modules["module.parser.analyser.raw_parser"]
 
 
 def test_raw_parser():
@@ -362,3 +371,55 @@ class TestIssue805TitleWithCht:
         assert info.source == "Baha"
         assert info.sub == "CHT"
 
+
+
+class TestRawParserCache:
+    """Repeated titles are served from the LRU cache."""
+
+    TITLE = "[ANi] 不時輕聲地以俄語遮羞的鄰座艾莉同學 - 02 [1080P][Baha][WEB-DL][AAC AVC][CHT].mp4"
+
+    def setup_method(self):
+        clear_raw_parser_cache()
+
+    def test_repeat_is_a_hit(self):
+        first = raw_parser(self.TITLE)
+        second = raw_parser(self.TITLE)
+        assert first == second
+        assert first is not second
+        info = raw_parser_cache_info()
+        assert info["hits"] == 1
+        assert info["misses"] == 1
+
+    def test_non_episodic_result_is_cached(self):
+        title = "[Group] Some Movie [1080p]"
+        assert raw_parser(title) is None
+        assert raw_parser(title) is None
+        assert raw_parser_cache_info()["hits"] == 1
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(raw_parser_module, "_RAW_CACHE_MAX_SIZE", 2)
+        for ep in range(1, 4):
+            raw_parser(f"[ANi] Show - 0{ep} [1080P]")
+        assert raw_parser_cache_info()["size"] == 2
+        raw_parser("[ANi] Show - 01 [1080P]")
+        assert raw_parser_cache_info()["hits"] == 0
+
+
+class TestStripWrapped:
+    """_strip_wrapped must match the re.sub pattern it replaces."""
+
+    @pytest.mark.parametrize(
+        "raw, token",
+        [
+            ("[LoliHouse] Show", "LoliHouse"),
+            ("★04月新番[Show]", "04月新番"),
+            ("a[b]c[b]d", "b"),
+            ("[b][b]", "b"),
+            ("b]x", "b"),
+            ("x[b\n]", "b"),
+            ("abcdef", ""),
+        ],
+    )
+    def test_matches_regex(self, raw, token):
+        expected = re.sub(f".{re.escape(token)}.", "", raw)
+        assert raw_parser_module._strip_wrapped(raw, token) == expected
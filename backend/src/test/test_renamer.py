@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from module.downloader.client.tr_downloader import TrDownloader
 from module.manager.renamer import Renamer
 from module.models import EpisodeFile, Notification, SubtitleFile
 
@@ -442,6 +443,43 @@ class TestRenameFlow:
 
         renamer.client.set_category.assert_called_once_with("h1", "BangumiCollection")
 
+    async def test_nested_transmission_collection_is_kept(self, renamer):
+        """Folder moves Transmission cannot do are skipped, not counted as bad."""
+        renamer.client.renames_across_folders = TrDownloader.renames_across_folders
+        renamer.client.torrents_info.return_value = [
+            {
+                "hash": "h1",
+                "name": "Anime Collection",
+                "save_path": "/downloads/Bangumi/Anime (2024)/Season 1",
+            }
+        ]
+        renamer.client.torrents_files.return_value = [
+            {"name": "Anime Collection/ep01.mkv"},
+            {"name": "Anime Collection/ep02.mkv"},
+        ]
+        # What TrDownloader answers for a folder move
+        renamer.client.torrents_rename_file.return_value = False
+
+        def mock_parser(torrent_path, season, **kwargs):
+            return EpisodeFile(
+                media_path=torrent_path,
+                title="Anime",
+                season=season,
+                episode=int(torrent_path[-6:-4]),
+                suffix=".mkv",
+            )
+
+        with patch.object(renamer._parser, "torrent_parser", side_effect=mock_parser):
+            with patch("module.manager.renamer.settings") as mock_settings:
+                mock_settings.bangumi_manage.rename_method = "pn"
+                mock_settings.bangumi_manage.remove_bad_torrent = True
+                with patch("module.downloader.path.settings") as mock_path_settings:
+                    mock_path_settings.downloader.path = "/downloads/Bangumi"
+                    await renamer.rename()
+
+        renamer.client.torrents_rename_file.assert_not_called()
+        renamer.client.torrents_delete.assert_not_called()
+
     async def test_no_media_files_no_crash(self, renamer):
         """When torrent has no media files, logs warning but doesn't crash."""
         renamer.client.torrents_info.return_value = [
@@ -464,6 +502,17 @@ class TestRenameFlow:
         assert result == []
         renamer.client.torrents_rename_file.assert_not_called()
 
+    async def test_client_without_rename_keeps_torrents(self, renamer):
+        """Clients that cannot rename (aria2) must not lose torrents as 'bad'."""
+        renamer.client.supports_rename = False
+        with patch("module.manager.renamer.settings") as mock_settings:
+            mock_settings.bangumi_manage.remove_bad_torrent = True
+            result = await renamer.rename()
+
+        assert result == []
+        renamer.client.torrents_info.assert_not_called()
+        renamer.client.torrents_delete.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # _parse_bangumi_id_from_tags
@@ -0,0 +1,104 @@
+"""Tests for the shared outbound HTTP client pools in module.network.request_url."""
+
+import httpx
+import pytest
+
+from module.conf import settings
+from module.network import request_url
+from module.network.request_url import RequestURL, get_pool_stats, get_shared_client
+
+
+@pytest.fixture(autouse=True)
+async def reset_pools():
+    original = settings.network.model_copy()
+    await request_url.close_shared_clients()
+    yield
+    await request_url.close_shared_clients()
+    settings.network = original
+
+
+class TestSharedClientPools:
+    async def test_per_host_pools_are_separate(self):
+        settings.network.per_host_connections = 5
+        tmdb = await get_shared_client("https://api.themoviedb.org/3/search/tv")
+        mikan = await get_shared_client("https://mikanani.me/RSS/Bangumi")
+        again = await get_shared_client("https://api.themoviedb.org/3/tv/1")
+
+        assert tmdb is again
+        assert tmdb is not mikan
+        assert tmdb._transport._pool._max_connections == 5
+
+    async def test_per_host_disabled_uses_default_pool(self):
+        settings.network.per_host_connections = 0
+        settings.network.max_connections = 42
+        default = await get_shared_client()
+        routed = await get_shared_client("https://mikanani.me/RSS/Bangumi")
+
+        assert routed is default
+        assert default._transport._pool._max_connections == 42
+
+    async def test_settings_change_rebuilds_pools(self):
+        first = await get_shared_client("https://mikanani.me/")
+        settings.network.keepalive_expiry = 1.0
+        second = await get_shared_client("https://mikanani.me/")
+
+        assert first is not second
+        assert first.is_closed
+
+    async def test_http2_without_h2_falls_back(self, monkeypatch):
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "h2":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        settings.network.http2 = True
+        client = await get_shared_client()
+
+        assert client._transport._pool._http2 is False
+
+    async def test_pool_stats_lists_default_and_hosts(self):
+        settings.network.per_host_connections = 5
+        await get_shared_client()
+        await get_shared_client("https://mikanani.me/")
+
+        stats = get_pool_stats()
+
+        assert set(stats) == {"default", "mikanani.me"}
+        assert stats["mikanani.me"] == {
+            "connections": 0,
+            "active": 0,
+            "idle": 0,
+            "queued": 0,
+            "http2": False,
+        }
+
+    async def test_request_url_routes_by_host(self):
+        settings.network.per_host_connections = 5
+        async with RequestURL() as req:
+            client = await req._client_for("https://mikanani.me/RSS/Bangumi")
+
+        assert client is request_url._host_clients["mikanani.me"]
+
+    async def test_host_pools_are_bounded_lru(self, monkeypatch):
+        settings.network.per_host_connections = 5
+        monkeypatch.setattr(request_url, "MAX_HOST_CLIENTS", 2)
+        a = await get_shared_client("https://a.example/")
+        await get_shared_client("https://b.example/")
+        await get_shared_client("https://a.example/")
+        await get_shared_client("https://c.example/")
+
+        assert list(request_url._host_clients) == ["a.example", "c.example"]
+        assert not a.is_closed
+        assert await get_shared_client("https://b.example/") is not None
+        assert a.is_closed
+
+    async def test_pool_stats_tolerates_other_transports(self):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: None))
+
+        assert request_url._pool_stats(client)["connections"] == 0
+        await client.aclose()
@@ -0,0 +1,99 @@
+"""Tests for table generations and conditional GETs on polled endpoints."""
+
+from unittest.mock import MagicMock, patch
+
+from module.api.cache import make_etag
+from module.database import Database, generation
+from module.models import RSSItem
+from test.factories import make_bangumi, make_rss_item
+
+
+class TestGeneration:
+    def test_commit_bumps_written_table(self, db_engine):
+        before = generation("bangumi", "rssitem")
+        with Database(db_engine) as db:
+            db.bangumi.add(make_bangumi(id=None, title_raw="Gen Test"))
+        after = generation("bangumi", "rssitem")
+        assert after[0] > before[0]
+        assert after[1] == before[1]
+
+    def test_bulk_delete_bumps_table(self, db_engine):
+        with Database(db_engine) as db:
+            db.rss.add(RSSItem(name="Feed", url="https://a.test/rss"))
+            before = generation("rssitem")
+            db.rss.delete_all()
+        assert generation("rssitem") > before
+
+    def test_rollback_does_not_bump(self, db_engine):
+        before = generation("rssitem")
+        with Database(db_engine) as db:
+            db.add(RSSItem(name="Feed", url="https://b.test/rss"))
+            db.flush()
+            db.rollback()
+        assert generation("rssitem") == before
+
+
+def _patch_rss_engine(items):
+    engine = MagicMock()
+    engine.rss.search_all.return_value = items
+    patcher = patch("module.api.rss.RSSEngine")
+    mock = patcher.start()
+    mock.return_value.__enter__ = MagicMock(return_value=engine)
+    mock.return_value.__exit__ = MagicMock(return_value=False)
+    return patcher, engine
+
+
+class TestConditionalGet:
+    def test_etag_and_not_modified(self, authed_client):
+        patcher, engine = _patch_rss_engine([make_rss_item(id=1, name="Feed 1")])
+        try:
+            first = authed_client.get("/api/v1/rss")
+            etag = first.headers["etag"]
+            second = authed_client.get("/api/v1/rss", headers={"If-None-Match": etag})
+            third = authed_client.get("/api/v1/rss")
+        finally:
+            patcher.stop()
+
+        assert first.status_code == 200
+        assert first.json()[0]["name"] == "Feed 1"
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        # The body is served from cache until the table changes
+        assert third.json() == first.json()
+        assert engine.rss.search_all.call_count == 1
+
+    def test_write_invalidates(self, authed_client, db_engine):
+        patcher, engine = _patch_rss_engine([make_rss_item(id=1, name="Feed 1")])
+        try:
+            etag = authed_client.get("/api/v1/rss").headers["etag"]
+            with Database(db_engine) as db:
+                db.rss.add(RSSItem(name="Feed 2", url="https://c.test/rss"))
+            engine.rss.search_all.return_value = [make_rss_item(id=2, name="Feed 2")]
+            response = authed_client.get("/api/v1/rss", headers={"If-None-Match": etag})
+        finally:
+            patcher.stop()
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()[0]["name"] == "Feed 2"
+
+    def test_status_etag_follows_program_state(self, authed_client):
+        first = authed_client.get("/api/v1/status")
+        etag = first.headers["etag"]
+        assert authed_client.get(
+            "/api/v1/status", headers={"If-None-Match": etag}
+        ).status_code == 304
+        with patch(
+            "module.api.program.program", MagicMock(is_running=not first.json()["status"])
+        ):
+            changed = authed_client.get("/api/v1/status", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_etag_changes_across_restarts(self):
+        etag = make_etag("rss", (3,))
+        assert make_etag("rss", (3,)) == etag
+        with patch("module.api.cache.BOOT_ID", "restarted"):
+            assert make_etag("rss", (3,)) != etag
@@ -252,6 +252,24 @@ class TestRefreshRss:
         # Only called once (for rss_id=2)
         mock_get.assert_called_once()
 
+    async def test_open_circuit_is_reported_as_status(self, rss_engine):
+        """A feed whose host breaker is open is marked circuit_open, not healthy."""
+        from module.network.circuit_breaker import get_breaker
+
+        rss_item = make_rss_item(url="https://down.example.com/rss")
+        rss_engine.rss.add(rss_item)
+        breaker = get_breaker(rss_item.url)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        with patch.object(RSSEngine, "_get_torrents", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = []
+            await rss_engine.refresh_rss(AsyncMock())
+
+        stored = rss_engine.rss.search_id(1)
+        assert stored.connection_status == "circuit_open"
+        assert stored.last_error
+
     async def test_refresh_nonexistent_rss_id(self, rss_engine):
         """refresh_rss with non-existent rss_id does nothing."""
         with patch.object(RSSEngine, "_get_torrents", new_callable=AsyncMock) as mock_get:
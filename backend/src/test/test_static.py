@@ -0,0 +1,101 @@
+"""Tests for WebUI static serving and API compression."""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from module.api.static import IMMUTABLE, REVALIDATE, APIGZipMiddleware, StaticIndex
+
+BUNDLE = b"console.log('AutoBangumi');\n" * 200
+
+
+@pytest.fixture
+def dist(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "images").mkdir()
+    (tmp_path / "index.html").write_text("<!DOCTYPE html><div id=app></div>")
+    (tmp_path / "assets" / "index-4f3a9c1b.js").write_bytes(BUNDLE)
+    (tmp_path / "assets" / "vendor-a1b2c3d4.css").write_bytes(b"body{}" * 400)
+    (tmp_path / "assets" / "vendor-a1b2c3d4.css.br").write_bytes(b"brotli-bytes")
+    (tmp_path / "images" / "logo.svg").write_text("<svg/>")
+    return tmp_path
+
+
+@pytest.fixture
+def client(dist):
+    index = StaticIndex(dist)
+    app = FastAPI()
+    app.add_middleware(APIGZipMiddleware)
+
+    @app.get("/api/v1/items")
+    def items():
+        return [{"id": i, "official_title": "葬送的芙莉莲"} for i in range(100)]
+
+    @app.get("/{path:path}")
+    def html(request: Request, path: str):
+        return index.response(request, path)
+
+    return TestClient(app)
+
+
+class TestStaticIndex:
+    def test_indexes_files_and_variants(self, dist):
+        index = StaticIndex(dist)
+        assert "vendor-a1b2c3d4.css.br" not in {
+            name.rsplit("/", 1)[-1] for name in index.assets
+        }
+        css = index.assets["assets/vendor-a1b2c3d4.css"]
+        assert css.variants["br"] == dist / "assets" / "vendor-a1b2c3d4.css.br"
+        # No .gz sibling: compressed in memory
+        assert gzip.decompress(css.variants["gzip"]) == b"body{}" * 400
+        # Too small to be worth compressing
+        assert index.assets["images/logo.svg"].variants == {}
+
+    def test_hashed_assets_are_immutable(self, client):
+        response = client.get("/assets/index-4f3a9c1b.js", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == IMMUTABLE
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/javascript")
+        assert response.content == BUNDLE
+
+    def test_prefers_brotli(self, client):
+        # Headers only: the body is a fake brotli stream
+        with client.stream(
+            "GET", "/assets/vendor-a1b2c3d4.css", headers={"Accept-Encoding": "gzip, br"}
+        ) as response:
+            assert response.headers["content-encoding"] == "br"
+            assert "Accept-Encoding" in response.headers["vary"]
+
+    def test_identity_when_not_accepted(self, client):
+        response = client.get(
+            "/assets/index-4f3a9c1b.js", headers={"Accept-Encoding": "gzip;q=0"}
+        )
+        assert "content-encoding" not in response.headers
+        assert response.content == BUNDLE
+
+    def test_routes_fall_back_to_index(self, client):
+        response = client.get("/bangumi/calendar")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == REVALIDATE
+        assert "id=app" in response.text
+        assert client.get("/assets/missing-00000000.js").status_code == 404
+
+    def test_not_modified(self, client):
+        etag = client.get("/").headers["etag"]
+        response = client.get("/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+class TestAPIGZip:
+    def test_large_json_is_compressed(self, client):
+        response = client.get("/api/v1/items", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 100
+
+    def test_static_is_not_recompressed(self, client):
+        response = client.get("/images/logo.svg", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
@@ -1,5 +1,15 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
 import pytest
+
 from module.conf import settings
+from module.parser import title_parser as title_parser_module
+from module.parser.analyser.raw_parser import (
+    clear_raw_parser_cache,
+    raw_parser_cache_info,
+)
 from module.parser.title_parser import TitleParser
 
 
@@ -25,3 +35,103 @@ class TestTitleParser:
         assert result.dpi == "1080P"
         assert result.season == 1
         assert result.subtitle == "GB_JP"
+
+
+class TestParseMany:
+    TITLES = [
+        "[ANi] 不時輕聲地以俄語遮羞的鄰座艾莉同學 - 02 [1080P][Baha][WEB-DL][AAC AVC][CHT].mp4",
+        "[Group] Some Movie [1080p]",
+        "[梦蓝字幕组]New Doraemon 哆啦A梦新番[747][2023.02.25][AVC][1080P][GB_JP][MP4]",
+        "[ANi] 不時輕聲地以俄語遮羞的鄰座艾莉同學 - 02 [1080P][Baha][WEB-DL][AAC AVC][CHT].mp4",
+    ]
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_raw_parser_cache()
+
+    async def test_results_in_order(self):
+        results = await TitleParser.parse_many(self.TITLES)
+
+        assert [r.title_raw if r else None for r in results] == [
+            "不時輕聲地以俄語遮羞的鄰座艾莉同學",
+            None,
+            "New Doraemon",
+            "不時輕聲地以俄語遮羞的鄰座艾莉同學",
+        ]
+        # Duplicate titles get independent instances
+        assert results[0] is not results[3]
+
+    async def test_matches_single_title_parser(self):
+        results = await TitleParser.parse_many(self.TITLES)
+        for title, result in zip(self.TITLES, results):
+            expected = TitleParser.raw_parser(title)
+            assert (result.model_dump() if result else None) == (
+                expected.model_dump() if expected else None
+            )
+
+    async def test_large_batch_parsed_in_thread(self, monkeypatch):
+        monkeypatch.setattr("module.parser.title_parser.PARSE_THREAD_THRESHOLD", 2)
+        titles = [f"[ANi] Show - {ep:02d} [1080P][Baha]" for ep in range(1, 6)]
+        to_thread = AsyncMock(wraps=asyncio.to_thread)
+        monkeypatch.setattr(title_parser_module.asyncio, "to_thread", to_thread)
+
+        results = await TitleParser.parse_many(titles)
+
+        assert [r.title_raw for r in results] == ["Show"] * 5
+        to_thread.assert_awaited_once()
+        # Results were stored in the raw_parser cache
+        assert raw_parser_cache_info()["size"] == 5
+
+    async def test_openai_results_with_regex_fallback(self, monkeypatch):
+        title = self.TITLES[2]
+
+        class FakeOpenAIParser:
+            async def parse_many(self, titles):
+                # The schema types season/episode as str. The first title comes
+                # back usable, the second unusable and the rest not at all;
+                # everything but the first falls back to the regex parser.
+                result = {
+                    "title_en": "From LLM",
+                    "title_zh": None,
+                    "title_jp": None,
+                    "season": "",
+                    "season_raw": "",
+                    "episode": "02",
+                    "sub": "",
+                    "group": "ANi",
+                    "resolution": "1080P",
+                    "source": "",
+                }
+                return {
+                    titles[0]: result,
+                    titles[1]: {**result, "episode": "SP"},
+                }
+
+        monkeypatch.setattr(settings.experimental_openai, "enable", True)
+        monkeypatch.setattr(
+            title_parser_module, "get_openai_parser", lambda: FakeOpenAIParser()
+        )
+
+        results = await TitleParser.parse_many([self.TITLES[0], title, self.TITLES[1]])
+
+        assert results[0].title_raw == "From LLM"
+        assert (results[0].season, results[0].eps_collect) == (1, False)
+        assert results[1].title_raw == "New Doraemon"
+
+    async def test_openai_errors_fall_back_to_regex(self, monkeypatch):
+        class FailingOpenAIParser:
+            async def parse_many(self, titles):
+                raise httpx.ConnectError("connection refused")
+
+        monkeypatch.setattr(settings.experimental_openai, "enable", True)
+        monkeypatch.setattr(
+            title_parser_module, "get_openai_parser", lambda: FailingOpenAIParser()
+        )
+
+        results = await TitleParser.parse_many(self.TITLES[:3])
+
+        assert [r.title_raw if r else None for r in results] == [
+            "不時輕聲地以俄語遮羞的鄰座艾莉同學",
+            None,
+            "New Doraemon",
+        ]
@@ -1,5 +1,18 @@
+import asyncio
+import sys
+import threading
+from unittest.mock import AsyncMock, patch
+
+from module.parser.analyser.tmdb_cache import (
+    NEGATIVE_TTL,
+    STALE_GRACE,
+    TTL,
+    TMDBCache,
+)
 from module.parser.analyser.tmdb_parser import tmdb_parser
 
+tmdb_module = sys.modules["module.parser.analyser.tmdb_parser"]
+
 
 async def test_tmdb_parser():
     bangumi_title = "海盗战记"
@@ -11,3 +24,131 @@ async def test_tmdb_parser():
     assert tmdb_info.title == "冰海战记"
     assert tmdb_info.year == bangumi_year
     assert tmdb_info.last_season == bangumi_season
+
+
+# ---------------------------------------------------------------------------
+# Persistent response cache (offline)
+# ---------------------------------------------------------------------------
+
+class TestTMDBCache:
+    def test_round_trip_persists(self, tmp_path):
+        path = tmp_path / "tmdb.db"
+        cache = TMDBCache(path)
+        cache.set("/3/tv/1?language=zh-CN", {"name": "冰海战记"}, 60)
+        cache.close()
+
+        assert TMDBCache(path).get("/3/tv/1?language=zh-CN") == ({"name": "冰海战记"}, True)
+
+    def test_expired_entry_is_stale(self, tmp_path):
+        cache = TMDBCache(tmp_path / "tmdb.db")
+        cache.set("k", {"a": 1}, -10)
+        assert cache.get("k") == ({"a": 1}, False)
+
+    def test_past_grace_is_a_miss(self, tmp_path):
+        cache = TMDBCache(tmp_path / "tmdb.db")
+        cache.set("k", {"a": 1}, -(STALE_GRACE + 10))
+        assert cache.get("k") is None
+
+
+class TestCachedGetJson:
+    async def test_hit_skips_network(self, _isolated_tmdb_cache):
+        req = AsyncMock()
+        req.get_json = AsyncMock(return_value={"genres": [{"id": 16}]})
+
+        assert await tmdb_module.is_animation(1, "zh", req) is True
+        assert await tmdb_module.is_animation(1, "zh", req) is True
+        assert req.get_json.await_count == 1
+
+    async def test_cache_key_drops_api_key(self):
+        key = tmdb_module._cache_key(tmdb_module.info_url(42, "jp"))
+        assert "api_key" not in key
+        assert key == "/3/tv/42?language=ja-JP"
+
+    async def test_ttl_by_kind_and_negative(self):
+        search = tmdb_module.search_url("x")
+        season = tmdb_module.season_url(1, 2, "zh")
+        assert tmdb_module._cache_ttl(search, {"results": [1]}) == TTL["search"]
+        assert tmdb_module._cache_ttl(search, {"results": []}) == NEGATIVE_TTL
+        assert tmdb_module._cache_ttl(season, {}) == TTL["season"]
+
+    async def test_failures_are_not_cached(self, _isolated_tmdb_cache):
+        req = AsyncMock()
+        req.get_json = AsyncMock(return_value=None)
+        url = tmdb_module.info_url(7, "zh")
+
+        assert await tmdb_module.get_json(url, req) is None
+        assert _isolated_tmdb_cache.get(tmdb_module._cache_key(url)) is None
+
+    async def test_writes_run_off_the_event_loop(self, _isolated_tmdb_cache):
+        req = AsyncMock()
+        req.get_json = AsyncMock(return_value={"name": "x"})
+        threads = []
+        real_set = _isolated_tmdb_cache.set
+
+        def record(*args):
+            threads.append(threading.get_ident())
+            real_set(*args)
+
+        with patch.object(_isolated_tmdb_cache, "set", record):
+            await tmdb_module.get_json(tmdb_module.info_url(3, "zh"), req)
+
+        assert threads and threads[0] != threading.get_ident()
+
+    async def test_stale_served_and_revalidated(self, _isolated_tmdb_cache):
+        url = tmdb_module.info_url(9, "zh")
+        key = tmdb_module._cache_key(url)
+        _isolated_tmdb_cache.set(key, {"name": "old"}, -10)
+        fresh = AsyncMock()
+        fresh.get_json = AsyncMock(return_value={"name": "new"})
+        ctx = AsyncMock()
+        ctx.__aenter__.return_value = fresh
+
+        with patch.object(tmdb_module, "RequestContent", return_value=ctx):
+            assert await tmdb_module.get_json(url, AsyncMock()) == {"name": "old"}
+            await asyncio.gather(*tmdb_module._background_tasks)
+
+        assert _isolated_tmdb_cache.get(key) == ({"name": "new"}, True)
+
+
+class TestFindAnimation:
+    @staticmethod
+    def fake_req(delays: dict[int, float], animated: set[int]):
+        calls = []
+
+        async def get_json(url):
+            tv_id = int(url.split("/tv/")[1].split("?")[0])
+            calls.append(tv_id)
+            await asyncio.sleep(delays.get(tv_id, 0))
+            genres = [{"id": 16}] if tv_id in animated else [{"id": 18}]
+            return {"id": tv_id, "genres": genres}
+
+        req = AsyncMock()
+        req.get_json = get_json
+        return req, calls
+
+    async def test_first_match_in_ranking_order(self):
+        # Candidate 3 answers first, but 2 ranks higher
+        req, _ = self.fake_req({1: 0.02, 2: 0.05, 3: 0}, animated={2, 3})
+        candidates = [{"id": 1}, {"id": 2}, {"id": 3}]
+
+        tv_id, info = await tmdb_module.find_animation(candidates, "zh", req)
+
+        assert tv_id == 2
+        assert info["id"] == 2
+
+    async def test_lookups_run_concurrently_and_stop_early(self):
+        req, calls = self.fake_req({i: 0.05 for i in range(20)}, animated={0})
+        candidates = [{"id": i} for i in range(20)]
+
+        start = asyncio.get_running_loop().time()
+        tv_id, _ = await tmdb_module.find_animation(candidates, "zh", req)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert tv_id == 0
+        assert elapsed < 0.2
+        # Lookups beyond the first concurrent window were cancelled
+        assert len(calls) <= tmdb_module._CANDIDATE_CONCURRENCY + 1
+
+    async def test_no_animation(self):
+        req, _ = self.fake_req({}, animated=set())
+        assert await tmdb_module.find_animation([{"id": 1}], "zh", req) == (None, None)
@@ -0,0 +1,142 @@
+"""Tests for the content-addressed .torrent cache and infohash parsing."""
+
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+from module.downloader.torrent_cache import (
+    TorrentCache,
+    magnet_infohash,
+    parse_infohash,
+)
+
+
+def bencode(value) -> bytes:
+    if isinstance(value, int):
+        return b"i%de" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"%d:%s" % (len(value), value)
+    if isinstance(value, list):
+        return b"l" + b"".join(bencode(v) for v in value) + b"e"
+    return b"d" + b"".join(bencode(k) + bencode(v) for k, v in sorted(value.items())) + b"e"
+
+
+def make_info(name: str = "Show - 01.mkv") -> bytes:
+    return bencode(
+        {"length": 1024, "name": name, "piece length": 16384, "pieces": b"x" * 20}
+    )
+
+
+INFO = make_info()
+
+
+def make_torrent_bytes(info: bytes = INFO) -> bytes:
+    return (
+        bencode({"announce": "http://tracker/ann", "creation date": 1700000000})[:-1]
+        + b"4:info"
+        + info
+        + b"e"
+    )
+
+
+class TestParseInfohash:
+    def test_hashes_info_dict_bytes(self):
+        assert parse_infohash(make_torrent_bytes()) == hashlib.sha1(INFO).hexdigest()
+
+    def test_nested_values_before_info(self):
+        head = bencode({"announce": "url", "announce-list": [["url"], ["alt"]]})
+        data = head[:-1] + b"4:info" + INFO + b"e"
+        assert parse_infohash(data) == hashlib.sha1(INFO).hexdigest()
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"<html>error</html>", b"d8:announce3:urle", b"d4:info" + INFO[:-5]],
+    )
+    def test_invalid_payloads(self, data):
+        assert parse_infohash(data) is None
+
+
+class TestMagnetInfohash:
+    def test_hex(self):
+        url = "magnet:?xt=urn:btih:" + "ABCDEF0123" * 4 + "&dn=Show"
+        assert magnet_infohash(url) == "abcdef0123" * 4
+
+    def test_base32(self):
+        assert magnet_infohash("magnet:?xt=urn:btih:" + "A" * 32) == "00" * 20
+
+    def test_not_a_magnet(self):
+        assert magnet_infohash("https://example.com/a.torrent") is None
+
+
+class TestTorrentCache:
+    def test_round_trip_and_index_persistence(self, tmp_path):
+        cache = TorrentCache(tmp_path)
+        data = make_torrent_bytes()
+        info_hash = cache.put("https://mikan/a.torrent", data)
+
+        reloaded = TorrentCache(tmp_path)
+        assert reloaded.get("https://mikan/a.torrent") == data
+        assert reloaded.infohash("https://mikan/a.torrent") == info_hash
+
+    def test_same_content_stored_once(self, tmp_path):
+        cache = TorrentCache(tmp_path)
+        data = make_torrent_bytes()
+        cache.put("https://mikan/a.torrent", data)
+        cache.put("https://mirror/a.torrent", data)
+
+        assert len(list(tmp_path.glob("*.torrent"))) == 1
+        assert cache.get("https://mirror/a.torrent") == data
+
+    def test_non_torrent_payload_not_cached(self, tmp_path):
+        cache = TorrentCache(tmp_path)
+        assert cache.put("https://mikan/a.torrent", b"<html>503</html>") is None
+        assert cache.get("https://mikan/a.torrent") is None
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        first = make_torrent_bytes(make_info("Show - 02.mkv"))
+        second = make_torrent_bytes(make_info("Show - 03.mkv"))
+        cache = TorrentCache(tmp_path, max_bytes=len(first) + len(second))
+        cache.put("u1", first)
+        cache.put("u2", second)
+        # Make u1 the oldest, then use it so u2 becomes least recently used
+        for i, name in enumerate(sorted(tmp_path.glob("*.torrent"))):
+            os.utime(name, (1000 + i, 1000 + i))
+        assert cache.get("u1") == first
+
+        cache.put("u3", make_torrent_bytes())
+
+        assert cache.get("u1") == first
+        assert cache.get("u2") is None
+        assert cache.get("u3") is not None
+
+    def test_missing_file_is_a_miss(self, tmp_path):
+        cache = TorrentCache(tmp_path)
+        info_hash = cache.put("u1", make_torrent_bytes())
+        (tmp_path / f"{info_hash}.torrent").unlink()
+
+        assert cache.get("u1") is None
+        assert cache.infohash("u1") is None
+
+    def test_scans_directory_only_when_over_budget(self, tmp_path):
+        cache = TorrentCache(tmp_path)
+        cache.put("u1", make_torrent_bytes())
+        with patch.object(TorrentCache, "_scan", side_effect=AssertionError):
+            cache.put("u2", make_torrent_bytes(make_info("Show - 02.mkv")))
+
+        assert cache._size == sum(f.stat().st_size for f in tmp_path.glob("*.torrent"))
+
+    async def test_index_writes_are_coalesced_off_the_loop(self, tmp_path):
+        cache = TorrentCache(tmp_path)
+        with patch.object(
+            TorrentCache, "_write_index", autospec=True, side_effect=TorrentCache._write_index
+        ) as write:
+            for i in range(5):
+                cache.put(f"u{i}", make_torrent_bytes())
+            await cache._saving
+
+        assert write.call_count == 1
+        assert TorrentCache(tmp_path).infohash("u4") is not None
@@ -4,6 +4,8 @@ import pytest
 from module.parser.analyser import torrent_parser
 from module.parser.analyser.torrent_parser import get_path_basename
 
+torrent_parser_module = sys.modules["module.parser.analyser.torrent_parser"]
+
 
 def test_torrent_parser():
     file_name = "[Lilith-Raws] Boku no Kokoro no Yabai Yatsu - 01 [Baha][WEB-DL][1080p][AVC AAC][CHT][MP4].mp4"
@@ -141,3 +143,49 @@ class TestGetPathBasename:
     @pytest.mark.skipif(not sys.platform.startswith("win"), reason="Windows specific")
     def test_windows_path(self):
         assert get_path_basename("C:\\path\\to\\file.txt") == "file.txt"
+
+
+class TestCombinedRule:
+    NAMES = [
+        "[Lilith-Raws] Boku no Kokoro no Yabai Yatsu - 01 [Baha][WEB-DL][1080p][AVC AAC][CHT][MP4].mp4",
+        "[Sakurato] Kaguya-sama wa Kokurasetai [12v2][AVC-8bit 1080p AAC][CHS].mp4",
+        "【幻樱字幕组】海盗战记 第05话 [GB_MP4][1080P].mp4",
+        "海盗战记 第05集.mp4",
+        "[Ohys-Raws] Kamen Rider Gaim EP33 (TV-Asahi 1280x720 x264 AAC).mp4",
+        "葬送的芙莉莲 S01E05.tc.ass",
+        "[Group] Some Movie NCOP [1080p].mkv",
+    ]
+
+    @pytest.mark.parametrize("name", NAMES)
+    def test_matches_first_sequential_rule(self, name):
+        expected = next(
+            (
+                m.groups()
+                for rule in torrent_parser_module.COMPILED_RULES
+                if (m := rule.match(name))
+            ),
+            None,
+        )
+        match = torrent_parser_module.COMBINED_RULE.match(name)
+        groups = (
+            match.groups()[match.lastindex - 3 : match.lastindex] if match else None
+        )
+        assert groups == expected
+
+    def test_result_promotes_to_pydantic_model(self):
+        ep = torrent_parser("/Season 2/[Sub] Show - 48.5 [1080P].mkv")
+        sub = torrent_parser(
+            "/Season 2/[Sub] Show - 01 [1080P].sc.ass", file_type="subtitle"
+        )
+
+        assert ep.episode == 48.5
+        assert ep.to_model().model_dump() == {
+            "media_path": "/Season 2/[Sub] Show - 48.5 [1080P].mkv",
+            "group": "Sub",
+            "title": "Show",
+            "season": 1,
+            "episode": 48.5,
+            "suffix": ".mkv",
+        }
+        assert sub.to_model().language == "zh"
+        assert sub.to_model().episode == 1
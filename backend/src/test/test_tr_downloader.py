@@ -0,0 +1,244 @@
+"""Tests for TrDownloader against an in-process fake Transmission RPC server."""
+
+import asyncio
+import base64
+import json
+from functools import partial
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from module.downloader.client.tr_downloader import TrDownloader
+
+
+class FakeTransmission:
+    """Minimal Transmission RPC implementation served through httpx.MockTransport."""
+
+    SESSION_ID = "fake-session"
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.torrents: dict[str, dict] = {}
+        self._next_id = 1
+
+    def add(self, name, _hash, files=None, labels=None, percent_done=1.0, status=6):
+        self.torrents[_hash] = {
+            "id": self._next_id,
+            "hashString": _hash,
+            "name": name,
+            "downloadDir": "/downloads/Bangumi/Show/Season 1",
+            "percentDone": percent_done,
+            "status": status,
+            "error": 0,
+            "labels": labels or ["category:Bangumi"],
+            "totalSize": 1024,
+            "rateDownload": 0,
+            "rateUpload": 0,
+            "peersSendingToUs": 0,
+            "peersGettingFromUs": 0,
+            "eta": -1,
+            "addedDate": 0,
+            "files": [
+                {"name": f, "length": 1024, "bytesCompleted": 1024}
+                for f in (files or [name])
+            ],
+            "fileStats": [{"wanted": True} for _ in (files or [name])],
+        }
+        self._next_id += 1
+
+    def _select(self, ids):
+        if ids is None:
+            return list(self.torrents.values())
+        return [self.torrents[i] for i in ids if i in self.torrents]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.headers.get("X-Transmission-Session-Id") != self.SESSION_ID:
+            return httpx.Response(
+                409, headers={"X-Transmission-Session-Id": self.SESSION_ID}
+            )
+        body = json.loads(request.content)
+        self.requests.append(body)
+        method, args = body["method"], body.get("arguments", {})
+        result: dict = {}
+        if method == "session-get":
+            result = {"version": "4.0.5", "download-dir": "/downloads"}
+        elif method == "torrent-get":
+            fields = args["fields"]
+            result = {
+                "torrents": [
+                    {k: t[k] for k in fields if k in t}
+                    for t in self._select(args.get("ids"))
+                ]
+            }
+        elif method == "torrent-add":
+            raw = args.get("filename") or base64.b64decode(args["metainfo"]).decode()
+            _hash = f"{abs(hash(raw)):040x}"[:40]
+            if _hash in self.torrents:
+                result = {"torrent-duplicate": {"hashString": _hash}}
+            else:
+                self.add(raw, _hash, labels=args.get("labels"))
+                self.torrents[_hash]["downloadDir"] = args["download-dir"]
+                result = {"torrent-added": {"hashString": _hash}}
+        elif method == "torrent-set":
+            for t in self._select(args["ids"]):
+                t["labels"] = args["labels"]
+        elif method == "torrent-rename-path":
+            t = self._select(args["ids"])[0]
+            for f in t["files"]:
+                if f["name"] == args["path"]:
+                    parent = args["path"].rpartition("/")[0]
+                    f["name"] = f"{parent}/{args['name']}" if parent else args["name"]
+        elif method == "torrent-remove":
+            for t in self._select(args["ids"]):
+                self.torrents.pop(t["hashString"])
+        elif method == "torrent-set-location":
+            for t in self._select(args["ids"]):
+                t["downloadDir"] = args["location"]
+        return httpx.Response(200, json={"result": "success", "arguments": result})
+
+
+@pytest.fixture
+def server() -> FakeTransmission:
+    return FakeTransmission()
+
+
+@pytest.fixture
+async def tr(server):
+    client = TrDownloader(host="localhost:9091", username="", password="", ssl=False)
+    transport = httpx.MockTransport(server.handler)
+    with patch(
+        "module.downloader.client.tr_downloader.httpx.AsyncClient",
+        partial(httpx.AsyncClient, transport=transport),
+    ):
+        assert await client.auth() is True
+    yield client
+    await client.logout()
+
+
+class TestTrDownloaderConstructor:
+    def test_rpc_url_built_from_bare_host(self):
+        tr = TrDownloader(host="nas.local:9091", username="", password="", ssl=True)
+        assert tr._rpc_url == "https://nas.local:9091/transmission/rpc"
+
+    def test_explicit_rpc_path_preserved(self):
+        tr = TrDownloader(
+            host="http://nas.local/custom/rpc", username="", password="", ssl=False
+        )
+        assert tr._rpc_url == "http://nas.local/custom/rpc"
+
+
+class TestTrDownloaderInfo:
+    async def test_auth_performs_session_handshake(self, tr, server):
+        assert tr._session_id == FakeTransmission.SESSION_ID
+        assert server.requests[0]["method"] == "session-get"
+
+    async def test_torrents_info_is_single_field_limited_call(self, tr, server):
+        server.add("[Sub] Show - 01.mkv", "a" * 40)
+        server.add("[Sub] Show - 02.mkv", "b" * 40, percent_done=0.5, status=4)
+        server.add("Other", "c" * 40, labels=["category:Other"])
+        server.requests.clear()
+
+        result = await tr.torrents_info(status_filter="completed", category="Bangumi")
+
+        assert [t["hash"] for t in result] == ["a" * 40]
+        assert result[0]["category"] == "Bangumi"
+        assert result[0]["state"] == "uploading"
+        assert len(server.requests) == 1
+        assert "files" not in server.requests[0]["arguments"]["fields"]
+
+    async def test_torrents_info_filters_by_tag(self, tr, server):
+        server.add("Show", "a" * 40, labels=["category:Bangumi", "ab:3"])
+        server.add("Show 2", "b" * 40)
+
+        result = await tr.torrents_info(status_filter=None, category=None, tag="ab:3")
+
+        assert [t["hash"] for t in result] == ["a" * 40]
+        assert result[0]["tags"] == "ab:3"
+
+    async def test_concurrent_file_listing_is_batched(self, tr, server):
+        server.add("Show S1", "a" * 40, files=["Show S1/ep01.mkv", "Show S1/ep01.ass"])
+        server.add("Show - 05.mkv", "b" * 40)
+        server.requests.clear()
+
+        files_a, files_b = await asyncio.gather(
+            tr.torrents_files("a" * 40), tr.torrents_files("b" * 40)
+        )
+
+        assert [f["name"] for f in files_a] == ["ep01.mkv", "ep01.ass"]
+        assert [f["name"] for f in files_b] == ["Show - 05.mkv"]
+        assert len(server.requests) == 1
+        assert set(server.requests[0]["arguments"]["ids"]) == {"a" * 40, "b" * 40}
+
+
+class TestTrDownloaderWrite:
+    async def test_add_torrents_uses_labels_for_category_and_tags(self, tr, server):
+        added = await tr.add_torrents(
+            torrent_urls="magnet:?xt=urn:btih:abc",
+            torrent_files=None,
+            save_path="/downloads/Show/Season 1",
+            category="Bangumi",
+            tags="ab:7",
+        )
+
+        assert added is True
+        torrent = next(iter(server.torrents.values()))
+        assert torrent["labels"] == ["category:Bangumi", "ab:7"]
+        assert torrent["downloadDir"] == "/downloads/Show/Season 1"
+
+    async def test_add_duplicate_returns_false(self, tr, server):
+        kwargs = dict(
+            torrent_urls=None,
+            torrent_files=b"torrent-bytes",
+            save_path="/downloads",
+            category="Bangumi",
+        )
+        assert await tr.add_torrents(**kwargs) is True
+        assert await tr.add_torrents(**kwargs) is False
+
+    async def test_rename_file_in_subfolder(self, tr, server):
+        server.add("Show S1", "a" * 40, files=["Show S1/ep01.mkv"])
+
+        result = await tr.torrents_rename_file("a" * 40, "ep01.mkv", "Show S01E01.mkv")
+
+        assert result is True
+        files = await tr.torrents_files("a" * 40)
+        assert files[0]["name"] == "Show S01E01.mkv"
+
+    async def test_rename_across_folders_is_refused(self, tr, server):
+        server.add("Show S1", "a" * 40, files=["Show S1/sub/ep01.mkv"])
+
+        result = await tr.torrents_rename_file("a" * 40, "sub/ep01.mkv", "ep01.mkv")
+
+        assert result is False
+        assert not any(r["method"] == "torrent-rename-path" for r in server.requests)
+        files = await tr.torrents_files("a" * 40)
+        assert files[0]["name"] == "sub/ep01.mkv"
+
+    async def test_set_category_replaces_category_label(self, tr, server):
+        server.add("Show", "a" * 40, labels=["category:Bangumi", "ab:1"])
+
+        await tr.set_category("a" * 40, "BangumiCollection")
+
+        assert server.torrents["a" * 40]["labels"] == [
+            "ab:1",
+            "category:BangumiCollection",
+        ]
+
+    async def test_add_tag_is_idempotent(self, tr, server):
+        server.add("Show", "a" * 40)
+
+        await tr.add_tag("a" * 40, "ab:2")
+        await tr.add_tag("a" * 40, "ab:2")
+
+        assert server.torrents["a" * 40]["labels"] == ["category:Bangumi", "ab:2"]
+
+    async def test_delete_and_move_accept_pipe_joined_hashes(self, tr, server):
+        server.add("A", "a" * 40)
+        server.add("B", "b" * 40)
+
+        await tr.move_torrent(f"{'a' * 40}|{'b' * 40}", "/new")
+        assert await tr.get_torrent_path("b" * 40) == "/new"
+
+        await tr.torrents_delete(f"{'a' * 40}|{'b' * 40}")
+        assert server.torrents == {}
@@ -6,6 +6,15 @@ export const apiLog = {
     return data;
   },
 
+  /**
+   * SSE stream of new log lines, filtered server-side by level
+   */
+  streamUrl(levels: string[] = []) {
+    const params = new URLSearchParams();
+    levels.forEach((level) => params.append('level', level));
+    return `api/v1/log/stream?${params}`;
+  },
+
   async clearLog() {
     const { data } = await axios.get<ApiSuccess>('api/v1/log/clear');
     return data;
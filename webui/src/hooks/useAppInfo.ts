@@ -14,9 +14,15 @@ export const useAppInfo = createSharedComposable(() => {
     }
   }
 
+  // Status changes are pushed; polling only covers a dropped stream
+  const { connected, on } = useServerEvents();
+  on('status', (data: { status: boolean }) => {
+    running.value = data.status;
+  });
+
   const { pause: offUpdate, resume: onUpdate } = useIntervalFn(
     getStatus,
-    3000,
+    () => (connected.value ? 60000 : 3000),
     {
       immediate: false,
       immediateCallback: true,
@@ -0,0 +1,56 @@
+import { createSharedComposable } from '@vueuse/core';
+
+type Handler = (data: any) => void;
+
+/**
+ * Single EventSource on api/v1/events shared by the whole tab.
+ * The browser reconnects on its own and resumes from the last event id.
+ */
+export const useServerEvents = createSharedComposable(() => {
+  const { isLoggedIn } = useAuth();
+  const connected = ref(false);
+  const handlers = new Map<string, Set<Handler>>();
+  let source: EventSource | null = null;
+
+  function listen(es: EventSource, type: string) {
+    es.addEventListener(type, (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      handlers.get(type)?.forEach((handler) => handler(data));
+    });
+  }
+
+  function open() {
+    close();
+    const es = new EventSource('api/v1/events', { withCredentials: true });
+    es.onopen = () => {
+      connected.value = true;
+    };
+    es.onerror = () => {
+      connected.value = es.readyState === EventSource.OPEN;
+    };
+    handlers.forEach((_, type) => listen(es, type));
+    source = es;
+  }
+
+  function close() {
+    source?.close();
+    source = null;
+    connected.value = false;
+  }
+
+  watch(isLoggedIn, (value) => (value ? open() : close()), { immediate: true });
+
+  function on(type: string, handler: Handler) {
+    if (!handlers.has(type)) {
+      handlers.set(type, new Set());
+      if (source) listen(source, type);
+    }
+    handlers.get(type)!.add(handler);
+    return () => handlers.get(type)?.delete(handler);
+  }
+
+  return {
+    connected,
+    on,
+  };
+});
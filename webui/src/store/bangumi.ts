@@ -1,3 +1,4 @@
+import { useDebounceFn } from '@vueuse/core';
 import type { BangumiRule } from '#/bangumi';
 import { ruleTemplate } from '#/bangumi';
 
@@ -61,6 +62,19 @@ export const useBangumiStore = defineStore('bangumi', () => {
   const { execute: unarchiveRule } = useApi(apiBangumi.unarchiveRule, opts);
   const { execute: refreshMetadata } = useApi(apiBangumi.refreshMetadata, opts);
 
+  // Reload once loaded when the backend reports a change
+  const { on } = useServerEvents();
+  const reload = useDebounceFn(() => {
+    if (hasLoaded.value) getAll();
+  }, 500);
+  [
+    'bangumi_added',
+    'bangumi_changed',
+    'review_flagged',
+    'poster_progress',
+    'resync',
+  ].forEach((type) => on(type, reload));
+
   function openEditPopup(data: BangumiRule) {
     editRule.show = true;
     editRule.item = data;
@@ -1,4 +1,7 @@
-import { useClipboard, useIntervalFn } from '@vueuse/core';
+import { useClipboard } from '@vueuse/core';
+
+// Keep at most this much text; the oldest lines are dropped first
+const MAX_LOG_LENGTH = 2 * 1024 * 1024;
 
 export const useLogStore = defineStore('log', () => {
   const message = useMessage();
@@ -6,15 +9,46 @@ export const useLogStore = defineStore('log', () => {
   const { t } = useMyI18n();
 
   const log = ref('');
+  const levels = ref<string[]>([]);
+  let source: EventSource | null = null;
 
-  function getLog() {
-    if (isLoggedIn.value) {
-      apiLog.getLog().then((res) => {
-        log.value = res;
-      });
+  function append(lines: string) {
+    let text = `${log.value}${lines}\n`;
+    if (text.length > MAX_LOG_LENGTH) {
+      const cut = text.indexOf('\n', text.length - MAX_LOG_LENGTH);
+      text = text.slice(cut + 1);
     }
+    log.value = text;
+  }
+
+  function offUpdate() {
+    source?.close();
+    source = null;
+  }
+
+  /**
+   * Stream new lines; the backend sends recent history first, and resumes
+   * from the last line received when the connection drops.
+   */
+  function onUpdate() {
+    offUpdate();
+    if (!isLoggedIn.value) return;
+    log.value = '';
+    const es = new EventSource(apiLog.streamUrl(levels.value), {
+      withCredentials: true,
+    });
+    es.addEventListener('log', (e) => append((e as MessageEvent).data));
+    source = es;
   }
 
+  watch(
+    levels,
+    () => {
+      if (source) onUpdate();
+    },
+    { deep: true }
+  );
+
   const { execute: reset } = useApi(apiLog.clearLog, {
     showMessage: true,
     onSuccess() {
@@ -22,11 +56,6 @@ export const useLogStore = defineStore('log', () => {
     },
   });
 
-  const { pause: offUpdate, resume: onUpdate } = useIntervalFn(getLog, 10000, {
-    immediate: false,
-    immediateCallback: true,
-  });
-
   watch(isLoggedIn, (loggedIn) => {
     if (!loggedIn) {
       offUpdate();
@@ -48,7 +77,7 @@ export const useLogStore = defineStore('log', () => {
 
   return {
     log,
-    getLog,
+    levels,
     reset,
     onUpdate,
     offUpdate,
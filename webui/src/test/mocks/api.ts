@@ -147,6 +147,13 @@ export const mockConfig = {
     username: '',
     password: '',
   },
+  network: {
+    max_connections: 100,
+    max_keepalive_connections: 20,
+    keepalive_expiry: 30,
+    per_host_connections: 20,
+    http2: false,
+  },
   notification: {
     enable: false,
     type: 'telegram',
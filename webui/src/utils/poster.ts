@@ -1,5 +1,14 @@
-export function resolvePosterUrl(link: string | null | undefined): string {
+/**
+ * URL of a poster. Local posters take a display `width` in CSS pixels and are
+ * served as a thumbnail sized for the device pixel ratio.
+ */
+export function resolvePosterUrl(
+  link: string | null | undefined,
+  width?: number
+): string {
   if (!link) return '';
   if (link.startsWith('http://') || link.startsWith('https://')) return link;
-  return `/${link}`;
+  if (!width) return `/${link}`;
+  const dpr = Math.min(Math.ceil(window.devicePixelRatio || 1), 3);
+  return `/${link}?w=${width * dpr}`;
 }
@@ -1,7 +1,7 @@
 import type { TupleToUnion } from './utils';
 
 /** 下载方式 */
-export type DownloaderType = ['qbittorrent'];
+export type DownloaderType = ['qbittorrent', 'transmission'];
 /** rss parser 语言 */
 export type RssParserLang = ['zh', 'en', 'jp'];
 /** 重命名方式 */
@@ -61,6 +61,15 @@ export interface Proxy {
   username: string;
   password: string;
 }
+/** Outbound HTTP connection pool settings */
+export interface Network {
+  max_connections: number;
+  max_keepalive_connections: number;
+  keepalive_expiry: number;
+  per_host_connections: number;
+  http2: boolean;
+}
+
 /** Notification provider configuration */
 export interface NotificationProviderConfig {
   type: TupleToUnion<NotificationType>;
@@ -115,6 +124,7 @@ export interface Config {
   bangumi_manage: BangumiManage;
   log: Log;
   proxy: Proxy;
+  network: Network;
   notification: Notification;
   experimental_openai: ExperimentalOpenAI;
   security: Security;
@@ -157,6 +167,13 @@ export const initConfig: Config = {
     username: '',
     password: '',
   },
+  network: {
+    max_connections: 100,
+    max_keepalive_connections: 20,
+    keepalive_expiry: 30,
+    per_host_connections: 20,
+    http2: false,
+  },
   notification: {
     enable: false,
     providers: [],
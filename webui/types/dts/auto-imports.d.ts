@@ -117,6 +117,7 @@ declare global {
   const useRouter: typeof import('vue-router/auto')['useRouter']
   const useSafeArea: typeof import('../../src/hooks/useSafeArea')['useSafeArea']
   const useSearchStore: typeof import('../../src/store/search')['useSearchStore']
+  const useServerEvents: typeof import('../../src/hooks/useServerEvents')['useServerEvents']
   const useSetupStore: typeof import('../../src/store/setup')['useSetupStore']
   const useSlots: typeof import('vue')['useSlots']
   const vi: typeof import('vitest')['vi']